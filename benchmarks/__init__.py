@@ -0,0 +1 @@
+"""Бенчмарки гарячих шляхів бота на синтетичних книгах (див. benchmarks/run.py)."""
@@ -0,0 +1,108 @@
+"""Пакетні зміни (book.batch()) проти змін по одній операції.
+
+На книгах з `--size` контактів і нотаток додає `--ops` нових контактів
+з телефоном і днем народження та стільки ж нотаток з тегом: спершу
+звичайними методами по одній операції, потім пакетами по `--batch-size`.
+Вимірюється для книги в пам'яті (відсортовані списки сторінок уже
+побудовані, як після show-all-contacts), журналу і SQLite; друкує
+операції за секунду і прискорення.
+
+Запуск:  python benchmarks/bench_batch.py [--size 100000] [--ops 20000] [--batch-size 2000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+# synthetic додає src/ до sys.path, тому імпортується першим
+from synthetic import build_address_book, build_notes_book
+
+from assistant.models import Record
+from assistant.storage import JournalStorage, SqliteStorage, save_all
+
+
+def operations(count: int, tag: str) -> list[tuple]:
+    return [
+        (f"Batch{tag}{i}", f"099{i:07d}", f"{i % 28 + 1:02d}.05.1990", f"note {i}")
+        for i in range(count)
+    ]
+
+
+def one_by_one(book, notes, ops: list[tuple], batch_size: int) -> None:
+    for name, phone, birthday, text in ops:
+        record = Record(name)
+        book.add_record(record)
+        record.add_phone(phone)
+        record.add_birthday(birthday)
+        notes.add_note(text, ["batch"])
+
+
+def batched(book, notes, ops: list[tuple], batch_size: int) -> None:
+    for start in range(0, len(ops), batch_size):
+        with book.batch() as contacts, notes.batch() as new_notes:
+            for name, phone, birthday, text in ops[start : start + batch_size]:
+                contacts.add_contact(name, phone)
+                contacts.add_birthday(name, birthday)
+                new_notes.add_note(text, ["batch"])
+
+
+class MemoryStorage:
+    """Книги в пам'яті без збереження."""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def load(self):
+        book, notes = build_address_book(self.size), build_notes_book(self.size)
+        book.page("name", None, 1)
+        return book, notes
+
+    def close(self, book, notes) -> None:
+        pass
+
+
+def measure(make_storage, run, ops: list[tuple], batch_size: int) -> float:
+    storage = make_storage()
+    book, notes = storage.load()
+    start = time.perf_counter()
+    run(book, notes, ops, batch_size)
+    seconds = time.perf_counter() - start
+    storage.close(book, notes)
+    return seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=2_000)
+    options = parser.parse_args()
+
+    print(f"contacts and notes: {options.size}, new items: {options.ops}")
+    print(f"{'':10}{'single ops/s':>14}{'batch ops/s':>14}{'speed-up':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        save_all(build_address_book(options.size), build_notes_book(options.size))
+        engines = {
+            "memory": lambda: MemoryStorage(options.size),
+            "journal": JournalStorage,
+            "sqlite": SqliteStorage,
+        }
+        for label, make_storage in engines.items():
+            times = [
+                measure(
+                    make_storage,
+                    run,
+                    operations(options.ops, f"{label}{run.__name__}"),
+                    options.batch_size,
+                )
+                for run in (one_by_one, batched)
+            ]
+            single, batch = (options.ops / seconds for seconds in times)
+            print(f"{label:10}{single:14.0f}{batch:14.0f}{batch / single:9.1f}x")
+        os.chdir(os.path.dirname(tmp))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Колонковий формат контактів (columnar.py) проти pickle і пакетні фільтри.
+
+Вимірює запис і читання книги в обох форматах (секунди, тисячі контактів
+за секунду, розмір файлу), а також запити find-contact, що виконуються
+повним переглядом: з відбором по колонках і проходом по об'єктах Record
+(перша сторінка збігів і вся книга).
+Для колонок показує, чи використано NumPy.
+
+Запуск:  python benchmarks/bench_columnar.py [--size 1000000] [--repeat 3]
+"""
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+# synthetic додає src/ до sys.path, тому імпортується першим
+from synthetic import build_address_book
+
+from assistant import columnar
+from assistant.columnar import dump_columnar, load_columnar
+from assistant.query import plan_query
+
+# Запити без придатного індексу: з лімітом за замовчуванням (перша
+# сторінка) і з лімітом, більшим за книгу, — тоді переглядається вся
+QUERIES = (
+    "domain = gmail.com",
+    "phone ^ 050 and has birthday",
+    "domain = example.org",
+)
+
+
+def best_of(repeat: int, call, *args) -> tuple[float, object]:
+    """Найкращий час з `repeat` запусків і результат останнього."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def dump_file(dump, book, path: str) -> None:
+    with open(path, "wb") as f:
+        dump(book, f)
+
+
+def load_file(load, path: str):
+    with open(path, "rb") as f:
+        return load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    book = build_address_book(options.size)
+    size, repeat = options.size, options.repeat
+    print(f"contacts: {size}, numpy: {'yes' if columnar.np is not None else 'no'}")
+    print(f"{'':24}{'seconds':>10}{'k/s':>10}{'MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, dump, load in (
+            ("pickle", pickle.dump, pickle.load),
+            ("columnar", dump_columnar, load_columnar),
+        ):
+            path = os.path.join(tmp, label)
+            save_time, _ = best_of(repeat, dump_file, dump, book, path)
+            load_time, _ = best_of(repeat, load_file, load, path)
+            megabytes = os.path.getsize(path) / 2**20
+            for action, seconds in (("save", save_time), ("load", load_time)):
+                print(
+                    f"{label + ' ' + action:24}{seconds:10.3f}"
+                    f"{size / seconds / 1000:10.0f}{megabytes:10.1f}"
+                )
+
+    # колонки будуються окремо від запитів: у колонковому сховищі вони
+    # приходять з файлу і лишаються в книзі, поки її не змінять
+    build_time, _ = best_of(1, book.columns)
+    print(f"\n{'build columns':24}{build_time:10.3f}")
+    for query in QUERIES:
+        for text in (query, f"{query} limit {size}"):
+            for label, column_scan in (("records", False), ("columns", True)):
+                book.COLUMN_SCAN = column_scan
+                seconds, (found, _) = best_of(
+                    repeat, lambda: plan_query(book, text).run()
+                )
+                print(f"{text + ', ' + label:48}{seconds:10.4f}{len(found):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Порівняння пошуку find-contact: лінійний прохід по книзі проти вторинних індексів.
+
+Запуск:  python benchmarks/bench_find_contact.py [кількість_контактів]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from assistant.handlers import find_contact  # noqa: E402
+from assistant.models import AddressBook, Record  # noqa: E402
+
+
+def build_book(size: int, seed: int = 42) -> AddressBook:
+    rnd = random.Random(seed)
+    book = AddressBook()
+    for i in range(size):
+        record = Record(f"Contact{i}")
+        record.add_phone(f"{rnd.randrange(10**9, 10**10)}")
+        record.add_email(f"contact{i}@example.com")
+        book.add_record(record)
+    return book
+
+
+def linear_find(query: str, book: AddressBook) -> list[Record]:
+    """Попередня реалізація find_contact — повний перебір записів."""
+    query = query.strip().lower()
+    matches = []
+    for record in book.data.values():
+        if record.name.value.lower() == query:
+            matches.append(record)
+            continue
+        if record.email and record.email.value.lower() == query:
+            matches.append(record)
+            continue
+        for phone in record.phones:
+            if phone.phone_number.lower() == query:
+                matches.append(record)
+                break
+    return matches
+
+
+def timeit(func, queries, book) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        func(query, book)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    book = build_book(size)
+    rnd = random.Random(7)
+    records = list(book.data.values())
+    queries = []
+    for _ in range(30):
+        record = rnd.choice(records)
+        queries.append(record.name.value.upper())
+        queries.append(record.email.value)
+        queries.append(record.phones[0].phone_number)
+
+    linear = timeit(linear_find, queries, book)
+    indexed = timeit(lambda q, b: find_contact([q], b), queries, book)
+    print(f"contacts:        {size}")
+    print(f"linear scan:     {linear * 1e3:9.3f} ms/query")
+    print(f"indexed lookup:  {indexed * 1e3:9.3f} ms/query")
+    print(f"speedup:         {linear / indexed:9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
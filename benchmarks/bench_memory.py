@@ -0,0 +1,108 @@
+"""Пам'ять на один контакт: попереднє представлення Record (об'єкти з __dict__)
+проти компактного (__slots__, кортеж телефонів, ordinal дати народження).
+
+Запуск:  python benchmarks/bench_memory.py [кількість_контактів]
+"""
+
+from datetime import datetime
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from assistant.models import AddressBook, Record  # noqa: E402
+
+
+class LegacyField:
+    """Поле у попередньому вигляді — окремий об'єкт зі своїм __dict__."""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class LegacyRecord:
+    """Запис у попередньому вигляді: словник атрибутів і список об'єктів Phone."""
+
+    def __init__(self, name: str):
+        self.name = LegacyField(name)
+        self.phones = []
+        self.birthday = None
+        self.email = None
+        self.address = None
+
+
+def contact_values(size: int, seed: int = 42):
+    rnd = random.Random(seed)
+    for i in range(size):
+        phones = [f"{rnd.randrange(10**9, 10**10)}" for _ in range(2)]
+        birthday = f"{rnd.randrange(1, 29):02d}.{rnd.randrange(1, 13):02d}.{rnd.randrange(1950, 2010)}"
+        yield (
+            f"Contact{i}",
+            phones,
+            birthday,
+            f"contact{i}@example.com",
+            f"{rnd.randrange(1, 200)} Khreshchatyk St, Kyiv",
+        )
+
+
+def build_legacy(values) -> list:
+    records = []
+    for name, phones, birthday, email, address in values:
+        record = LegacyRecord(name)
+        record.phones = [LegacyField(p) for p in phones]
+        record.birthday = LegacyField(datetime.strptime(birthday, "%d.%m.%Y").date())
+        record.email = LegacyField(email)
+        record.address = LegacyField(address)
+        records.append(record)
+    return records
+
+
+def build_compact(values) -> list:
+    records = []
+    for name, phones, birthday, email, address in values:
+        record = Record(name)
+        for phone in phones:
+            record.add_phone(phone)
+        record.add_birthday(birthday)
+        record.add_email(email)
+        record.add_address(address)
+        records.append(record)
+    return records
+
+
+def build_book(values) -> AddressBook:
+    book = AddressBook()
+    for record in build_compact(values):
+        book.add_record(record)
+    return book
+
+
+def measure(builder, values) -> int:
+    """Кількість байтів, виділених під час побудови (об'єкти лишаються живими)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = builder(values)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # значення контактів створюються заздалегідь, щоб рахувати лише представлення
+    values = list(contact_values(size))
+    legacy = measure(build_legacy, values) / size
+    compact = measure(build_compact, values) / size
+    book = measure(build_book, values) / size
+    print(f"contacts:                      {size}")
+    print(f"legacy Record (__dict__):      {legacy:8.0f} bytes/contact")
+    print(f"compact Record (__slots__):    {compact:8.0f} bytes/contact")
+    print(f"AddressBook incl. indexes:     {book:8.0f} bytes/contact")
+    print(f"records saving:                {1 - compact / legacy:8.0%}")
+
+
+if __name__ == "__main__":
+    main()
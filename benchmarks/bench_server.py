@@ -0,0 +1,158 @@
+"""Навантажувальний клієнт для мережевого режиму (assistant-bot --serve).
+
+Відкриває кілька одночасних з'єднань; кожне надсилає команди конвеєром
+(не більше `--depth` без відповіді) — суміш записів (add-contact,
+add-birthday) і читань (find-contact, show-phone, birthdays-in). Виводить
+кількість запитів за секунду та перцентилі затримок.
+
+Без --connect і --unix запускає сервер сам у тимчасовому каталозі.
+
+Запуск:  python benchmarks/bench_server.py [--clients 50] [--requests 2000]
+         python benchmarks/bench_server.py --connect 127.0.0.1:7878
+         python benchmarks/bench_server.py --unix /tmp/assistant.sock
+"""
+
+import argparse
+import asyncio
+from collections import deque
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+from assistant.server import read_response  # noqa: E402
+
+
+def workload(client: int, requests: int, writes: float, seed: int):
+    """Команди одного клієнта; спершу він додає свій контакт."""
+    rnd = random.Random(seed + client)
+    added = [f"Load{client}x0"]
+    yield f"add-contact {added[0]} {rnd.randrange(10**9, 10**10)}"
+    for i in range(1, requests):
+        if rnd.random() < writes:
+            if rnd.random() < 0.7:
+                added.append(f"Load{client}x{i}")
+                yield f"add-contact {added[-1]} {rnd.randrange(10**9, 10**10)}"
+            else:
+                day, month = rnd.randrange(1, 29), rnd.randrange(1, 13)
+                yield f"add-birthday {rnd.choice(added)} {day:02d}.{month:02d}.1990"
+        else:
+            kind = rnd.random()
+            if kind < 0.6:
+                yield f"find-contact {rnd.choice(added)}"
+            elif kind < 0.9:
+                yield f"show-phone {rnd.choice(added)}"
+            else:
+                yield "birthdays-in 7"
+
+
+async def run_client(open_connection, commands, depth: int, latencies: list) -> int:
+    reader, writer = await open_connection()
+    window = asyncio.Semaphore(depth)
+    sent: deque[float] = deque()
+    errors = 0
+
+    async def send():
+        for command in commands:
+            await window.acquire()
+            sent.append(time.perf_counter())
+            writer.write(command.encode() + b"\n")
+            await writer.drain()
+
+    sender = asyncio.create_task(send())
+    # відповіді приходять у порядку запитів, а час відправки записано до запису
+    for _ in commands:
+        outcome, _ = await read_response(reader)
+        latencies.append(time.perf_counter() - sent.popleft())
+        errors += outcome != "success"
+        window.release()
+    await sender
+    writer.close()
+    await writer.wait_closed()
+    return errors
+
+
+async def load_test(open_connection, options) -> None:
+    latencies: list[float] = []
+    clients = [
+        run_client(
+            open_connection,
+            list(workload(c, options.requests, options.writes, options.seed)),
+            options.depth,
+            latencies,
+        )
+        for c in range(options.clients)
+    ]
+    start = time.perf_counter()
+    errors = sum(await asyncio.gather(*clients))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"clients x requests:  {options.clients} x {options.requests}")
+    print(f"pipeline depth:      {options.depth}")
+    print(f"total requests:      {total} ({errors} not successful)")
+    print(f"throughput:          {total / elapsed:,.0f} req/s")
+    for q in (50, 95, 99, 99.9):
+        value = latencies[min(total - 1, int(total * q / 100))]
+        print(f"p{q:<5} latency:       {value * 1e3:8.3f} ms")
+    print(f"max latency:         {latencies[-1] * 1e3:8.3f} ms")
+
+
+async def start_server(workdir: str):
+    """Запускає `assistant-bot --serve` на вільному порту; повертає (процес, адресу)."""
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "assistant.cli",
+        "--serve",
+        "127.0.0.1:0",
+        cwd=workdir,
+        env=env,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    line = (await process.stderr.readline()).decode().strip()
+    if not line.startswith("Serving on "):
+        raise RuntimeError(f"server did not start: {line}")
+    return process, line.removeprefix("Serving on ")
+
+
+async def main_async(options) -> None:
+    process = None
+    with tempfile.TemporaryDirectory() as workdir:
+        address = options.connect
+        if options.unix:
+            connect = lambda: asyncio.open_unix_connection(options.unix)  # noqa: E731
+        else:
+            if address is None:
+                process, address = await start_server(workdir)
+            host, _, port = address.rpartition(":")
+            connect = lambda: asyncio.open_connection(host, int(port))  # noqa: E731
+        try:
+            await load_test(connect, options)
+        finally:
+            if process is not None:
+                process.terminate()
+                await process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test for assistant-bot --serve")
+    parser.add_argument("--connect", metavar="HOST:PORT")
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=16, help="pipelined requests")
+    parser.add_argument("--writes", type=float, default=0.2, help="share of writes")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
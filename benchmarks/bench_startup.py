@@ -0,0 +1,151 @@
+"""Час запуску інтерактивного режиму: імпорти та час до першого запрошення.
+
+Готує тимчасовий каталог з книгами заданого розміру (benchmarks.synthetic),
+а тоді кілька разів:
+  * `python -X importtime -c "import assistant.cli"` — сумарний час імпорту
+    і модулі, що займають найбільше;
+  * запускає `python -m assistant.cli` у псевдотерміналі й вимірює час до
+    появи запрошення "Enter a command:" та до відповіді на першу команду
+    з контактами (show-phone), після чого виходить командою exit.
+
+Байткод кешується в окремому тимчасовому каталозі (PYTHONPYCACHEPREFIX),
+а перший запуск не враховується, тож вимірюється теплий старт без
+компіляції. --src дозволяє виміряти іншу копію проєкту (наприклад,
+`git worktree add /tmp/base <коміт>`) на тих самих даних.
+
+Запуск:  python benchmarks/bench_startup.py [--size 100000] [--runs 5] [--src PATH]
+"""
+
+import argparse
+import os
+import pty
+import select
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import build_address_book, build_notes_book  # noqa: E402
+
+PROMPT = b"Enter a command:"
+
+
+def make_env(src: Path, pycache: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(src), PYTHONPYCACHEPREFIX=pycache)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def import_times(env: dict) -> tuple[float, list[tuple[int, str]]]:
+    """Сумарний час імпорту assistant.cli (мс) і модулі за власним часом (мкс)."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import assistant.cli"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    modules = []
+    total = 0.0
+    # строки вигляду "import time:  <власний, мкс> | <сумарний, мкс> | <модуль>"
+    for line in output.splitlines()[1:]:
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        name = name.strip()
+        modules.append((int(self_us), name))
+        if name == "assistant.cli":
+            total = int(cumulative_us) / 1000
+    return total, sorted(modules, reverse=True)
+
+
+def read_until(fd: int, marker: bytes, start: float, timeout: float = 120.0) -> float:
+    """Читає вивід терміналу до появи `marker`; повертає час від `start` (мс)."""
+    seen = b""
+    while marker not in seen:
+        ready, _, _ = select.select([fd], [], [], timeout)
+        if not ready:
+            raise TimeoutError(f"no {marker!r} in output: {seen[-200:]!r}")
+        seen += os.read(fd, 65536)
+    return (time.perf_counter() - start) * 1000
+
+
+def session_times(
+    env: dict, workdir: str, name: str, phone: str
+) -> tuple[float, float]:
+    """(час до запрошення, час до відповіді на show-phone) в мілісекундах."""
+    master, slave = pty.openpty()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "assistant.cli"],
+        cwd=workdir,
+        env=dict(env, TERM="dumb"),
+        stdin=slave,
+        stdout=slave,
+        stderr=slave,
+    )
+    os.close(slave)
+    try:
+        to_prompt = read_until(master, PROMPT, start)
+        os.write(master, f"show-phone {name}\r".encode())
+        # сама команда теж з'являється на екрані, тож чекаємо саме номер
+        to_answer = read_until(master, phone.encode(), start)
+        os.write(master, b"exit\r")
+        process.wait(timeout=120)
+    finally:
+        if process.poll() is None:
+            process.kill()
+        os.close(master)
+    return to_prompt, to_answer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startup time of assistant-bot")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--src", type=Path, default=ROOT / "src")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to show")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        from assistant.storage import save_all
+
+        book = build_address_book(options.size)
+        notes = build_notes_book(options.size)
+        name, record = next(iter(book.data.items()))
+        phone = record.phones[0].value
+        save_all(
+            book,
+            notes,
+            os.path.join(workdir, "addressbook.pkl"),
+            os.path.join(workdir, "notesbook.pkl"),
+        )
+        del book, notes
+        env = make_env(options.src.resolve(), os.path.join(workdir, "pycache"))
+
+        # прогрів: компіляція байткоду та кеш файлів ОС
+        import_times(env)
+        session_times(env, workdir, name, phone)
+        imports, prompts, answers = [], [], []
+        for _ in range(options.runs):
+            total, modules = import_times(env)
+            imports.append(total)
+            to_prompt, to_answer = session_times(env, workdir, name, phone)
+            prompts.append(to_prompt)
+            answers.append(to_answer)
+
+    print(f"source:                     {options.src}")
+    print(f"contacts / notes:           {options.size} / {options.size}")
+    print(f"import assistant.cli:       {statistics.median(imports):8.1f} ms")
+    print(f"to first prompt:            {statistics.median(prompts):8.1f} ms")
+    print(f"to first contact answer:    {statistics.median(answers):8.1f} ms")
+    print("slowest modules by self time (last run):")
+    for self_us, module in modules[: options.top]:
+        print(f"  {self_us / 1000:7.2f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
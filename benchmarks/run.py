@@ -0,0 +1,222 @@
+"""Набір бенчмарків гарячих шляхів на синтетичних книгах різного розміру.
+
+Для кожного розміру (окремий процес, щоб пікова пам'ять не накопичувалась)
+будує книгу контактів і книгу нотаток того самого розміру та вимірює
+find-contact, birthdays-in, find-note, find-tag, sort-tags, show-all-contacts,
+show-notes, а також save_all/load_all. Результат — JSON, який можна порівняти
+з результатом іншого коміту через --compare.
+
+Запуск:  python benchmarks/run.py [--sizes 1000 100000 1000000] [--output FILE]
+         python benchmarks/run.py --sizes 1000 --compare old.json
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+# synthetic додає src/ до sys.path, тому імпортується першим
+from synthetic import (
+    CITIES,
+    TAGS,
+    WORDS,
+    build_address_book,
+    build_notes_book,
+)
+
+from assistant import handlers
+from assistant.storage import load_all, save_all
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+# Скільки разів повторювати кожну операцію; для великих книг — менше
+QUERIES = 50
+SLOW_QUERIES = 5
+
+
+def timed(call, *args) -> float:
+    """Час одного виклику в мілісекундах."""
+    start = time.perf_counter_ns()
+    call(*args)
+    return (time.perf_counter_ns() - start) / 1e6
+
+
+def summary(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max_ms": ordered[-1],
+    }
+
+
+def peak_rss_mb() -> float:
+    """Пікова пам'ять процесу (ru_maxrss — КБ у Linux, байти в macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def bench_size(size: int, seed: int) -> dict:
+    """Усі вимірювання для книг розміру `size`."""
+    rnd = random.Random(seed + size)
+    results: dict[str, Any] = {}
+
+    start = time.perf_counter()
+    book = build_address_book(size, seed)
+    notes = build_notes_book(size, seed)
+    results["build_s"] = time.perf_counter() - start
+
+    names = list(book.data)
+    records = [book.data[rnd.choice(names)] for _ in range(QUERIES)]
+    lookups = []
+    for i, record in enumerate(records):
+        # по черзі ім'я, телефон та email (якщо є) — усі шляхи lookup
+        if i % 3 == 1:
+            lookups.append(record.phones[0].value)
+        elif i % 3 == 2 and record.email:
+            lookups.append(record.email.value)
+        else:
+            lookups.append(record.name.value)
+    misses = [f"Nobody{i}" for i in range(QUERIES // 5)]
+    results["find_contact"] = summary(
+        [timed(handlers.find_contact, [query], book) for query in lookups + misses]
+    )
+    runs = QUERIES if size <= 100_000 else SLOW_QUERIES
+    results["get_upcoming_birthdays"] = summary(
+        [timed(book.get_upcoming_birthdays, 7) for _ in range(runs)]
+    )
+    keywords = rnd.choices(WORDS + [city.lower() for city in CITIES], k=runs)
+    results["find_notes"] = summary([timed(notes.find_notes, w) for w in keywords])
+    results["get_notes_by_tag"] = summary(
+        [timed(notes.get_notes_by_tag, tag) for tag in rnd.choices(TAGS, k=runs)]
+    )
+    results["sort_by_tags"] = summary(
+        [timed(notes.sort_by_tags) for _ in range(SLOW_QUERIES)]
+    )
+    results["show_all_contacts"] = summary(
+        [timed(handlers.show_all, [], book) for _ in range(QUERIES)]
+        + [timed(handlers.show_all, ["20", "name"], book) for _ in range(QUERIES)]
+    )
+    results["show_all_notes"] = summary(
+        [timed(notes.show_all) for _ in range(SLOW_QUERIES)]
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        book_file = os.path.join(tmp, "addressbook.pkl")
+        notes_file = os.path.join(tmp, "notesbook.pkl")
+        results["save_all"] = summary(
+            [
+                timed(save_all, book, notes, book_file, notes_file)
+                for _ in range(SLOW_QUERIES)
+            ]
+        )
+        results["file_mb"] = (
+            os.path.getsize(book_file) + os.path.getsize(notes_file)
+        ) / 2**20
+        results["load_all"] = summary(
+            [timed(load_all, book_file, notes_file) for _ in range(SLOW_QUERIES)]
+        )
+
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def _bench_worker(size: int, seed: int, queue) -> None:
+    queue.put(bench_size(size, seed))
+
+
+def run_isolated(size: int, seed: int) -> dict:
+    """Запускає bench_size в окремому процесі — так пікова пам'ять чесна."""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_bench_worker, args=(size, seed, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old: dict, new: dict) -> str:
+    """Таблиця відношень p50 нового результату до старого (<1 — швидше)."""
+    lines = [
+        f"{'size':>9}  {'operation':<24}{'old p50':>10}{'new p50':>10}{'ratio':>8}"
+    ]
+    for size, results in new["results"].items():
+        previous = old["results"].get(size)
+        if previous is None:
+            continue
+        for name, value in results.items():
+            if not isinstance(value, dict) or name not in previous:
+                continue
+            before, after = previous[name]["p50_ms"], value["p50_ms"]
+            ratio = after / before if before else float("inf")
+            lines.append(
+                f"{size:>9}  {name:<24}{before:>10.3f}{after:>10.3f}{ratio:>8.2f}"
+            )
+    return "\n".join(lines)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON")
+    parser.add_argument(
+        "--compare", metavar="FILE", help="print p50 ratios against an earlier run"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    options = parse_args(argv)
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": options.seed,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": {},
+    }
+    for size in options.sizes:
+        print(f"benchmarking {size} contacts and notes...", file=sys.stderr)
+        report["results"][str(size)] = run_isolated(size, options.seed)
+
+    text = json.dumps(report, indent=2)
+    if options.output:
+        Path(options.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if options.compare:
+        old = json.loads(Path(options.compare).read_text(encoding="utf-8"))
+        print(compare(old, report), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
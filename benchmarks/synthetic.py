@@ -0,0 +1,104 @@
+"""Відтворюваний генератор синтетичних адресних книг і книг нотаток.
+
+Усі значення проходять ті самі перевірки, що й ручне введення: телефони з
+10 цифр з кодами українських операторів, email вигляду ім'я.прізвище@домен,
+дати народження 1950–2009 років, адреси "місто, вулиця, будинок". Нотатки
+мають текст зі словника і 0–3 теги з нерівномірним (Zipf) розподілом, як у
+реальних даних. Однаковий `seed` дає однакові книги.
+"""
+
+from datetime import date
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from assistant.models import AddressBook, Record  # noqa: E402
+from assistant.notes import Note, NotesBook  # noqa: E402
+
+FIRST_NAMES = (
+    "Andrii Anna Bohdan Daryna Dmytro Iryna Ivan Kateryna Kyrylo Larysa Maksym "
+    "Mariia Mykola Nadiia Oleh Olena Oleksandr Oksana Pavlo Roman Sofiia Serhii "
+    "Taras Tetiana Viktor Viktoriia Volodymyr Yaroslav Yuliia Yurii Zoriana"
+).split()
+LAST_NAMES = (
+    "Bondarenko Boyko Hnatiuk Honchar Kovalenko Kovalchuk Kravchenko Lysenko "
+    "Melnyk Moroz Oliinyk Pavlenko Petrenko Polishchuk Savchenko Shevchenko "
+    "Shevchuk Tkachenko Tkachuk Vasylenko Zaiets Rudenko Marchenko Karpenko"
+).split()
+OPERATOR_CODES = ("050", "063", "066", "067", "068", "073", "093", "095", "097")
+EMAIL_DOMAINS = ("gmail.com", "ukr.net", "i.ua", "outlook.com", "meta.ua")
+CITIES = ("Kyiv", "Lviv", "Odesa", "Dnipro", "Kharkiv", "Poltava", "Vinnytsia")
+STREETS = (
+    "Shevchenka St",
+    "Franka St",
+    "Lesi Ukrainky Blvd",
+    "Khreshchatyk St",
+    "Sadova St",
+    "Hrushevskoho St",
+    "Peremohy Ave",
+    "Naukova St",
+)
+WORDS = (
+    "meeting call report budget review plan release deadline client invoice "
+    "project design sprint demo backlog update team lunch travel doctor gift "
+    "birthday order delivery contract draft idea bug fix deploy test follow-up"
+).split()
+TAGS = (
+    "work home urgent ideas family finance travel health shopping study "
+    "project personal later reading sport car"
+).split()
+
+
+def _phone(rnd: random.Random) -> str:
+    return rnd.choice(OPERATOR_CODES) + f"{rnd.randrange(10**7):07d}"
+
+
+def generate_records(size: int, seed: int = 42):
+    """Генерує `size` записів з унікальними іменами."""
+    rnd = random.Random(seed)
+    for i in range(size):
+        first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+        # ім'я контакту — одне слово, номер робить його унікальним
+        name = f"{first}{last}{i}"
+        phones = dict.fromkeys(_phone(rnd) for _ in range(rnd.choice((1, 1, 2, 3))))
+        birthday = email = address = None
+        if rnd.random() < 0.8:
+            birthday = date.fromordinal(
+                rnd.randrange(
+                    date(1950, 1, 1).toordinal(), date(2010, 1, 1).toordinal()
+                )
+            )
+        if rnd.random() < 0.7:
+            email = f"{first.lower()}.{last.lower()}{i}@{rnd.choice(EMAIL_DOMAINS)}"
+        if rnd.random() < 0.5:
+            address = (
+                f"{rnd.choice(CITIES)}, {rnd.choice(STREETS)}, {rnd.randrange(1, 200)}"
+            )
+        yield Record.from_values(name, phones, birthday, email, address)
+
+
+def generate_notes(size: int, seed: int = 42):
+    """Генерує `size` нотаток з текстом зі словника і тегами."""
+    rnd = random.Random(seed)
+    # Zipf: перші теги словника трапляються значно частіше за останні
+    weights = [1 / rank for rank in range(1, len(TAGS) + 1)]
+    for _ in range(size):
+        text = " ".join(rnd.choices(WORDS, k=rnd.randrange(3, 12)))
+        tags = rnd.choices(TAGS, weights, k=rnd.choice((0, 1, 1, 2, 3)))
+        yield Note(text, tags)
+
+
+def build_address_book(size: int, seed: int = 42) -> AddressBook:
+    book = AddressBook()
+    for record in generate_records(size, seed):
+        book.add_record(record)
+    return book
+
+
+def build_notes_book(size: int, seed: int = 42) -> NotesBook:
+    notes = NotesBook()
+    for note_id, note in enumerate(generate_notes(size, seed), start=1):
+        notes[note_id] = note
+    return notes
@@ -1,48 +1,102 @@
 from prompt_toolkit.completion import Completer, Completion
 
-COMMANDS = [
-    "hello",
-    "add-contact",
-    "remove-contact",
-    "change-contact",
-    "remove-phone",
-    "show-phone",
-    "find-contact",
-    "show-all-contacts",
-    "add-birthday",
-    "show-birthday",
-    "birthdays-in",
-    "add-email",
-    "change-email",
-    "add-address",
-    "change-address",
-    "add-note",
-    "show-notes",
-    "find-note",
-    "edit-note",
-    "delete-note",
-    "add-tag",
-    "remove-tag",
-    "find-tag",
-    "sort-tags",
-    "close",
-    "exit",
-]
+from .models import AddressBook, with_prefix
+from .notes import NotesBook
+
+# Скільки варіантів показувати за одне натискання клавіші
+MAX_COMPLETIONS = 50
 
 
 class CommandCompleter(Completer):
-    """Клас автокомпліта для команд"""
+    """Клас автокомпліта для команд та їх аргументів.
+
+    Що доповнювати, визначає `arguments` команди з реєстру — по одному
+    елементу на позицію аргументу: "name" — імена контактів, "phone" —
+    телефони контакту з першого аргументу, "note" — ID нотаток, "tag" — усі
+    теги, "note-tag" — теги нотатки з першого аргументу, кортеж — фіксовані
+    варіанти, None — нічого.
 
-    def __init__(self, commands: list[str]):
+    Назви команд, імена контактів, теги та ID нотаток шукаються за префіксом
+    у відсортованих списках бінарним пошуком — так само швидко, як у
+    префіксному дереві, але без додаткової пам'яті: книги вже підтримують ці
+    списки в актуальному стані при кожній зміні. Тому вартість доповнення
+    залежить від кількості показаних варіантів, а не від розміру книги.
+    """
+
+    def __init__(self, commands: dict, context=None):
         self.commands = commands
+        self.names = sorted(commands)
+        # книги беруться з контексту команд лише коли потрібні для доповнення,
+        # тож відкладене завантаження (див. commands.Context) не починається
+        # від набору назви команди
+        self.context = context if context is not None else {}
+
+    @property
+    def book(self) -> AddressBook | None:
+        return self._get("book")
+
+    @property
+    def notes(self) -> NotesBook | None:
+        return self._get("notes")
+
+    def _get(self, key: str):
+        try:
+            return self.context[key]
+        except KeyError:
+            return None
 
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor
+        words = text.split()
+        # поточне слово — порожнє, якщо курсор стоїть після пробілу
+        if not words or text[-1].isspace():
+            words.append("")
+        word = words[-1]
+
+        if len(words) == 1:
+            candidates = with_prefix(self.names, word.lower(), MAX_COMPLETIONS)
+        else:
+            candidates = self._arguments(words[0].lower(), words[1:-1], word)
+        for candidate in candidates:
+            yield Completion(candidate, start_position=-len(word))
 
-        if not text.strip() or " " in text:
-            return
+    def _arguments(self, command: str, before: list[str], word: str) -> list[str]:
+        """Варіанти для аргументу `word`, перед яким уже введено `before`."""
+        kinds = self.commands[command].arguments if command in self.commands else ()
+        if len(before) >= len(kinds) or kinds[len(before)] is None:
+            return []
+        kind = kinds[len(before)]
+        if isinstance(kind, tuple):
+            return [choice for choice in kind if choice.startswith(word.lower())]
+        if kind in ("name", "phone"):
+            book = self.book
+            if book is None:
+                return []
+            if kind == "name":
+                return book.names_with_prefix(word, MAX_COMPLETIONS)
+            record = book.find(before[0])
+            phones = [phone.value for phone in record.phones] if record else []
+            return [phone for phone in phones if phone.startswith(word)]
+        if kind in ("note", "tag", "note-tag"):
+            notes = self.notes
+            if notes is None:
+                return []
+            if kind == "note":
+                ids = notes.ids_with_prefix(word, MAX_COMPLETIONS)
+                return [str(note_id) for note_id in ids]
+            # тег можна вводити з '#' — тоді й варіанти пропонуються з ним
+            mark = "#" if word.startswith("#") else ""
+            if kind == "tag":
+                tags = notes.tags_with_prefix(word, MAX_COMPLETIONS)
+            else:
+                tags = self._note_tags(notes, before[0], word)
+            return [mark + tag for tag in tags]
+        return []
 
-        word = text.strip()
-        for cmd in self.commands:
-            if cmd.startswith(word):
-                yield Completion(cmd, start_position=-len(word))
+    @staticmethod
+    def _note_tags(notes: NotesBook, note_id: str, word: str) -> list[str]:
+        note = notes.get_note(int(note_id)) if note_id.isdigit() else None
+        if note is None:
+            return []
+        prefix = word.strip("#").lower()
+        return sorted(tag for tag in note.tags if tag.startswith(prefix))
@@ -0,0 +1,103 @@
+"""Фонове автозбереження книг із затримкою (debounce).
+
+Книги повідомляють про кожну зміну (див. models.Observable), і Autosaver
+будить свій потік. Потік чекає, доки зміни не припиняться на `delay`
+секунд (але не довше `max_delay` від першої незбереженої зміни), і зберігає
+книги через storage.save_pending(). Серія команд дає одне збереження, а
+запис файлу не затримує введення наступної команди.
+
+Команди, що змінюють книги, слід виконувати під `lock` (це storage.lock):
+фоновий потік бере його лише щоб зробити копію книги (див. Observable.snapshot).
+"""
+
+import threading
+import time
+
+AUTOSAVE_DELAY = 2.0
+AUTOSAVE_MAX_DELAY = 30.0
+# Після невдалої спроби (наприклад, диск переповнений)
+RETRY_DELAY = 1.0
+
+
+class Autosaver:
+    """Потік, що зберігає змінені книги у фоні.
+
+    Приклад:
+        autosaver = Autosaver(storage)
+        autosaver.watch(book)  # кожну книгу — одразу після завантаження
+        with autosaver.lock:
+            ...                # команда змінює книги
+        autosaver.close()      # зупиняє потік
+        storage.close(book, notes)  # дописує те, що ще не збережено
+    """
+
+    def __init__(
+        self,
+        storage,
+        delay: float = AUTOSAVE_DELAY,
+        max_delay: float = AUTOSAVE_MAX_DELAY,
+    ):
+        self.storage = storage
+        self.books: list = []
+        self.delay = delay
+        self.max_delay = max_delay
+        self.lock = storage.lock
+        self.saves = 0
+        self.error: Exception | None = None
+        self._changed = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def watch(self, book):
+        """Починає стежити за змінами книги; повертає саму книгу."""
+        book.subscribe(self._on_change)
+        self.books.append(book)
+        return book
+
+    def _on_change(self, change: tuple) -> None:
+        self._changed.set()
+
+    @property
+    def pending(self) -> bool:
+        return any(book.dirty for book in self.books)
+
+    def _run(self) -> None:
+        while True:
+            self._changed.wait()
+            if self._stopping:
+                return
+            first = time.monotonic()
+            # чекаємо паузи в змінах, але не довше max_delay
+            while True:
+                self._changed.clear()
+                left = self.max_delay - (time.monotonic() - first)
+                if left <= 0 or not self._changed.wait(min(self.delay, left)):
+                    break
+                if self._stopping:
+                    return
+            self._save()
+
+    def _save(self) -> None:
+        try:
+            self.storage.save_pending()
+        except OSError as e:
+            self.error = e
+            if not self._stopping:
+                time.sleep(RETRY_DELAY)
+                self._changed.set()
+        else:
+            self.saves += 1
+            self.error = None
+
+    def close(self) -> None:
+        """Зупиняє потік, дочекавшись поточного збереження.
+
+        Незбережені зміни лишаються позначеними як dirty — їх запише
+        storage.close().
+        """
+        for book in self.books:
+            book.unsubscribe(self._on_change)
+        self._stopping = True
+        self._changed.set()
+        self._thread.join()
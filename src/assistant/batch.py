@@ -0,0 +1,72 @@
+"""Пакетний режим: виконання команд з файлу або stdin без інтерактивної сесії.
+
+Кожен рядок розбирається тим самим parse_input і виконується тими самими
+обробниками, що й в інтерактивному режимі. Порожні рядки та рядки, що
+починаються з '#', пропускаються. Дані зберігаються один раз наприкінці
+(або кожні `checkpoint_every` команд), а не після кожної зміни.
+"""
+
+import sys
+
+from .commands import REGISTRY
+from .handlers import parse_input
+from .stats import Stats, last_outcome
+
+
+class BatchResult:
+    """Підсумок виконання: кількість команд і номери рядків з помилками."""
+
+    __slots__ = ("executed", "failed", "checkpoints")
+
+    def __init__(self) -> None:
+        self.executed = 0
+        self.failed: list[int] = []
+        self.checkpoints = 0
+
+    def __str__(self) -> str:
+        return (
+            f"Executed {self.executed} commands, {len(self.failed)} failed, "
+            f"{self.checkpoints} checkpoints."
+        )
+
+
+def run_batch(
+    lines,
+    context: dict,
+    storage,
+    checkpoint_every: int = 0,
+    out=sys.stdout,
+    err=sys.stderr,
+) -> BatchResult:
+    """Виконує команди з `lines`; результат кожної друкує як "рядок: відповідь".
+
+    Невідомі команди та помилки вводу (KeyError/ValueError/IndexError з
+    обробників) друкуються в `err` з назвою помилки. Команда exit/close
+    зупиняє виконання. Збереження через storage.checkpoint() — кожні
+    `checkpoint_every` виконаних команд (0 — лише в кінці, при закритті).
+    """
+    stats: Stats = context["stats"]
+    result = BatchResult()
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        name, args = parse_input(line)
+        command = REGISTRY.get(name)
+        if command is None:
+            result.failed.append(lineno)
+            print(f"{lineno}: Invalid command: {name}", file=err)
+            continue
+        if command.exits:
+            break
+        message = stats.run(name, command, args, context)
+        result.executed += 1
+        outcome = last_outcome.get()
+        if outcome == "success":
+            print(f"{lineno}: {message}", file=out)
+        else:
+            result.failed.append(lineno)
+            print(f"{lineno}: {outcome}: {message}", file=err)
+        if checkpoint_every and result.executed % checkpoint_every == 0:
+            storage.checkpoint(context["book"], context["notes"])
+            result.checkpoints += 1
+    return result
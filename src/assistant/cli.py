@@ -1,109 +1,204 @@
-from .storage import load_data, save_data, load_notes, save_notes
-from .handlers import (
-    parse_input,
-    add_contact,
-    change_contact,
-    show_phone,
-    show_all,
-    add_birthday,
-    show_birthday,
-    birthdays,
-    remove_contact,
-    find_contact,
-    remove_phone,
-    add_email,
-    edit_email,
-    add_address,
-    edit_address,
-    add_note,
-    edit_note,
-    delete_note,
-    find_note,
-    add_note_tag,
-    remove_note_tag,
-    find_note_tag,
-    sort_tags,
-)
-from prompt_toolkit import PromptSession
-from .autocomplete import COMMANDS, CommandCompleter
-
-
-def main():
-    # Завантажуємо AddressBook та NoteBook з файлу
-    book = load_data()
-    notes = load_notes()
+import argparse
+from contextlib import nullcontext
+import sys
+import threading
+
+# prompt_toolkit, asyncio та модулі окремих режимів імпортуються в тих
+# функціях, що їх використовують: кожен режим платить лише за своє
+from .storage import STORAGE_ENGINES
+from .commands import REGISTRY, Context
+from .handlers import parse_input
+from .stats import Stats
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="assistant-bot")
+    parser.add_argument(
+        "--storage",
+        choices=sorted(STORAGE_ENGINES),
+        default="pickle",
+        help="спосіб зберігання даних (за замовчуванням: pickle)",
+    )
+    parser.add_argument(
+        "--stats-file",
+        metavar="FILE",
+        help="записати статистику виконання команд у файл JSON при виході",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="виконати команди з файлу ('-' — зі stdin) без інтерактивної сесії",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="N",
+        type=int,
+        default=0,
+        help="у пакетному режимі зберігати дані кожні N команд (0 — лише в кінці)",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="[HOST:]PORT",
+        help="запустити сервер для спільної роботи кількох клієнтів по TCP",
+    )
+    parser.add_argument(
+        "--unix",
+        metavar="PATH",
+        help="запустити сервер на Unix-сокеті PATH",
+    )
+    return parser.parse_args(argv)
+
+
+def serve_main(options: argparse.Namespace, storage) -> int:
+    """Мережевий режим: працює до Ctrl+C, після чого зберігає дані."""
+    import asyncio
+
+    from .server import DEFAULT_PORT, serve
+
+    host, port = "127.0.0.1", DEFAULT_PORT
+    if options.serve:
+        host_part, _, port_part = options.serve.rpartition(":")
+        if not port_part.isdigit():
+            print("Use --serve PORT or --serve HOST:PORT.", file=sys.stderr)
+            return 2
+        host, port = host_part or host, int(port_part)
+    try:
+        asyncio.run(
+            serve(
+                storage,
+                host,
+                port,
+                options.unix,
+                ready=lambda address: print(f"Serving on {address}", file=sys.stderr),
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    print("Data saved. Good bye!", file=sys.stderr)
+    return 0
+
+
+def batch_main(options: argparse.Namespace, storage) -> int:
+    """Пакетний режим: повертає 1, якщо хоч одна команда завершилась помилкою."""
+    from .batch import run_batch
+
+    if options.batch == "-":
+        lines = sys.stdin
+    else:
+        try:
+            lines = open(options.batch, encoding="utf-8")
+        except OSError as e:
+            print(f"Cannot read {options.batch}: {e.strerror}", file=sys.stderr)
+            return 2
+    book, notes = storage.load()
+    stats = Stats()
+    context = {"book": book, "notes": notes, "stats": stats}
+    try:
+        result = run_batch(lines, context, storage, options.checkpoint)
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+        # зберігаємо навіть після винятку, щоб не втратити виконані команди
+        storage.close(book, notes)
+        if options.stats_file:
+            stats.dump(options.stats_file)
+    print(result, file=sys.stderr)
+    return 1 if result.failed else 0
+
+
+def load_in_background(load):
+    """Запускає load() у фоновому потоці; повертає функцію, що чекає результату."""
+    result = {}
+
+    def run():
+        try:
+            result["value"] = load()
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run, name="load", daemon=True)
+    thread.start()
+
+    def wait():
+        thread.join()
+        if "error" in result:
+            raise result["error"]
+        return result["value"]
+
+    return wait
+
+
+def interactive_main(options: argparse.Namespace, storage) -> int:
+    # Контакти читаються у фоні, поки імпортується prompt_toolkit і
+    # будується сесія; нотатки — лише з першою командою, що їх потребує
+    wait_book = load_in_background(storage.load_book)
+
+    from prompt_toolkit import PromptSession
+
+    from .autocomplete import CommandCompleter
+    from .autosave import Autosaver
+
+    # pickle-файли зберігаються у фоні після кожної серії змін; журнал і
+    # SQLite записують кожну зміну одразу
+    autosaver = Autosaver(storage) if storage.background_save else None
+    lock = autosaver.lock if autosaver is not None else nullcontext()
+    watch = autosaver.watch if autosaver is not None else (lambda book: book)
+    stats = Stats()
+    context = Context(
+        {
+            "book": lambda: watch(wait_book()),
+            "notes": lambda: watch(storage.load_notes()),
+        },
+        stats=stats,
+    )
     print("Welcome to the assistant bot!")
 
     # Ініціалізуємо інтерактивну сесію введення команд:
-    # - працює автодоповнення лише для назви команди
+    # - автодоповнення назв команд, імен контактів, ID нотаток і тегів
     # - підказки з’являються під час набору тексту (без автоматичної вставки)
-    session = PromptSession(
-        completer=CommandCompleter(COMMANDS),
+    session: PromptSession[str] = PromptSession(
+        completer=CommandCompleter(REGISTRY, context),
         complete_while_typing=True,
     )
 
-    while True:
-        user_input = session.prompt("Enter a command: ")
-        command, args = parse_input(user_input)
-        if command in ("close", "exit"):
-            # Перед виходом зберігаємо AddressBook та NoteBook у файл
-            save_data(book)
-            save_notes(notes)
-            print("Data saved. Good bye!")
-            break
-        elif command == "hello":
-            print("How can I help you?")
-        elif command == "add-contact":
-            print(add_contact(args, book))
-        elif command == "remove-contact":
-            print(remove_contact(args, book))
-        elif command == "change-contact":
-            print(change_contact(args, book))
-        elif command == "remove-phone":
-            print(remove_phone(args, book))
-        elif command == "show-phone":
-            print(show_phone(args, book))
-        elif command == "find-contact":
-            print(find_contact(args, book))
-        elif command == "show-all-contacts":
-            print(show_all(book))
-        elif command == "add-birthday":
-            print(add_birthday(args, book))
-        elif command == "show-birthday":
-            print(show_birthday(args, book))
-        elif command == "birthdays-in":
-            print(birthdays(args, book))
-        elif command == "add-email":
-            print(add_email(args, book))
-        elif command == "change-email":
-            print(edit_email(args, book))
-        elif command == "add-address":
-            print(add_address(args, book))
-        elif command == "change-address":
-            print(edit_address(args, book))
-        # --- Нотатки ---
-        elif command == "add-note":
-            print(add_note(args, notes))
-        elif command == "show-notes":
-            print(notes.show_all())
-        elif command == "find-note":
-            print(find_note(args, notes))
-        elif command == "edit-note":
-            print(edit_note(args, notes))
-        elif command == "delete-note":
-            print(delete_note(args, notes))
-        # --- Теги ---
-        elif command == "add-tag":
-            print(add_note_tag(args, notes))
-        elif command == "remove-tag":
-            print(remove_note_tag(args, notes))
-        elif command == "find-tag":
-            print(find_note_tag(args, notes))
-        elif command == "sort-tags":
-            print(sort_tags(notes))
-        else:
-            print("Invalid command.")
+    try:
+        while True:
+            try:
+                user_input = session.prompt("Enter a command: ")
+            except (KeyboardInterrupt, EOFError):
+                # Ctrl+C / Ctrl+D — вихід зі збереженням, як і exit
+                break
+            name, args = parse_input(user_input)
+            command = REGISTRY.get(name)
+            if command is None:
+                print("Invalid command.")
+            elif command.exits:
+                break
+            else:
+                with lock:
+                    result = stats.run(name, command, args, context)
+                print(result)
+    finally:
+        # Перед виходом дописуємо у файл те, що ще не встигло зберегтися;
+        # книгу контактів дочікуємося, якщо вона ще завантажується
+        if autosaver is not None:
+            autosaver.close()
+        storage.close(context["book"], context.get("notes"))
+        if options.stats_file:
+            stats.dump(options.stats_file)
+    print("Data saved. Good bye!")
+    return 0
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    storage = STORAGE_ENGINES[options.storage]()
+    if options.batch:
+        return batch_main(options, storage)
+    if options.serve or options.unix:
+        return serve_main(options, storage)
+    return interactive_main(options, storage)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""Колонковий формат контактів і пакетні фільтри над колонками.
+
+Замість графа об'єктів Record книга зберігається стовпцями: імена, email
+та адреси — текстом, телефони — одним масивом чисел (номер завжди має 10
+цифр) і кількістю телефонів кожного контакту, дні народження — порядковими
+номерами дат. Телефони з цифрами поза ASCII (Phone приймає будь-які
+str.isdigit()) числом не зберегти без втрат, тож такі контакти мають усі
+телефони в текстовій колонці phone_texts. Такий файл пишеться і читається
+значно швидше за pickle.
+
+Над колонками в пам'яті ContactColumns.select одним проходом відбирає
+рядки за днем народження, місяцем, доменом email і кодом оператора — так
+повний перегляд у find-contact (див. query.py) не розбирає кожен Record.
+Якщо встановлено NumPy, обчислення над числовими колонками векторизовані,
+інакше — на чистому Python.
+
+Формат файлу (числа little-endian): заголовок HEADER (сигнатура, версія
+схеми, кількість записів і колонок), далі для кожної колонки COLUMN_HEADER
+(назва, тип, довжина стиснених даних) і самі дані, стиснені zlib. Тип —
+код array для числових колонок або "T" для текстових: довжини рядків
+(array "I") і весь текст у UTF-8. Невідомі колонки при читанні пропускаються.
+"""
+
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import date
+from itertools import accumulate, chain, compress, repeat
+import gc
+import struct
+import sys
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # обчислення над колонками на чистому Python
+    np = None
+
+from .models import AddressBook, Record
+
+MAGIC = b"ABCOLS\x00\x00"
+# 2 — колонка phone_texts; у файлах версії 1 її немає
+VERSION = 2
+HEADER = struct.Struct("<8sHQH")
+COLUMN_HEADER = struct.Struct("<16scQ")
+# Швидкий рівень стиснення: колонки однотипні й добре стискаються і так
+COMPRESSION_LEVEL = 1
+# Назва колонки -> тип; порядок колонок — порядок аргументів ContactColumns
+COLUMNS = {
+    "names": "T",
+    "phone_counts": "H",
+    "phones": "Q",
+    "birthdays": "I",
+    "emails": "T",
+    "addresses": "T",
+    "phone_texts": "T",
+}
+PHONE_DIGITS = 10
+# Роздільник телефонів у phone_texts: цифр у ньому немає
+PHONE_SEPARATOR = ","
+# Рядків в одному блоці select: досить, щоб обчислення були пакетними, і
+# небагато, щоб запит з limit зупинявся, не переглянувши всієї книги
+BLOCK_ROWS = 4096
+# Порядковий номер 01.01.1970 — початок відліку datetime64 у NumPy
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@contextmanager
+def _gc_paused():
+    """Вимикає збирач сміття на час створення мільйонів записів без циклів.
+
+    Інакше кожна повна збірка обходить усі вже створені записи, і на
+    великій книзі це подвоює час читання.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _encode_column(kind: str, values) -> bytes:
+    if kind != "T":
+        return _little_endian(values).tobytes()
+    lengths = _little_endian(array("I", map(len, values)))
+    return lengths.tobytes() + "".join(values).encode()
+
+
+def _decode_column(kind: str, payload: bytes, count: int):
+    if kind != "T":
+        return _little_endian(array(kind, payload))
+    lengths = _little_endian(array("I", payload[: 4 * count]))
+    text = payload[4 * count :].decode()
+    if not text:
+        return [""] * count
+    ends = list(accumulate(lengths))
+    return [text[start:end] for start, end in zip([0, *ends], ends)]
+
+
+class ContactColumns:
+    """Контакти, розкладені по колонках; рядок — номер запису в порядку додавання.
+
+    Email і адреса, яких немає, — порожні рядки, день народження — 0.
+    phone_texts — телефони рядка через кому, якщо серед них є номер з
+    цифрами поза ASCII (тоді в phone_counts для рядка 0), інакше порожній рядок.
+    """
+
+    def __init__(
+        self,
+        names: list[str],
+        phone_counts: array,
+        phones: array,
+        birthdays: array,
+        emails: list[str],
+        addresses: list[str],
+        phone_texts: list[str],
+    ):
+        self.names = names
+        self.phone_counts = phone_counts
+        self.phones = phones
+        self.birthdays = birthdays
+        self.emails = emails
+        self.addresses = addresses
+        self.phone_texts = phone_texts
+        # похідні колонки для select; обчислюються при потребі
+        self._month_days: array | None = None
+        self._domains: list[str] | None = None
+        self._phone_starts: array | None = None
+        self._text_phone_rows: list[int] | None = None
+
+    @classmethod
+    def from_records(cls, records) -> "ContactColumns":
+        names, emails, addresses, phone_texts = [], [], [], []
+        phone_counts, phones, birthdays = array("H"), array("Q"), array("I")
+        for record in records:
+            names.append(record._name)
+            text = PHONE_SEPARATOR.join(record._phones)
+            if text.isascii():
+                phone_counts.append(len(record._phones))
+                phones.extend(map(int, record._phones))
+                phone_texts.append("")
+            else:
+                # int() перетворив би, наприклад, арабсько-індійські цифри на
+                # ASCII, а "²" не розібрав би зовсім
+                phone_counts.append(0)
+                phone_texts.append(text)
+            birthdays.append(record._birthday or 0)
+            emails.append(record._email or "")
+            addresses.append(record._address or "")
+        return cls(
+            names, phone_counts, phones, birthdays, emails, addresses, phone_texts
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def records(self):
+        """Записи Record рядків у порядку додавання."""
+        phones = [f"{number:0{PHONE_DIGITS}d}" for number in self.phones]
+        ends = accumulate(self.phone_counts)
+        start = 0
+        new = Record.__new__
+        for name, end, ordinal, email, address, text in zip(
+            self.names,
+            ends,
+            self.birthdays,
+            self.emails,
+            self.addresses,
+            self.phone_texts,
+        ):
+            record = new(Record)
+            record._name = name
+            if text:
+                record._phones = tuple(text.split(PHONE_SEPARATOR))
+            else:
+                record._phones = tuple(phones[start:end])
+            record._birthday = ordinal or None
+            record._email = email or None
+            record._address = address or None
+            record._book = None
+            record._rendered = None
+            start = end
+            yield record
+
+    def to_book(self) -> AddressBook:
+        """AddressBook з усіма записами; колонки лишаються в ньому як кеш."""
+        book = AddressBook()
+        with _gc_paused():
+            book.data = {record._name: record for record in self.records()}
+            book._rebuild_indexes()
+        book.keep_columns(self)
+        return book
+
+    def write(self, f) -> None:
+        f.write(HEADER.pack(MAGIC, VERSION, len(self), len(COLUMNS)))
+        for name, kind in COLUMNS.items():
+            data = zlib.compress(
+                _encode_column(kind, getattr(self, name)), COMPRESSION_LEVEL
+            )
+            f.write(COLUMN_HEADER.pack(name.encode(), kind.encode(), len(data)))
+            f.write(data)
+
+    @classmethod
+    def read(cls, f) -> "ContactColumns":
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[: len(MAGIC)] != MAGIC:
+            raise ValueError("Not a columnar contacts file.")
+        _, version, count, column_count = HEADER.unpack(header)
+        if version > VERSION:
+            raise ValueError(f"Unsupported columnar file version {version}.")
+        columns = {}
+        for _ in range(column_count):
+            name, kind, size = COLUMN_HEADER.unpack(f.read(COLUMN_HEADER.size))
+            name = name.rstrip(b"\0").decode()
+            payload = zlib.decompress(f.read(size))
+            if name in COLUMNS:
+                columns[name] = _decode_column(kind.decode(), payload, count)
+        if version < 2:
+            columns["phone_texts"] = [""] * count
+        missing = [name for name in COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Columnar file has no columns: {', '.join(missing)}.")
+        return cls(*(columns[name] for name in COLUMNS))
+
+    @property
+    def month_days(self) -> array:
+        """Місяць * 100 + день народження для кожного рядка (0 — дати немає)."""
+        if self._month_days is None:
+            if np is not None:
+                ordinals = np.frombuffer(self.birthdays, dtype=np.uint32)
+                days = (ordinals.astype(np.int64) - EPOCH_ORDINAL).astype("M8[D]")
+                months = days.astype("M8[M]")
+                month_days = np.where(
+                    ordinals > 0,
+                    (months.astype(np.int64) % 12 + 1) * 100
+                    + (days - months).astype(np.int64)
+                    + 1,
+                    0,
+                )
+                self._month_days = array("H", month_days.astype(np.uint16).tobytes())
+            else:
+                # різних дат значно менше, ніж контактів
+                cache = {0: 0}
+                month_days = array("H")
+                for ordinal in self.birthdays:
+                    value = cache.get(ordinal)
+                    if value is None:
+                        born = date.fromordinal(ordinal)
+                        value = cache[ordinal] = born.month * 100 + born.day
+                    month_days.append(value)
+                self._month_days = month_days
+        return self._month_days
+
+    @property
+    def domains(self) -> list[str]:
+        """Частина email після @ без урахування регістру ("" — email немає)."""
+        if self._domains is None:
+            self._domains = [
+                email.rpartition("@")[2].casefold() for email in self.emails
+            ]
+        return self._domains
+
+    @property
+    def phone_starts(self) -> array:
+        """Номер першого телефону кожного рядка в колонці phones (і кінець)."""
+        if self._phone_starts is None:
+            self._phone_starts = array("Q", accumulate(self.phone_counts, initial=0))
+        return self._phone_starts
+
+    @property
+    def text_phone_rows(self) -> list[int]:
+        """Рядки з телефонами в phone_texts, за зростанням."""
+        if self._text_phone_rows is None:
+            self._text_phone_rows = [
+                row for row, text in enumerate(self.phone_texts) if text
+            ]
+        return self._text_phone_rows
+
+    def _phone_rows(self, start: int, end: int, code: str) -> set[int]:
+        """Рядки блока, у яких хоч один телефон починається з цифр `code`."""
+        shift = 10 ** (PHONE_DIGITS - len(code))
+        prefix = int(code)
+        first, last = self.phone_starts[start], self.phone_starts[end]
+        if np is not None:
+            numbers = np.frombuffer(self.phones, dtype=np.uint64)[first:last]
+            counts = np.frombuffer(self.phone_counts, dtype=np.uint16)[start:end]
+            owners = np.repeat(np.arange(start, end), counts)
+            rows = set(owners[numbers // shift == prefix].tolist())
+        else:
+            owners = chain.from_iterable(
+                map(repeat, range(start, end), self.phone_counts[start:end])
+            )
+            numbers = map(shift.__rfloordiv__, self.phones[first:last])
+            rows = set(compress(owners, map(prefix.__eq__, numbers)))
+        # телефони з цифрами поза ASCII — текстом (див. phone_texts)
+        text_rows = self.text_phone_rows
+        for row in text_rows[
+            bisect_left(text_rows, start) : bisect_left(text_rows, end)
+        ]:
+            phones = self.phone_texts[row].split(PHONE_SEPARATOR)
+            if any(phone.startswith(code) for phone in phones):
+                rows.add(row)
+        return rows
+
+    def _select_block(
+        self,
+        start: int,
+        end: int,
+        has_birthday: bool,
+        birth_month: int | None,
+        domain: str | None,
+        phone_code: str | None,
+    ) -> list[int]:
+        # кожен фільтр — ланцюжок map/compress без циклу на Python для рядка
+        if np is not None:
+            mask = np.ones(end - start, dtype=bool)
+            if has_birthday:
+                mask &= np.frombuffer(self.birthdays, dtype=np.uint32)[start:end] > 0
+            if birth_month is not None:
+                month_days = np.frombuffer(self.month_days, dtype=np.uint16)
+                mask &= month_days[start:end] // 100 == birth_month
+            rows = (np.flatnonzero(mask) + start).tolist()
+        else:
+            rows = range(start, end)
+            if has_birthday:
+                rows = list(compress(rows, map(self.birthdays.__getitem__, rows)))
+            if birth_month is not None:
+                month_days = map(self.month_days.__getitem__, rows)
+                months = map((100).__rfloordiv__, month_days)
+                rows = list(compress(rows, map(birth_month.__eq__, months)))
+        if phone_code is not None and rows:
+            matched = self._phone_rows(start, end, phone_code)
+            rows = list(compress(rows, map(matched.__contains__, rows)))
+        if domain is not None:
+            domains = map(self.domains.__getitem__, rows)
+            rows = list(compress(rows, map(domain.__eq__, domains)))
+        return list(rows)
+
+    def select(
+        self,
+        has_birthday: bool = False,
+        birth_month: int | None = None,
+        email_domain: str | None = None,
+        phone_code: str | None = None,
+        block: int = BLOCK_ROWS,
+    ):
+        """Номери рядків, що відповідають усім заданим умовам, у порядку додавання.
+
+        Колонки перевіряються блоками по `block` рядків, тож можна зупинитися
+        після перших збігів, не переглядаючи всієї книги. `email_domain` —
+        частина email після @ без урахування регістру, `phone_code` —
+        початкові цифри номера (наприклад, код оператора "050").
+        """
+        if phone_code is not None and not (
+            phone_code.isascii()
+            and phone_code.isdigit()
+            and len(phone_code) <= PHONE_DIGITS
+        ):
+            raise ValueError("Phone code must contain 1 to 10 digits.")
+        domain = None if email_domain is None else email_domain.casefold()
+        for start in range(0, len(self), block):
+            end = min(start + block, len(self))
+            yield from self._select_block(
+                start, end, has_birthday, birth_month, domain, phone_code
+            )
+
+
+def dump_columnar(book: AddressBook, f) -> None:
+    """Записує контакти книги у відкритий двійковий файл (як pickle.dump)."""
+    ContactColumns.from_records(book.data.values()).write(f)
+
+
+def load_columnar(f) -> AddressBook:
+    """Читає книгу контактів з відкритого двійкового файлу (як pickle.load)."""
+    return ContactColumns.read(f).to_book()
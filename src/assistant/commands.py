@@ -0,0 +1,123 @@
+"""Реєстр команд бота: з нього будуються і диспетчеризація, і автодоповнення.
+
+Кожна команда описує свій обробник, які дані він отримує ("args" — аргументи
+команди, "book", "notes", "stats") та що доповнювати в кожній позиції
+аргументів (див. autocomplete.CommandCompleter).
+"""
+
+from . import handlers
+from .models import AddressBook
+from .notes import NotesBook
+
+
+class Context(dict):
+    """Дані для обробників: "book", "notes", "stats".
+
+    Значення, яких ще немає, створюються при першому зверненні функціями з
+    `loaders` — так нотатки завантажуються лише з першою командою нотаток.
+    """
+
+    def __init__(self, loaders: dict | None = None, **values):
+        super().__init__(**values)
+        self.loaders = dict(loaders or {})
+
+    def __missing__(self, key: str):
+        if key not in self.loaders:
+            raise KeyError(key)
+        value = self[key] = self.loaders.pop(key)()
+        return value
+
+
+class Command:
+    """Опис однієї команди."""
+
+    __slots__ = ("name", "handler", "uses", "arguments", "exits")
+
+    def __init__(
+        self,
+        name: str,
+        handler=None,
+        uses: tuple[str, ...] = ("args", "book"),
+        arguments: tuple = (),
+        exits: bool = False,
+    ):
+        self.name = name
+        self.handler = handler
+        self.uses = uses
+        self.arguments = arguments
+        self.exits = exits
+
+    def __call__(self, args: list[str], context: dict) -> str:
+        """Викликає обробник з потрібними йому даними з `context`."""
+        return self.handler(
+            *(args if use == "args" else context[use] for use in self.uses)
+        )
+
+
+NOTES = ("args", "notes")
+BOTH = ("args", "book", "notes")
+
+COMMANDS = (
+    Command("hello", handlers.hello, uses=()),
+    Command("add-contact", handlers.add_contact, arguments=("name",)),
+    Command("remove-contact", handlers.remove_contact, arguments=("name",)),
+    Command("change-contact", handlers.change_contact, arguments=("name", "phone")),
+    Command("remove-phone", handlers.remove_phone, arguments=("name", "phone")),
+    Command("show-phone", handlers.show_phone, arguments=("name",)),
+    Command("find-contact", handlers.find_contact, arguments=("name",)),
+    Command(
+        "show-all-contacts",
+        handlers.show_all,
+        arguments=(None, AddressBook.PAGE_ORDERS),
+    ),
+    Command("find-duplicates", handlers.find_duplicates),
+    Command("merge-contacts", handlers.merge_contacts, arguments=("name", "name")),
+    Command("add-birthday", handlers.add_birthday, arguments=("name",)),
+    Command("show-birthday", handlers.show_birthday, arguments=("name",)),
+    Command("birthdays-in", handlers.birthdays),
+    Command("add-email", handlers.add_email, arguments=("name",)),
+    Command("change-email", handlers.edit_email, arguments=("name",)),
+    Command("add-address", handlers.add_address, arguments=("name",)),
+    Command("change-address", handlers.edit_address, arguments=("name",)),
+    # --- Нотатки ---
+    Command("add-note", handlers.add_note, uses=NOTES),
+    Command(
+        "show-notes",
+        handlers.show_notes,
+        uses=NOTES,
+        arguments=(None, NotesBook.PAGE_ORDERS),
+    ),
+    Command("find-note", handlers.find_note, uses=NOTES),
+    Command("edit-note", handlers.edit_note, uses=NOTES, arguments=("note",)),
+    Command("delete-note", handlers.delete_note, uses=NOTES, arguments=("note",)),
+    # --- Теги ---
+    Command("add-tag", handlers.add_note_tag, uses=NOTES, arguments=("note", "tag")),
+    Command(
+        "remove-tag",
+        handlers.remove_note_tag,
+        uses=NOTES,
+        arguments=("note", "note-tag"),
+    ),
+    Command("find-tag", handlers.find_note_tag, uses=NOTES, arguments=("tag",)),
+    Command("sort-tags", handlers.sort_tags, uses=("notes",)),
+    # --- Імпорт / експорт ---
+    Command(
+        "import",
+        handlers.import_data,
+        uses=BOTH,
+        arguments=(None, ("contacts", "notes")),
+    ),
+    Command(
+        "export",
+        handlers.export_data,
+        uses=BOTH,
+        arguments=(None, ("contacts", "notes")),
+    ),
+    # --- Службові ---
+    Command("stats", handlers.show_stats, uses=("stats",)),
+    Command("close", exits=True),
+    Command("exit", exits=True),
+)
+
+# Назва -> команда: пошук обробника за O(1)
+REGISTRY: dict[str, Command] = {command.name: command for command in COMMANDS}
@@ -0,0 +1,183 @@
+"""Пошук контактів-дублікатів без порівняння кожного з кожним.
+
+Попарне порівняння n контактів — O(n²), тому кандидати в дублікати
+збираються блокуванням:
+
+- однаковий телефон або email (без урахування регістру) — записи з
+  однаковим значенням потрапляють в один кошик словника;
+- схожі імена — імена нормалізуються (регістр, пробіли й розділові знаки
+  не враховуються) і сортуються двічі: за самим іменем і за ім'ям задом
+  наперед; порівнюються лише сусіди в межах вікна `NAME_WINDOW`. Одна
+  помилка в імені лишає його поруч з оригіналом хоча б в одному з двох
+  порядків (помилка або ближче до кінця, або ближче до початку).
+
+Кошики, більші за `MAX_BUCKET` (спільний телефон офісу тощо), не свідчать
+про дублікати і пропускаються. Так загальна вартість — O(n log n).
+Кожна пара-кандидат оцінюється за всіма полями: збіги підвищують
+впевненість, різні дні народження чи email — знижують.
+"""
+
+from itertools import combinations
+
+# Впевненість, яку дає кожен збіг; збіги об'єднуються як незалежні ознаки
+EVIDENCE = {
+    "same email": 0.9,
+    "same phone": 0.8,
+    "same name": 0.7,
+    "similar name": 0.5,
+    "same birthday": 0.3,
+}
+# Множники за суперечності: обидва значення задані, але різні
+CONFLICTS = {"birthday": 0.5, "email": 0.7}
+MIN_SCORE = 0.5
+MAX_BUCKET = 50
+NAME_WINDOW = 4
+# Коротші імена надто часто відрізняються на одну літеру випадково
+MIN_FUZZY_NAME = 4
+
+
+class Duplicate:
+    """Пара контактів, схожих на один і той самий, з оцінкою впевненості."""
+
+    __slots__ = ("first", "second", "score", "reasons")
+
+    def __init__(self, first: str, second: str, score: float, reasons: list[str]):
+        self.first = first
+        self.second = second
+        self.score = score
+        self.reasons = reasons
+
+    def __str__(self) -> str:
+        return (
+            f"[{self.score:.0%}] {self.first} <-> {self.second}: "
+            f"{', '.join(self.reasons)}"
+        )
+
+
+def name_key(name: str) -> tuple[str, str]:
+    """Ім'я без регістру й розділових знаків: (цифри, літери).
+
+    Цифри порівнюються точно (Olena2 і Olena3 — різні люди), літери — з
+    допуском на одну помилку.
+    """
+    folded = name.casefold()
+    return (
+        "".join(ch for ch in folded if ch.isdigit()),
+        "".join(ch for ch in folded if ch.isalpha()),
+    )
+
+
+def one_edit_apart(a: str, b: str) -> bool:
+    """True, якщо різні рядки відрізняються однією заміною, вставкою,
+    видаленням або перестановкою сусідніх символів."""
+    if a == b or abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diff = [i for i, (x, y) in enumerate(zip(a, b)) if x != y]
+        if len(diff) == 1:
+            return True
+        i = diff[0]
+        return diff == [i, i + 1] and a[i] == b[i + 1] and a[i + 1] == b[i]
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1 :]
+
+
+def _bucket_pairs(buckets: dict, pairs: set) -> None:
+    for rows in buckets.values():
+        if isinstance(rows, list) and len(rows) <= MAX_BUCKET:
+            pairs.update(combinations(rows, 2))
+
+
+def _add(buckets: dict, value: str, row: int) -> None:
+    # один рядок зберігається як число, кілька — списком (як індекси AddressBook)
+    rows = buckets.get(value)
+    if rows is None:
+        buckets[value] = row
+    elif isinstance(rows, list):
+        if rows[-1] != row:
+            rows.append(row)
+    elif rows != row:
+        buckets[value] = [rows, row]
+
+
+def _name_pairs(keys: list[tuple[str, str]], pairs: set) -> None:
+    for reverse in (False, True):
+        order = sorted(
+            range(len(keys)),
+            key=lambda row: (
+                keys[row][0],
+                keys[row][1][::-1] if reverse else keys[row][1],
+            ),
+        )
+        for pos, row in enumerate(order):
+            digits, letters = keys[row]
+            for other in order[pos + 1 : pos + 1 + NAME_WINDOW]:
+                other_digits, other_letters = keys[other]
+                if other_digits != digits:
+                    break
+                if letters == other_letters or (
+                    min(len(letters), len(other_letters)) >= MIN_FUZZY_NAME
+                    and one_edit_apart(letters, other_letters)
+                ):
+                    pairs.add((row, other) if row < other else (other, row))
+
+
+def score(a, b, key_a: tuple[str, str], key_b: tuple[str, str]) -> tuple[float, list]:
+    """Впевненість, що записи `a` і `b` — один контакт, і її причини."""
+    reasons = []
+    if a._email is not None and b._email is not None:
+        if a._email.casefold() == b._email.casefold():
+            reasons.append("same email")
+    if set(a._phones) & set(b._phones):
+        reasons.append("same phone")
+    if key_a == key_b:
+        reasons.append("same name")
+    elif key_a[0] == key_b[0] and one_edit_apart(key_a[1], key_b[1]):
+        reasons.append("similar name")
+    if a._birthday is not None and a._birthday == b._birthday:
+        reasons.append("same birthday")
+    doubt = 1.0
+    for reason in reasons:
+        doubt *= 1 - EVIDENCE[reason]
+    confidence = 1 - doubt
+    if None not in (a._birthday, b._birthday) and a._birthday != b._birthday:
+        confidence *= CONFLICTS["birthday"]
+        reasons.append("different birthdays")
+    if "same email" not in reasons and None not in (a._email, b._email):
+        confidence *= CONFLICTS["email"]
+        reasons.append("different emails")
+    return confidence, reasons
+
+
+def find_duplicates(records, min_score: float = MIN_SCORE) -> list[Duplicate]:
+    """Пари ймовірних дублікатів серед `records`, найвпевненіші першими.
+
+    У парі першим іде запис, доданий раніше.
+    """
+    records = list(records)
+    keys = [name_key(record._name) for record in records]
+    phones: dict = {}
+    emails: dict = {}
+    for row, record in enumerate(records):
+        for phone in record._phones:
+            _add(phones, phone, row)
+        if record._email is not None:
+            _add(emails, record._email.casefold(), row)
+    pairs: set[tuple[int, int]] = set()
+    _bucket_pairs(phones, pairs)
+    _bucket_pairs(emails, pairs)
+    del phones, emails
+    _name_pairs(keys, pairs)
+    found = []
+    for i, j in sorted(pairs):
+        confidence, reasons = score(records[i], records[j], keys[i], keys[j])
+        if confidence >= min_score:
+            found.append(
+                Duplicate(records[i]._name, records[j]._name, confidence, reasons)
+            )
+    found.sort(key=lambda duplicate: -duplicate.score)
+    return found
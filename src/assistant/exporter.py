@@ -0,0 +1,148 @@
+"""Потоковий експорт контактів і нотаток у CSV, JSONL та vCard.
+
+Експорт побудовано як конвеєр генераторів: записи книги -> фільтр ->
+рядки-словники -> кодування у формат -> запис у файл. Жоден етап не
+збирає весь результат у пам'яті: у кожен момент існує лише поточний
+запис і буфер файлу (`BUFFER_SIZE`), тож експорт мільйона записів не
+потребує пам'яті, пропорційної розміру книги. Дані пишуться в тимчасовий
+файл, який після завершення атомарно замінює цільовий.
+
+Формати збігаються з тими, які читає importer.py, тож експортований файл
+можна імпортувати назад.
+"""
+
+import csv
+import json
+import os
+
+from .importer import detect_format
+from .models import AddressBook
+from .notes import NotesBook
+
+BUFFER_SIZE = 1 << 16
+CONTACT_FIELDS = ["name", "phones", "birthday", "email", "address"]
+NOTE_FIELDS = ["id", "text", "tags"]
+LIST_SEPARATOR = ";"
+
+
+def contact_rows(records, with_birthday: bool = False, email_domain: str | None = None):
+    """Словники контактів для експорту; з `with_birthday` — лише з датою
+    народження, з `email_domain` — лише з email у цьому домені."""
+    suffix = None if email_domain is None else "@" + email_domain.casefold()
+    for record in records:
+        if with_birthday and record._birthday is None:
+            continue
+        if suffix is not None and not (
+            record._email and record._email.casefold().endswith(suffix)
+        ):
+            continue
+        birthday = record.birthday
+        email, address = record.email, record.address
+        yield {
+            "name": record.name.value,
+            "phones": [phone.value for phone in record.phones],
+            "birthday": birthday.date_str if birthday else "",
+            "email": email.value if email else "",
+            "address": address.value if address else "",
+        }
+
+
+def note_rows(items):
+    """Словники нотаток для експорту з пар (ID, нотатка)."""
+    for note_id, note in items:
+        yield {"id": note_id, "text": note.text, "tags": list(note.tags)}
+
+
+def csv_rows(rows, fields: list[str]):
+    """Рядки для csv.writer; списки (телефони, теги) з'єднуються через ';'."""
+    yield fields
+    for row in rows:
+        yield [
+            LIST_SEPARATOR.join(value) if isinstance(value, list) else value
+            for value in (row[field] for field in fields)
+        ]
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def vcard_escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace(",", "\\,")
+        .replace(";", "\\;")
+    )
+
+
+def vcard_lines(rows):
+    for row in rows:
+        yield "BEGIN:VCARD\r\nVERSION:3.0\r\n"
+        yield f"FN:{vcard_escape(row['name'])}\r\n"
+        for phone in row["phones"]:
+            yield f"TEL;TYPE=cell:{phone}\r\n"
+        if row["email"]:
+            yield f"EMAIL:{vcard_escape(row['email'])}\r\n"
+        if row["birthday"]:
+            day, month, year = row["birthday"].split(".")
+            yield f"BDAY:{year}-{month}-{day}\r\n"
+        if row["address"]:
+            yield f"ADR;TYPE=home:;;{vcard_escape(row['address'])};;;;\r\n"
+        yield "END:VCARD\r\n"
+
+
+class _Counter:
+    """Пропускає елементи далі по конвеєру, рахуючи їх."""
+
+    def __init__(self, items):
+        self.items = items
+        self.count = 0
+
+    def __iter__(self):
+        for item in self.items:
+            self.count += 1
+            yield item
+
+
+def _write(path: str, fmt: str, rows, fields: list[str]) -> None:
+    tmp_path = f"{path}.tmp"
+    newline = "" if fmt == "csv" else None
+    with open(
+        tmp_path, "w", encoding="utf-8", newline=newline, buffering=BUFFER_SIZE
+    ) as f:
+        if fmt == "csv":
+            csv.writer(f).writerows(csv_rows(rows, fields))
+        elif fmt == "jsonl":
+            f.writelines(jsonl_lines(rows))
+        else:
+            f.writelines(vcard_lines(rows))
+    os.replace(tmp_path, path)
+
+
+def export_contacts(
+    book: AddressBook,
+    path: str,
+    with_birthday: bool = False,
+    email_domain: str | None = None,
+) -> int:
+    """Експортує контакти у файл (формат за розширенням); повертає їх кількість.
+
+    Фільтри (`with_birthday`, `email_domain`) перевіряються під час того ж
+    проходу по записах, тож і з ними експорт не тримає книгу в пам'яті.
+    """
+    fmt = detect_format(path)
+    rows = _Counter(contact_rows(book.data.values(), with_birthday, email_domain))
+    _write(path, fmt, rows, CONTACT_FIELDS)
+    return rows.count
+
+
+def export_notes(notes: NotesBook, path: str, tag: str | None = None) -> int:
+    """Експортує нотатки (за потреби лише з тегом `tag`); повертає їх кількість."""
+    fmt = detect_format(path)
+    if fmt == "vcard":
+        raise ValueError("vCard export is available for contacts only.")
+    rows = _Counter(note_rows(notes.iter_notes(tag)))
+    _write(path, fmt, rows, NOTE_FIELDS)
+    return rows.count
@@ -1,8 +1,12 @@
 from functools import wraps
-from assistant.models import AddressBook, Record
+import os
+from assistant.models import FUZZY_LIMIT, PAGE_SIZE, AddressBook, Record
 from assistant.notes import NotesBook
+from assistant.query import USAGE, looks_like_query, plan_query
+from assistant.stats import Stats, last_outcome
 
 DEFAULT_BIRTHDAY_DAYS = 7
+DEFAULT_DUPLICATES_LIMIT = 20
 
 
 def input_error(func):
@@ -13,15 +17,22 @@ def input_error(func):
         try:
             return func(*args, **kwargs)
         except KeyError:
+            last_outcome.set("KeyError")
             return "Contact not found."
         except ValueError as e:
+            last_outcome.set("ValueError")
             return str(e)
         except IndexError:
+            last_outcome.set("IndexError")
             return "Enter the command followed by necessary arguments."
 
     return inner
 
 
+def hello() -> str:
+    return "How can I help you?"
+
+
 def parse_input(user_input: str) -> tuple[str, list[str]]:
     """Парсить вхідний рядок на команду та аргументи."""
     parts = user_input.strip().split()
@@ -70,25 +81,26 @@ def change_contact(args: list[str], book: AddressBook) -> str:
 
 @input_error
 def find_contact(args: list[str], book: AddressBook) -> str:
-    """Шукає контакт за ім'ям, email або телефоном і повертає всі знайдені контакти."""
+    """Шукає контакт за ім'ям, email або телефоном і повертає всі знайдені контакти.
+
+    З `--fuzzy` (або `--fuzzy=K`) повертає K найсхожіших контактів зі ступенем схожості.
+    Запит з умовами (див. query.py) виконується за планом, а з `--explain`
+    замість результатів показується сам план.
+    """
 
+    if args and args[0].startswith("--fuzzy"):
+        return _find_similar(args, book)
+
+    explain = bool(args) and args[0] == "--explain"
+    if explain:
+        args = args[1:]
     if not args:
         raise IndexError
 
-    query = " ".join(args).strip().lower()
-    matches: list[Record] = []
-
-    for record in book.data.values():
-        if record.name.value.lower() == query:
-            matches.append(record)
-            continue
-        if record.email and record.email.value.lower() == query:
-            matches.append(record)
-            continue
-        for phone in record.phones:
-            if phone.phone_number.lower() == query:
-                matches.append(record)
-                break
+    query = " ".join(args).strip()
+    if explain or looks_like_query(query):
+        return _find_by_query(query, book, explain)
+    matches = book.lookup(query)
 
     if not matches:
         return "No contacts found."
@@ -96,6 +108,36 @@ def find_contact(args: list[str], book: AddressBook) -> str:
     return "\n".join(str(rec) for rec in matches)
 
 
+def _find_by_query(query: str, book: AddressBook, explain: bool) -> str:
+    if not looks_like_query(query):
+        raise ValueError(f"Only queries with conditions can be explained. {USAGE}")
+    plan = plan_query(book, query)
+    if explain:
+        return plan.explain()
+    matches, more = plan.run()
+    if not matches:
+        return "No contacts found."
+    lines = [str(rec) for rec in matches]
+    if more:
+        lines.append(
+            f"Showing the first {plan.limit} matches; add 'limit N' to see more."
+        )
+    return "\n".join(lines)
+
+
+def _find_similar(args: list[str], book: AddressBook) -> str:
+    option, _, limit = args[0].partition("=")
+    if option != "--fuzzy" or (limit and (not limit.isdigit() or int(limit) < 1)):
+        raise ValueError("Use --fuzzy or --fuzzy=K, where K is the number of results.")
+    query = " ".join(args[1:]).strip()
+    if not query:
+        raise IndexError
+    matches = book.find_similar(query, int(limit) if limit else FUZZY_LIMIT)
+    if not matches:
+        return "No contacts found."
+    return "\n".join(f"[{score:.0%}] {rec}" for rec, score in matches)
+
+
 @input_error
 def show_phone(args: list[str], book: AddressBook) -> str:
     """Показує телефонні номери для вказаного контакту."""
@@ -129,11 +171,80 @@ def remove_phone(args: list[str], book: AddressBook) -> str:
     return f"Phone {phone} has been removed."
 
 
-def show_all(book: AddressBook) -> str:
-    """Показує всі контакти в адресній книзі."""
+def _page_args(args: list[str], orders: tuple[str, ...]) -> tuple[int, str, str | None]:
+    """Розбирає аргументи сторінки: [розмір] [порядок] [курсор]."""
+    limit = PAGE_SIZE
+    if args:
+        if not args[0].isdigit() or int(args[0]) < 1:
+            raise ValueError("Page size must be a positive number.")
+        limit = int(args[0])
+    order = args[1].lower() if len(args) > 1 else orders[0]
+    cursor = args[2] if len(args) > 2 else None
+    return limit, order, cursor
+
+
+def _with_next_page(lines: list[str], command: str, limit, order, cursor) -> str:
+    """Додає до сторінки підказку з командою для наступної сторінки."""
+    if cursor is not None:
+        lines.append(f"Next page: {command} {limit} {order} {cursor}")
+    return "\n".join(lines)
+
+
+@input_error
+def show_all(args: list[str], book: AddressBook) -> str:
+    """show-all-contacts [розмір] [added|name] [курсор] — сторінка контактів."""
     if not book.data:
         return "No contacts."
-    return "\n".join(str(rec) for rec in book.data.values())
+    limit, order, cursor = _page_args(args, book.PAGE_ORDERS)
+    records, next_cursor = book.page(order, cursor, limit)
+    if not records:
+        return "No more contacts."
+    lines = [str(rec) for rec in records]
+    return _with_next_page(lines, "show-all-contacts", limit, order, next_cursor)
+
+
+@input_error
+def find_duplicates(args: list[str], book: AddressBook) -> str:
+    """Показує до N пар ймовірних дублікатів з оцінкою впевненості."""
+    if args and (not args[0].isdigit() or int(args[0]) < 1):
+        raise ValueError("Use find-duplicates [N], where N is the number of pairs.")
+    limit = int(args[0]) if args else DEFAULT_DUPLICATES_LIMIT
+    from assistant.duplicates import find_duplicates as find
+
+    found = find(book.data.values())
+    if not found:
+        return "No duplicates found."
+    lines = [str(duplicate) for duplicate in found[:limit]]
+    if len(found) > limit:
+        lines.append(f"... {len(found) - limit} more: find-duplicates {len(found)}")
+    return "\n".join(lines)
+
+
+@input_error
+def merge_contacts(args: list[str], book: AddressBook) -> str:
+    """Переносить дані другого контакту в перший і видаляє другий."""
+    if len(args) < 2:
+        raise IndexError
+    name, other_name = args[:2]
+    if name == other_name:
+        raise ValueError("Choose two different contacts to merge.")
+    record, other = book.find(name), book.find(other_name)
+    if record is None or other is None:
+        raise KeyError
+    conflicts = record.conflicts(other)
+    if conflicts:
+        # значення другого контакту загубились би разом з ним
+        lines = ["Can't merge: the contacts have different values."]
+        lines += [
+            f"  {field}: '{mine}' in {name}, '{theirs}' in {other_name}"
+            for field, mine, theirs in conflicts
+        ]
+        lines.append("Make the values match or remove one of them, then merge again.")
+        raise ValueError("\n".join(lines))
+    taken = record.merge(other)
+    book.delete(other_name)
+    added = f" (added {', '.join(taken)})" if taken else ""
+    return f"Contact '{other_name}' merged into '{name}'{added}."
 
 
 @input_error
@@ -255,6 +366,18 @@ def add_note(args: list[str], notes: NotesBook) -> str:
     return notes.add_note(text)
 
 
+@input_error
+def show_notes(args: list[str], notes: NotesBook) -> str:
+    """show-notes [розмір] [added|id] [курсор] — сторінка нотаток."""
+    if not notes.data:
+        return "No notes found."
+    limit, order, cursor = _page_args(args, notes.PAGE_ORDERS)
+    lines, next_cursor = notes.page(order, cursor, limit)
+    if not lines:
+        return "No more notes."
+    return _with_next_page(lines, "show-notes", limit, order, next_cursor)
+
+
 @input_error
 def find_note(args: list[str], notes: NotesBook) -> str:
     """Пошук нотаток за тегом або словом."""
@@ -316,3 +439,52 @@ def find_note_tag(args, notes: NotesBook):
 
 def sort_tags(notes: NotesBook):
     return notes.sort_by_tags()
+
+
+@input_error
+def import_data(args: list[str], book: AddressBook, notes: NotesBook) -> str:
+    """import <file> [contacts|notes] — масовий імпорт з CSV, JSONL або vCard."""
+    if not args:
+        raise IndexError
+    path = args[0]
+    kind = args[1].lower() if len(args) > 1 else "contacts"
+    if not os.path.isfile(path):
+        raise ValueError(f"File not found: {path}")
+    # імпорт тягне за собою пул процесів — завантажуємо лише коли потрібен
+    from assistant.importer import import_file
+
+    return str(import_file(path, book, notes, kind))
+
+
+@input_error
+def export_data(args: list[str], book: AddressBook, notes: NotesBook) -> str:
+    """export <file> [contacts|notes] [birthday|@domain|#tag] — потоковий експорт у файл."""
+    if not args:
+        raise IndexError
+    path = args[0]
+    kind = args[1].lower() if len(args) > 1 else "contacts"
+    condition = args[2] if len(args) > 2 else None
+    from assistant.exporter import export_contacts, export_notes
+
+    try:
+        if kind == "contacts":
+            if condition is None or condition == "birthday":
+                count = export_contacts(book, path, with_birthday=bool(condition))
+            elif condition.startswith("@") and len(condition) > 1:
+                count = export_contacts(book, path, email_domain=condition[1:])
+            else:
+                raise ValueError(
+                    "Contacts can only be filtered by 'birthday' or '@domain'."
+                )
+            return f"Exported {count} contacts to {path}."
+        if kind == "notes":
+            count = export_notes(notes, path, tag=condition)
+            return f"Exported {count} notes to {path}."
+    except OSError as e:
+        raise ValueError(f"Cannot write {path}: {e.strerror}")
+    raise ValueError("Export kind must be 'contacts' or 'notes'.")
+
+
+def show_stats(stats: Stats) -> str:
+    """Показує кількість викликів, результати та перцентилі затримок команд."""
+    return stats.report()
@@ -0,0 +1,359 @@
+"""Потоковий масовий імпорт контактів і нотаток з CSV, JSONL та vCard.
+
+Файл читається порціями (`chunk_size` рядків), кожна порція перевіряється
+в пулі процесів за тими самими правилами, що й при ручному введенні
+(Phone, Email, Birthday, Address), а коректні рядки додаються до книги в
+основному процесі одним пакетом змін на порцію (див. models.Batch). Одночасно в обробці перебуває не більше кількох порцій,
+тож пам'ять не залежить від розміру файлу. Відхилені рядки одразу
+записуються у CSV-звіт разом з причиною.
+
+Формати (визначаються за розширенням файлу):
+- CSV — заголовок з колонками name, phones, birthday, email, address
+  (для нотаток: text, tags); кілька телефонів чи тегів розділяються ';'
+  або пробілами;
+- JSONL — один JSON-об'єкт з тими самими ключами на рядок
+  (phones і tags можуть бути списками);
+- vCard (.vcf) — лише контакти: FN/N, TEL, EMAIL, BDAY, ADR.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+import csv
+import json
+import os
+import re
+import time
+
+from .models import (
+    Address,
+    AddressBook,
+    Birthday,
+    ContactBatch,
+    Email,
+    Name,
+    Phone,
+    Record,
+)
+from .notes import NoteBatch, NotesBook
+
+CHUNK_SIZE = 2_000
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".vcf": "vcard"}
+LIST_SEPARATORS = re.compile(r"[;,\s]+")
+# Символи, якими зазвичай форматують номери у vCard: "(050) 123-45-67"
+PHONE_FORMATTING = re.compile(r"[\s\-().]")
+VCARD_ESCAPED = re.compile(r"\\(.)")
+VCARD_COMPONENT = re.compile(r"(?<!\\);")
+
+
+class ImportResult:
+    """Підсумок імпорту: скільки рядків прочитано, додано й відхилено."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.imported = 0
+        self.rejected = 0
+        self.seconds = 0.0
+        self.report_path: str | None = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        message = (
+            f"Imported {self.imported} of {self.rows} rows "
+            f"in {self.seconds:.2f} s ({self.rows_per_second:.0f} rows/s)."
+        )
+        if self.rejected:
+            message += f" Rejected {self.rejected}, see {self.report_path}."
+        return message
+
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(
+            f"Unsupported file format: {ext or path}. Use CSV, JSONL or vCard."
+        )
+    return FORMATS[ext]
+
+
+def _split_list(value) -> list[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [item for item in LIST_SEPARATORS.split(value) if item]
+    return [str(item) for item in value]
+
+
+def read_csv(path: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        # рядок 1 — заголовок
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            yield line_no, row
+
+
+def read_jsonl(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                row = {"_error": f"Invalid JSON: {e.msg}"}
+            if not isinstance(row, dict):
+                row = {"_error": "Expected a JSON object."}
+            yield line_no, row
+
+
+def _vcard_value(line: str) -> tuple[str, str]:
+    prop, _, value = line.partition(":")
+    # "TEL;TYPE=cell" -> "TEL"; групові префікси "item1.EMAIL" -> "EMAIL"
+    return prop.split(";", 1)[0].rsplit(".", 1)[-1].upper(), value.strip()
+
+
+def _vcard_unescape(value: str) -> str:
+    return VCARD_ESCAPED.sub(lambda m: "\n" if m[1] in "nN" else m[1], value)
+
+
+def _vcard_components(value: str) -> list[str]:
+    """Складові структурованого значення (N, ADR), розділені неекранованою ';'."""
+    return [_vcard_unescape(part) for part in VCARD_COMPONENT.split(value)]
+
+
+def _vcard_birthday(value: str) -> str:
+    """BDAY у vCard має вигляд 1990-12-31 або 19901231; приводимо до DD.MM.YYYY."""
+    digits = value.replace("-", "")
+    if len(digits) == 8 and digits.isdigit():
+        return f"{digits[6:8]}.{digits[4:6]}.{digits[0:4]}"
+    return value
+
+
+def _unfold(lines):
+    """Склеює перенесені рядки vCard (продовження починається з пробілу)."""
+    pending, pending_no = None, 0
+    for line_no, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending_no, pending
+        pending, pending_no = line, line_no
+    if pending is not None:
+        yield pending_no, pending
+
+
+def read_vcard(path: str):
+    row: dict | None = None
+    start = 0
+    with open(path, encoding="utf-8") as f:
+        lines = _unfold(f)
+        for line_no, line in lines:
+            prop, value = _vcard_value(line)
+            if prop == "BEGIN":
+                row, start = {"phones": []}, line_no
+            elif row is None:
+                continue
+            elif prop == "END":
+                yield start, row
+                row = None
+            elif prop == "FN":
+                row["name"] = _vcard_unescape(value)
+            elif prop == "N" and "name" not in row:
+                parts = [p for p in _vcard_components(value)[1::-1] if p]
+                row["name"] = " ".join(parts)
+            elif prop == "TEL":
+                row["phones"].append(PHONE_FORMATTING.sub("", value))
+            elif prop == "EMAIL" and "email" not in row:
+                row["email"] = _vcard_unescape(value)
+            elif prop == "BDAY":
+                row["birthday"] = _vcard_birthday(value)
+            elif prop == "ADR" and "address" not in row:
+                row["address"] = ", ".join(p for p in _vcard_components(value) if p)
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl, "vcard": read_vcard}
+
+
+def _text(row: dict, key: str) -> str:
+    value = row.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def validate_contact(row: dict) -> dict:
+    """Перевіряє рядок контакту; повертає очищені значення або кидає ValueError."""
+    if "_error" in row:
+        raise ValueError(row["_error"])
+    name = Name(_text(row, "name")).value
+    phones = _split_list(row.get("phones") or row.get("phone"))
+    clean = {"name": name, "phones": [Phone(p).value for p in phones]}
+    if birthday := _text(row, "birthday"):
+        clean["birthday"] = Birthday(birthday).value
+    if email := _text(row, "email"):
+        clean["email"] = Email(email).value
+    if address := _text(row, "address"):
+        clean["address"] = Address(address).value
+    return clean
+
+
+def validate_note(row: dict) -> dict:
+    """Перевіряє рядок нотатки; повертає очищені значення або кидає ValueError."""
+    if "_error" in row:
+        raise ValueError(row["_error"])
+    text = _text(row, "text")
+    if not text:
+        raise ValueError("Note text is empty.")
+    return {"text": text, "tags": _split_list(row.get("tags"))}
+
+
+VALIDATORS = {"contacts": validate_contact, "notes": validate_note}
+
+
+def validate_chunk(kind: str, rows: list[tuple[int, dict]]) -> list[tuple]:
+    """Перевіряє порцію рядків (виконується у процесі пулу).
+
+    Повертає кортежі (номер рядка, очищені значення, помилка, вихідний рядок);
+    для коректних рядків помилка і вихідний рядок — None.
+    """
+    validate = VALIDATORS[kind]
+    results: list[tuple] = []
+    for line_no, row in rows:
+        try:
+            results.append((line_no, validate(row), None, None))
+        except ValueError as e:
+            results.append((line_no, None, str(e), row))
+    return results
+
+
+def merge_contact(book: AddressBook | ContactBatch, clean: dict) -> None:
+    """Додає контакт до книги (або пакета змін) чи доповнює наявний новими даними."""
+    record = book.find(clean["name"])
+    if record is None:
+        # значення вже перевірені у validate_contact — повторна валідація зайва
+        book.add_record(
+            Record.from_values(
+                clean["name"],
+                dict.fromkeys(clean["phones"]),
+                clean.get("birthday"),
+                clean.get("email"),
+                clean.get("address"),
+            )
+        )
+        return
+    # ті самі значення ігноруються, інші — помилка, як і при ручному введенні;
+    # усі поля перевіряються до змін, щоб відхилений рядок не змінив контакт
+    current = {
+        "birthday": record.birthday and record.birthday.value,
+        "email": record._email,
+        "address": record._address,
+    }
+    for field, value in current.items():
+        if field in clean and value is not None and value != clean[field]:
+            raise ValueError(f"Contact already has a different {field}.")
+    for phone in clean["phones"]:
+        if not record.find_phone(phone):
+            record.add_phone(phone)
+    if "birthday" in clean and current["birthday"] is None:
+        record.add_birthday(clean["birthday"].strftime("%d.%m.%Y"))
+    if "email" in clean and current["email"] is None:
+        record.add_email(clean["email"])
+    if "address" in clean and current["address"] is None:
+        record.add_address(clean["address"])
+
+
+def _report_value(value):
+    """Значення рядка звіту, яких немає в JSON (дати), у форматі введення."""
+    if isinstance(value, date):
+        return value.strftime("%d.%m.%Y")
+    raise TypeError(f"Can't write {type(value).__name__} to the report.")
+
+
+def merge_note(notes: NotesBook | NoteBatch, clean: dict) -> None:
+    notes.add_note(clean["text"], clean["tags"])
+
+
+def _chunks(rows, size: int):
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _validated(kind: str, chunks, workers: int):
+    """Перевірені порції в порядку файлу; у роботі не більше 2 * workers порцій."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield validate_chunk(kind, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(validate_chunk, kind, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def import_file(
+    path: str,
+    book: AddressBook | None = None,
+    notes: NotesBook | None = None,
+    kind: str = "contacts",
+    report_path: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> ImportResult:
+    """Імпортує контакти (у book) або нотатки (у notes) з файлу.
+
+    Відхилені рядки записуються у CSV-звіт `report_path`
+    (за замовчуванням `<файл>.errors.csv`), який створюється лише за наявності помилок.
+    """
+    if kind not in VALIDATORS:
+        raise ValueError("Import kind must be 'contacts' or 'notes'.")
+    fmt = detect_format(path)
+    if fmt == "vcard" and kind == "notes":
+        raise ValueError("vCard files contain contacts only.")
+    target = book if kind == "contacts" else notes
+    if target is None:
+        raise ValueError(f"No book to import {kind} into.")
+    merge = merge_contact if kind == "contacts" else merge_note
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    result = ImportResult()
+    result.report_path = report_path or f"{path}.errors.csv"
+    report = None
+    start = time.perf_counter()
+    try:
+        chunks = _chunks(READERS[fmt](path), chunk_size)
+        for validated in _validated(kind, chunks, workers):
+            # порція потрапляє в книгу одним пакетом: індекси, журнал і база
+            # оновлюються раз на порцію, а не на кожен рядок
+            with target.batch() as batch:
+                for line_no, clean, error, row in validated:
+                    result.rows += 1
+                    if error is None:
+                        try:
+                            merge(batch, clean)
+                            result.imported += 1
+                            continue
+                        except ValueError as e:
+                            error, row = str(e), clean
+                    if report is None:
+                        report = open(
+                            result.report_path, "w", newline="", encoding="utf-8"
+                        )
+                        writer = csv.writer(report)
+                        writer.writerow(["line", "error", "row"])
+                    # після конфлікту злиття рядок — уже перевірені значення
+                    # з датою, тож дати пишуться так само, як у файлі імпорту
+                    row = json.dumps(row, ensure_ascii=False, default=_report_value)
+                    writer.writerow([line_no, error, row])
+                    result.rejected += 1
+    finally:
+        if report is not None:
+            report.close()
+    result.seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,279 @@
+"""Журнал змін (write-ahead log) зі знімками та фоновим ущільненням.
+
+Замість повного pickle-запису книги при виході кожна зміна книги
+(див. models.Observable) дописується в кінець файлу журналу як окремий
+кадр: довжина, CRC32 і pickle кортежу (lsn, зміна). Запис у файл
+відбувається одразу, а fsync — групами: раз на `sync_every` змін або раз
+на `sync_interval` секунд.
+
+На диску сховище складається зі знімка (звичайний pickle-файл книги, який
+розуміє storage.load_data) та сегментів журналу `<знімок>.wal.<N>`.
+При запуску знімок завантажується, а зміни з сегментів, новіші за LSN
+знімка, повторюються. Коли в усіх сегментах набирається `compact_every`
+змін (або сегментів від попередніх сесій стає забагато), поточний сегмент
+закривається, а фоновий потік будує з попереднього знімка і закритих
+сегментів новий знімок, після чого закриті сегменти видаляються. Ущільнення працює з
+власною копією даних і не торкається книги, з якою працює користувач.
+"""
+
+import glob
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+import zlib
+
+FRAME_HEADER = struct.Struct("<II")
+SEGMENT_SUFFIX = ".wal."
+# Скільки сегментів попередніх сесій можна лишити до ущільнення при запуску
+MAX_SEALED_SEGMENTS = 16
+
+
+def dump_temp(book, path: str, dump=pickle.dump) -> str:
+    """Записує книгу у новий тимчасовий файл поруч з `path` і повертає його.
+
+    Книгу записує `dump(book, f)` — за замовчуванням pickle. Ім'я
+    тимчасового файлу унікальне, тож кілька процесів можуть писати
+    одночасно; на місце `path` його ставить os.replace.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f"{os.path.basename(path)}.",
+        suffix=".tmp",
+        dir=os.path.dirname(path) or ".",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            dump(book, f)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def write_snapshot(book, path: str) -> None:
+    """Атомарно записує знімок: у тимчасовий файл, а потім os.replace.
+
+    Збій посеред запису лишає попередній знімок цілим.
+    """
+    os.replace(dump_temp(book, path), path)
+
+
+def read_snapshot(path: str, factory):
+    """Читає знімок або повертає порожню книгу, якщо файлу ще немає."""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return factory()
+
+
+def read_segment(path: str):
+    """Повертає пари (lsn, зміна) з сегмента.
+
+    Читання зупиняється на першому пошкодженому або обрізаному кадрі —
+    так виглядає хвіст журналу після аварійного завершення процесу.
+    """
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                return
+            size, crc = FRAME_HEADER.unpack(header)
+            payload = f.read(size)
+            if len(payload) < size or zlib.crc32(payload) != crc:
+                return
+            yield pickle.loads(payload)
+
+
+def list_segments(snapshot_path: str) -> list[tuple[int, str]]:
+    """Сегменти журналу знімка, впорядковані за номером."""
+    prefix = snapshot_path + SEGMENT_SUFFIX
+    segments = []
+    for path in glob.glob(glob.escape(prefix) + "*"):
+        suffix = path[len(prefix) :]
+        if suffix.isdigit():
+            segments.append((int(suffix), path))
+    return sorted(segments)
+
+
+def replay(book, segments: list[tuple[int, str]]) -> int:
+    """Повторює зміни з сегментів, новіші за LSN знімка; повертає останній LSN."""
+    last_lsn = getattr(book, "_journal_lsn", 0)
+    for _, path in segments:
+        for lsn, change in read_segment(path):
+            if lsn <= last_lsn:
+                continue
+            book.apply_change(change)
+            last_lsn = lsn
+    book._journal_lsn = last_lsn
+    return last_lsn
+
+
+class Journal:
+    """Сегмент журналу, відкритий на дозапис, з груповим fsync."""
+
+    def __init__(
+        self,
+        path: str,
+        next_lsn: int,
+        sync_every: int = 64,
+        sync_interval: float = 1.0,
+    ):
+        self.path = path
+        self.next_lsn = next_lsn
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.entries = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._file = open(path, "ab")
+
+    def append(self, change: tuple) -> None:
+        """Дописує зміну в кінець сегмента."""
+        payload = pickle.dumps((self.next_lsn, change), pickle.HIGHEST_PROTOCOL)
+        self._file.write(FRAME_HEADER.pack(len(payload), zlib.crc32(payload)))
+        self._file.write(payload)
+        # Дані потрапляють до ОС одразу — їх не втратить аварійний вихід процесу;
+        # fsync (захист від збою живлення) виконується групами
+        self._file.flush()
+        self.next_lsn += 1
+        self.entries += 1
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.sync_every
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Примусово скидає записані зміни на диск."""
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+class JournaledStore:
+    """Книга, що зберігається як знімок плюс журнал змін.
+
+    Приклад:
+        store = JournaledStore("addressbook.pkl", AddressBook)
+        book = store.load()   # знімок + повтор журналу, далі зміни журналюються
+        ...
+        store.close()         # лише дописує хвіст журналу на диск
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        factory,
+        compact_every: int = 10_000,
+        sync_every: int = 64,
+        sync_interval: float = 1.0,
+    ):
+        self.snapshot_path = snapshot_path
+        self.factory = factory
+        self.compact_every = compact_every
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.book = None
+        self.journal: Journal | None = None
+        self._segment_no = 0
+        # зміни в закритих сегментах, ще не згорнуті у знімок
+        self._sealed_entries = 0
+        self._compactor: threading.Thread | None = None
+
+    def load(self):
+        """Завантажує знімок, повторює журнал і починає журналювати зміни."""
+        book = read_snapshot(self.snapshot_path, self.factory)
+        snapshot_lsn = getattr(book, "_journal_lsn", 0)
+        segments = list_segments(self.snapshot_path)
+        last_lsn = replay(book, segments)
+        if segments:
+            self._segment_no = segments[-1][0]
+        sealed = []
+        for segment in segments:
+            # порожні сегменти лишаються від сесій без змін
+            if os.path.getsize(segment[1]) == 0:
+                os.remove(segment[1])
+            else:
+                sealed.append(segment)
+        # Новий сегмент при кожному запуску: можливий обрізаний хвіст
+        # попереднього лишається позаду і не заважає новим записам
+        self._open_segment(last_lsn + 1)
+        self._sealed_entries = last_lsn - snapshot_lsn
+        if sealed and (
+            self._sealed_entries >= self.compact_every
+            or len(sealed) >= MAX_SEALED_SEGMENTS
+        ):
+            self._start_compaction(sealed)
+        book.subscribe(self._on_change)
+        self.book = book
+        return book
+
+    def _open_segment(self, next_lsn: int) -> None:
+        self._segment_no += 1
+        path = f"{self.snapshot_path}{SEGMENT_SUFFIX}{self._segment_no:08d}"
+        self.journal = Journal(path, next_lsn, self.sync_every, self.sync_interval)
+
+    def _on_change(self, change: tuple) -> None:
+        journal = self.journal
+        if journal is None:
+            return
+        journal.append(change)
+        if self._sealed_entries + journal.entries >= self.compact_every:
+            self.compact()
+
+    def compact(self, wait: bool = False) -> None:
+        """Закриває поточний сегмент і згортає журнал у новий знімок у фоні."""
+        journal = self.journal
+        if journal is None:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            if not wait:
+                return
+            self._compactor.join()
+        next_lsn = journal.next_lsn
+        journal.close()
+        self._open_segment(next_lsn)
+        sealed = [
+            segment
+            for segment in list_segments(self.snapshot_path)
+            if segment[0] < self._segment_no
+        ]
+        compactor = self._start_compaction(sealed)
+        if wait:
+            compactor.join()
+
+    def _start_compaction(self, sealed: list[tuple[int, str]]) -> threading.Thread:
+        self._sealed_entries = 0
+        compactor = threading.Thread(target=self._compact, args=(sealed,), daemon=True)
+        compactor.start()
+        self._compactor = compactor
+        return compactor
+
+    def _compact(self, sealed: list[tuple[int, str]]) -> None:
+        # Окрема копія: знімок з диска + закриті сегменти, без доступу до живої книги
+        book = read_snapshot(self.snapshot_path, self.factory)
+        replay(book, sealed)
+        write_snapshot(book, self.snapshot_path)
+        for _, path in sealed:
+            os.remove(path)
+
+    def close(self) -> None:
+        """Скидає журнал на диск і чекає завершення фонового ущільнення."""
+        if self.book is not None:
+            self.book.unsubscribe(self._on_change)
+        if self.journal is not None:
+            self.journal.close()
+        if self._compactor is not None:
+            self._compactor.join()
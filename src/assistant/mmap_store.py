@@ -0,0 +1,386 @@
+"""Знімок контактів лише для читання, який відкривається через mmap.
+
+Розпаковувати pickle з мільйоном записів довго і дорого за пам'яттю, тож
+для великих книг, з якими переважно працюють на читання, книгу можна
+записати в окремий формат і відкривати його через mmap: записи
+розпаковуються лише тоді, коли до них звертаються, а сторінки файлу —
+спільні для всіх процесів, що його відкрили (кеш сторінок ОС).
+
+Формат файлу (усі числа little-endian):
+
+    заголовок  HEADER: сигнатура, версія, кількість записів, початок і кінець
+               блоків записів, а також (зміщення, кількість) трьох індексів
+    записи     блоки у порядку додавання: RECORD_HEADER (день народження як
+               порядковий номер дати або 0, довжини імені, телефонів через
+               кому, email і адреси; 0 — поля немає) і далі UTF-8 байти полів
+    індекси    ключі індексів підряд, а за ними відсортовані елементи
+               INDEX_ENTRY фіксованого розміру: (зміщення ключа, довжина
+               ключа, зміщення блока запису)
+
+Індекси: "names" — ключ casefold(ім'я) + b"\\0" + ім'я (порядок як у
+models.name_sort_key, тож він же дає сторінки за іменем і доповнення),
+"lookup" — casefold імені та email і телефони (для find-contact),
+"birthdays" — місяць * 100 + день, 4 цифри (для birthdays-in). Пошук у
+кожному — бінарний по елементах фіксованого розміру просто в mmap.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from datetime import date
+from itertools import groupby
+import mmap
+import os
+import struct
+import tempfile
+
+from .models import AddressBook, Record, cursor_number
+
+DEFAULT_MMAP_DB = "addressbook.snap"
+MAGIC = b"ABSNAP\x00\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ" + "QQ" * 3)
+RECORD_HEADER = struct.Struct("<IHHHH")
+INDEX_ENTRY = struct.Struct("<QIQ")
+INDEXES = ("names", "lookup", "birthdays")
+READ_ONLY = "Contacts are read-only in this storage mode."
+
+
+def name_key(name: str) -> bytes:
+    """Ключ індексу імен: спершу без урахування регістру, потім саме ім'я."""
+    return name.casefold().encode() + b"\0" + name.encode()
+
+
+def birthday_key(month: int, day: int) -> bytes:
+    return b"%04d" % (month * 100 + day)
+
+
+def encode_record(record: Record) -> bytes:
+    fields = [
+        record._name.encode(),
+        ",".join(record._phones).encode(),
+        (record._email or "").encode(),
+        (record._address or "").encode(),
+    ]
+    return RECORD_HEADER.pack(record._birthday or 0, *map(len, fields)) + b"".join(
+        fields
+    )
+
+
+def write_mmap_snapshot(book: AddressBook, path: str) -> None:
+    """Атомарно записує книгу у формат для mmap (тимчасовий файл + os.replace)."""
+    entries: dict[str, list[tuple]] = {name: [] for name in INDEXES}
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f"{os.path.basename(path)}.",
+        suffix=".tmp",
+        dir=os.path.dirname(path) or ".",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(bytes(HEADER.size))
+            data_start = offset = HEADER.size
+            for record in book.data.values():
+                block = encode_record(record)
+                f.write(block)
+                name = record._name
+                entries["names"].append((name_key(name), offset))
+                lookup = {name.casefold(), *record._phones}
+                if record._email is not None:
+                    lookup.add(record._email.casefold())
+                for value in lookup:
+                    entries["lookup"].append((value.encode(), offset))
+                if record._birthday is not None:
+                    born = date.fromordinal(record._birthday)
+                    entries["birthdays"].append(
+                        (birthday_key(born.month, born.day), offset)
+                    )
+                offset += len(block)
+            data_end = offset
+            sections = []
+            for name in INDEXES:
+                # за рівних ключів — у порядку додавання (зміщення зростає)
+                items = sorted(entries.pop(name))
+                key_offsets = []
+                for key, _ in items:
+                    key_offsets.append(offset)
+                    f.write(key)
+                    offset += len(key)
+                sections.append((offset, len(items)))
+                f.write(
+                    b"".join(
+                        INDEX_ENTRY.pack(key_offset, len(key), record_offset)
+                        for key_offset, (key, record_offset) in zip(key_offsets, items)
+                    )
+                )
+                offset += INDEX_ENTRY.size * len(items)
+            f.seek(0)
+            f.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    len(book.data),
+                    data_start,
+                    data_end,
+                    *(value for section in sections for value in section),
+                )
+            )
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+class SortedIndex:
+    """Відсортований індекс знімка: послідовність ключів (bytes) для bisect."""
+
+    def __init__(self, mm: mmap.mmap, offset: int, count: int):
+        self._mm = mm
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, i: int) -> tuple[int, int, int]:
+        return INDEX_ENTRY.unpack_from(self._mm, self._offset + i * INDEX_ENTRY.size)
+
+    def __getitem__(self, i: int) -> bytes:
+        key_offset, key_len, _ = self._entry(i)
+        return self._mm[key_offset : key_offset + key_len]
+
+    def record_offset(self, i: int) -> int:
+        return self._entry(i)[2]
+
+    def equal(self, key: bytes) -> list[int]:
+        """Зміщення записів з ключем `key` у порядку додавання."""
+        start = bisect_left(self, key)
+        end = bisect_right(self, key, lo=start)
+        return [self.record_offset(i) for i in range(start, end)]
+
+
+class SnapshotRecords(Mapping):
+    """Словник ім'я -> Record поверх mmap-знімка; записи розпаковуються на вимогу.
+
+    Розпакований запис не кешується: кожне звернення дає нову копію, тож
+    спроба змінити її ніде не лишає слідів (див. MmapAddressBook).
+    """
+
+    def __init__(self, path: str, owner):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self.data_start, self.data_end, *sections = (
+            HEADER.unpack_from(self._mm)
+        )
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a contacts snapshot of version {VERSION}")
+        self.indexes = {
+            name: SortedIndex(self._mm, sections[2 * i], sections[2 * i + 1])
+            for i, name in enumerate(INDEXES)
+        }
+        self._owner = owner
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _lengths(self, offset: int) -> tuple[int, int, int, int, int]:
+        return RECORD_HEADER.unpack_from(self._mm, offset)
+
+    def block_end(self, offset: int) -> int:
+        """Зміщення наступного блока після блока за зміщенням `offset`."""
+        _, *lengths = self._lengths(offset)
+        return offset + RECORD_HEADER.size + sum(lengths)
+
+    def name_at(self, offset: int) -> str:
+        start = offset + RECORD_HEADER.size
+        name_len = self._lengths(offset)[1]
+        return self._mm[start : start + name_len].decode()
+
+    def record_at(self, offset: int) -> Record:
+        ordinal, *lengths = self._lengths(offset)
+        pos = offset + RECORD_HEADER.size
+        fields = []
+        for length in lengths:
+            fields.append(self._mm[pos : pos + length].decode())
+            pos += length
+        name, phones, email, address = fields
+        record = Record.from_values(
+            name,
+            phones.split(",") if phones else (),
+            date.fromordinal(ordinal) if ordinal else None,
+            email or None,
+            address or None,
+        )
+        record._book = self._owner
+        return record
+
+    def offsets(self, start: int | None = None):
+        """Зміщення блоків у порядку додавання, починаючи зі `start`."""
+        offset = self.data_start if start is None else start
+        while offset < self.data_end:
+            yield offset
+            offset = self.block_end(offset)
+
+    def offset_of(self, key: str) -> int | None:
+        found = self.indexes["names"].equal(name_key(key))
+        return found[0] if found else None
+
+    def __getitem__(self, key: str) -> Record:
+        offset = self.offset_of(key)
+        if offset is None:
+            raise KeyError(key)
+        return self.record_at(offset)
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self.offset_of(key) is not None
+
+    def __iter__(self):
+        for offset in self.offsets():
+            yield self.name_at(offset)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def items(self):
+        """Потоково розпаковує всі записи в порядку додавання."""
+        for offset in self.offsets():
+            record = self.record_at(offset)
+            yield record._name, record
+
+    def values(self):
+        for _, record in self.items():
+            yield record
+
+
+class MmapAddressBook(AddressBook):
+    """AddressBook лише для читання поверх mmap-знімка (див. write_mmap_snapshot).
+
+    Пошук за ім'ям, телефоном, email, днем народження та сторінки
+    виконуються бінарним пошуком в індексах файлу і розпаковують лише
+    знайдені записи. Будь-яка зміна контактів — ValueError.
+    """
+
+    # Колонки всієї книги в пам'яті звели б нанівець читання записів на вимогу
+    COLUMN_SCAN = False
+
+    def __init__(self, path: str = DEFAULT_MMAP_DB):
+        self._init_listeners()
+        self.data = SnapshotRecords(path, self)
+        # індекс нечіткого пошуку будується в пам'яті при першому пошуку
+        self._fuzzy_keys = None
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __setitem__(self, key: str, record: Record) -> None:
+        raise ValueError(READ_ONLY)
+
+    def __delitem__(self, key: str) -> None:
+        raise ValueError(READ_ONLY)
+
+    def _on_field_change(self, record: Record, field: str, old, new) -> None:
+        raise ValueError(READ_ONLY)
+
+    def _commit_batch(self, staged: dict) -> None:
+        raise ValueError(READ_ONLY)
+
+    def __getstate__(self):
+        raise TypeError("MmapAddressBook is backed by a file and can't be pickled")
+
+    def _select(self, index: str, key: str) -> list[Record]:
+        offsets = self.data.indexes[index].equal(key.encode())
+        return [self.data.record_at(offset) for offset in sorted(set(offsets))]
+
+    def find_by_name(self, name: str) -> list[Record]:
+        return [
+            rec
+            for rec in self._select("lookup", name.casefold())
+            if rec._name.casefold() == name.casefold()
+        ]
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        return [rec for rec in self._select("lookup", phone) if phone in rec._phones]
+
+    def find_by_email(self, email: str) -> list[Record]:
+        key = email.casefold()
+        return [
+            rec
+            for rec in self._select("lookup", key)
+            if rec._email is not None and rec._email.casefold() == key
+        ]
+
+    def lookup(self, query: str) -> list[Record]:
+        return self._select("lookup", query.casefold())
+
+    def _index_range(self, field: str, value) -> tuple[SortedIndex, int, int]:
+        """Індекс знімка і межі його ключів для умови `field` = `value`."""
+        if field in ("name", "email", "phone"):
+            index = self.data.indexes["lookup"]
+            key = (value if field == "phone" else value.casefold()).encode()
+            low = high = key
+        else:
+            index = self.data.indexes["birthdays"]
+            if field == "birthday":
+                low = high = birthday_key(value.month, value.day)
+            else:
+                low, high = birthday_key(value, 0), birthday_key(value, 99)
+        start = bisect_left(index, low)
+        return index, start, bisect_right(index, high, lo=start)
+
+    def index_estimate(self, field: str, value) -> int:
+        _, start, end = self._index_range(field, value)
+        return end - start
+
+    def index_records(self, field: str, value):
+        index, start, end = self._index_range(field, value)
+        offsets = sorted({index.record_offset(i) for i in range(start, end)})
+        for offset in offsets:
+            yield self.data.record_at(offset)
+
+    def names_with_prefix(self, prefix: str, limit: int) -> list[str]:
+        names = self.data.indexes["names"]
+        key = prefix.casefold().encode()
+        start = bisect_left(names, key)
+        found = []
+        for i in range(start, min(start + limit, len(names))):
+            if not names[i].startswith(key):
+                break
+            found.append(self.data.name_at(names.record_offset(i)))
+        return found
+
+    def _page_keys(
+        self, order: str, cursor: str | None, limit: int
+    ) -> tuple[list[str], str | None]:
+        # Курсори: ім'я для порядку за іменем, зміщення блока — за додаванням;
+        # зайвий елемент показує, чи є наступна сторінка
+        if order == "name":
+            names = self.data.indexes["names"]
+            start = 0 if cursor is None else bisect_right(names, name_key(cursor))
+            end = min(start + limit + 1, len(names))
+            keys = [
+                self.data.name_at(names.record_offset(i)) for i in range(start, end)
+            ]
+            return keys[:limit], keys[limit - 1] if len(keys) > limit else None
+        first: int | None = None
+        if cursor is not None:
+            after = cursor_number(cursor)
+            if not self.data.data_start <= after < self.data.data_end:
+                raise ValueError("Invalid page cursor.")
+            first = self.data.block_end(after)
+        offsets = []
+        for offset in self.data.offsets(first):
+            offsets.append(offset)
+            if len(offsets) > limit:
+                break
+        keys = [self.data.name_at(offset) for offset in offsets[:limit]]
+        return keys, str(offsets[limit - 1]) if len(offsets) > limit else None
+
+    def _iter_birthdays(self, start: tuple[int, int], before: bool):
+        birthdays = self.data.indexes["birthdays"]
+        pos = bisect_left(birthdays, birthday_key(*start))
+        positions = range(pos) if before else range(pos, len(birthdays))
+        for key, group in groupby(positions, key=birthdays.__getitem__):
+            month, day = divmod(int(key), 100)
+            names = [self.data.name_at(birthdays.record_offset(i)) for i in group]
+            yield (month, day), names
@@ -1,13 +1,132 @@
-from collections import UserDict
-from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right, insort
+from calendar import isleap
+from collections import Counter, UserDict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+import heapq
+import math
+from operator import itemgetter
 import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    # columnar.py сам імпортує models.py
+    from .columnar import ContactColumns
+
+
+# Кількість записів на сторінці за замовчуванням (show-all-contacts, show-notes)
+PAGE_SIZE = 20
+# Пакет, що додає або видаляє більше ключів, скидає відсортовані списки
+# сторінок: перебудувати їх при наступному запиті дешевше, ніж вставляти
+# ключі по одному
+BATCH_RESORT = 1_000
+
+
+def page_slice(keys: list, after, limit: int, sort_key) -> tuple[list, bool]:
+    """Зріз відсортованого списку ключів після позиції `after`.
+
+    `after` — значення ключа сортування останнього показаного елемента
+    (None — з початку). Повертає ключі сторінки і ознаку, чи є ще елементи.
+    """
+    start = 0 if after is None else bisect_right(keys, after, key=sort_key)
+    return keys[start : start + limit], start + limit < len(keys)
+
+
+def with_prefix(keys: list, prefix: str, limit: int, key=None) -> list:
+    """До `limit` елементів відсортованого списку, що починаються з `prefix`.
+
+    `key` — функція, за якою список відсортовано і з якою порівнюється
+    префікс. Вартість — O(log n + limit) незалежно від довжини списку.
+    """
+    start = bisect_left(keys, prefix, key=key)
+    found = []
+    for item in keys[start : start + limit]:
+        if not (item if key is None else key(item)).startswith(prefix):
+            break
+        found.append(item)
+    return found
+
+
+def name_sort_key(name: str) -> tuple[str, str]:
+    """Ключ сортування імен: без урахування регістру, за рівності — за самим ім'ям."""
+    return name.casefold(), name
+
+
+# Кількість результатів нечіткого пошуку за замовчуванням
+FUZZY_LIMIT = 5
+# Частка триграм запиту, яку має містити значення, щоб вважатися схожим
+FUZZY_MIN_SHARE = 0.5
+# Початковий поріг схожості нечіткого пошуку і крок, з яким він знижується
+FUZZY_START_SHARE = 0.8
+FUZZY_SHARE_STEP = 0.2
+# Скільки входжень зі списків триграм переглядається при відборі кандидатів:
+# запит із самих поширених триграм ("gmail.com") не перебирає всю книгу
+FUZZY_CANDIDATES = 4_000
+
+
+def fuzzy_grams(text: str) -> set[str]:
+    """Триграми рядка, доповненого пробілами, щоб враховувались його краї."""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def cursor_number(cursor: str) -> int:
+    """Числовий курсор сторінки (номер додавання або ID нотатки)."""
+    if not cursor.isdigit():
+        raise ValueError("Invalid page cursor.")
+    return int(cursor)
 
 
 class Field:
-    """Базовий клас для всіх полів."""
+    """Базовий клас для всіх полів.
+
+    Запис зберігає лише значення і щоразу повертає нове поле, пов'язане з ним
+    (`_record`). Атрибут value лише для читання; update_number, update_email
+    та update_address змінюють поле разом із записом — через методи Record,
+    що оновлюють індекси книги. Поля рівні, якщо рівні їхні тип і значення.
+    """
+
+    __slots__ = ("value", "_record")
+    value: Any
+    _record: "Record | None"
 
     def __init__(self, value):
-        self.value = value
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "_record", None)
+
+    @classmethod
+    def _wrap(cls, value, record: "Record | None" = None):
+        """Створює поле з уже перевіреного значення, без повторної валідації."""
+        field = cls.__new__(cls)
+        object.__setattr__(field, "value", value)
+        object.__setattr__(field, "_record", record)
+        return field
+
+    def _set(self, value) -> None:
+        object.__setattr__(self, "value", value)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(
+            f"{type(self).__name__} is read-only; change it through the Record."
+        )
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.value))
+
+    def __getstate__(self) -> dict:
+        return {"value": self.value}
+
+    def __setstate__(self, state) -> None:
+        # у старих файлах поля зберігались разом зі словником атрибутів
+        if isinstance(state, tuple):
+            state = state[1]
+        object.__setattr__(self, "value", state["value"])
+        object.__setattr__(self, "_record", None)
 
     def __str__(self):
         return str(self.value)
@@ -16,6 +135,8 @@ class Field:
 class Name(Field):
     """Клас для зберігання імені контакту."""
 
+    __slots__ = ()
+
     def __init__(self, value):
         if not value:
             raise ValueError("Invalid name.")
@@ -25,6 +146,8 @@ class Name(Field):
 class Phone(Field):
     """Клас для зберігання номера телефону з валідацією (10 цифр)."""
 
+    __slots__ = ()
+
     def __init__(self, value):
         if not self._validate(value):
             raise ValueError("Phone number must contain exactly 10 digits.")
@@ -39,15 +162,19 @@ class Phone(Field):
         return self.value
 
     def update_number(self, new_number: str) -> None:
-        """Оновлює номер телефону з валідацією."""
+        """Оновлює номер телефону з валідацією (і в записі, якщо він є)."""
         if not self._validate(new_number):
             raise ValueError("Phone number must contain exactly 10 digits.")
-        self.value = new_number
+        if self._record is not None:
+            self._record.edit_phone(self.value, new_number)
+        self._set(new_number)
 
 
 class Birthday(Field):
     """Клас для зберігання дати народження (формат DD.MM.YYYY)."""
 
+    __slots__ = ()
+
     def __init__(self, value: str):
         try:
             # Перетворити рядок на datetime та зберегти у value
@@ -65,6 +192,8 @@ class Birthday(Field):
 class Email(Field):
     """Клас для зберігання та валідації email."""
 
+    __slots__ = ()
+
     def __init__(self, email: str):
         if not self.validate_email(email):
             raise ValueError(
@@ -82,12 +211,16 @@ class Email(Field):
             raise ValueError(
                 f"Invalid email format: {new_email}. Format example: user@example.com"
             )
-        self.value = new_email
+        if self._record is not None:
+            self._record.edit_email(new_email)
+        self._set(new_email)
 
 
 class Address(Field):
     """Клас для зберігання адреси контакту."""
 
+    __slots__ = ()
+
     def __init__(self, value: str):
         value = value.strip()
         if len(value) < 5:
@@ -98,95 +231,817 @@ class Address(Field):
         new_value = new_value.strip()
         if len(new_value) < 5:
             raise ValueError("Address is too short.")
-        self.value = new_value
+        if self._record is not None:
+            self._record.edit_address(new_value)
+        self._set(new_value)
+
+
+class Observable:
+    """Домішка для книг, що повідомляють підписників про кожну зміну даних.
+
+    Зміна передається кортежем: ("put", key, item), ("delete", key) або
+    ("field", key, field, old, new). Підписники (журнал, автозбереження тощо)
+    не серіалізуються разом із книгою.
+
+    Зміни пакета (див. Batch) надходять однією зміною ("batch", changes), де
+    changes — кортеж звичайних змін.
+
+    Книга також рахує свої зміни: `dirty` показує, чи є зміни, яких ще не
+    збережено (див. mark_saved).
+    """
+
+    if TYPE_CHECKING:
+        # надає книга, до якої домішується клас; книги SQLite і mmap
+        # підставляють власне сховище записів
+        data: Any
+
+        def __setitem__(self, key, item) -> None: ...
+
+        def __delitem__(self, key) -> None: ...
+
+        def apply_change(self, change: tuple) -> None: ...
+
+    def _init_listeners(self) -> None:
+        self._listeners: list = []
+        self._changes = 0
+        self._saved_changes = 0
+        # Зміни, що збираються для однієї зміни "batch" (див. _grouped)
+        self._pending: list | None = None
+
+    @property
+    def changes(self) -> int:
+        """Кількість змін книги з моменту завантаження."""
+        return self._changes
+
+    @property
+    def dirty(self) -> bool:
+        return self._changes != self._saved_changes
+
+    def mark_saved(self, changes: int | None = None) -> None:
+        """Позначає збереженими всі зміни (або перші `changes` з них)."""
+        self._saved_changes = self._changes if changes is None else changes
+
+    def snapshot(self, changed=()):
+        """Копія книги для запису у фоновому потоці.
+
+        Копіюється словник записів, а записи з ключами `changed` (змінені з
+        попереднього збереження) — через copy(), тож копія відповідає книзі на
+        момент виклику. Решта записів спільні з книгою: їхні поля змінюються
+        лише заміною значення, тож серіалізація не бачить напівзмінених даних.
+        """
+        copy = object.__new__(type(self))
+        copy.__dict__.update(self.__getstate__())
+        copy.data = dict(self.data)
+        for key in changed:
+            item = copy.data.get(key)
+            if item is not None:
+                copy.data[key] = item.copy()
+        return copy
+
+    def subscribe(self, listener) -> None:
+        """Додає функцію, яка викликатиметься з кожною зміною."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener) -> None:
+        """Прибирає раніше доданого підписника."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, *change) -> None:
+        if self._pending is not None:
+            self._pending.append(change)
+            return
+        self._changes += 1
+        for listener in self._listeners:
+            listener(change)
+
+    @contextmanager
+    def _grouped(self):
+        """Збирає зміни блоку і розсилає їх підписникам однією зміною "batch"."""
+        if self._pending is not None:
+            yield
+            return
+        self._pending = []
+        try:
+            yield
+        finally:
+            changes, self._pending = tuple(self._pending), None
+            if changes:
+                self._notify("batch", changes)
+
+    def _apply_batch(self, changes: tuple) -> None:
+        """Повторює зміну "batch" (для журналу)."""
+        with self._grouped():
+            for change in changes:
+                self.apply_change(change)
+
+    def _commit_batch(self, staged: dict) -> None:
+        """Записує в книгу робочі копії пакета (None — елемент видалено)."""
+        with self._grouped():
+            for key, item in staged.items():
+                if item is not None:
+                    self[key] = item
+                elif key in self.data:
+                    del self[key]
+
+
+class Batch:
+    """Група змін книги, що застосовується вся або не застосовується зовсім.
+
+    Операції виконуються одразу, але над робочими копіями елементів і тими
+    самими методами, що й звичайні команди, тож перевірки ті самі і
+    враховують попередні операції пакета. Помилки операцій збираються;
+    commit() застосовує пакет, лише якщо помилок немає, інакше кидає
+    ValueError з усіма помилками, а книга лишається незмінною.
+
+    Книга отримує кожен змінений елемент один раз: індекси оновлюються раз
+    на елемент, а підписники (журнал, збереження) — одну зміну "batch".
+    У блоці `with book.batch() as batch:` commit() викликається при виході;
+    якщо блок кинув виняток, пакет відкидається.
+    """
+
+    # Назва елемента в повідомленнях про помилки
+    ITEM = "Item"
+
+    def __init__(self, book):
+        self.book = book
+        # ключ -> робоча копія елемента або None, якщо його видалено
+        self.staged: dict = {}
+        self.errors: list[str] = []
+        self.operations = 0
+
+    def _item(self, key):
+        """Робоча копія елемента; KeyError, якщо його немає."""
+        if key in self.staged:
+            item = self.staged[key]
+        else:
+            item = self.book.data.get(key)
+            if item is not None:
+                item = self.staged[key] = item.copy()
+        if item is None:
+            raise KeyError(key)
+        return item
+
+    def _run(self, operation, *args):
+        """Виконує операцію пакета; помилку запам'ятовує з номером операції."""
+        self.operations += 1
+        try:
+            return operation(*args)
+        except KeyError as e:
+            self.errors.append(
+                f"#{self.operations}: {self.ITEM} {e.args[0]} not found."
+            )
+        except ValueError as e:
+            self.errors.append(f"#{self.operations}: {e}")
+        return None
+
+    def commit(self) -> None:
+        if self.errors:
+            raise ValueError(
+                f"Batch rejected, nothing changed ({len(self.errors)} of "
+                f"{self.operations} operations failed):\n" + "\n".join(self.errors)
+            )
+        staged, self.staged = self.staged, {}
+        if staged:
+            self.book._commit_batch(staged)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+
+class PhoneList(list):
+    """Телефони запису (Record.phones) — звичайний список Phone.
+
+    Зміни списку (append, remove, del, ...) записуються в запис через його
+    методи, тож індекси книги лишаються узгодженими; після зміни список
+    повторює телефони запису.
+    """
+
+    __slots__ = ("_record",)
+
+    def __init__(self, record: "Record"):
+        super().__init__(Phone._wrap(number, record) for number in record._phones)
+        self._record = record
+
+    def _change(self, method, *args):
+        items = list(self)
+        result = method(items, *args)
+        record = self._record
+        record.phones = items
+        super().__init__(Phone._wrap(number, record) for number in record._phones)
+        return self if result is items else result
+
+
+def _writes_through(name: str):
+    method = getattr(list, name)
+
+    def change(self, *args):
+        return self._change(method, *args)
+
+    change.__name__ = name
+    return change
+
+
+for _name in (
+    "append",
+    "extend",
+    "insert",
+    "remove",
+    "pop",
+    "clear",
+    "sort",
+    "reverse",
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+):
+    setattr(PhoneList, _name, _writes_through(_name))
 
 
 class Record:
-    """Клас для зберігання інформації про контакт."""
+    """Клас для зберігання інформації про контакт.
+
+    Щоб мільйони контактів займали якомога менше пам'яті, запис зберігає
+    значення полів у компактному вигляді у __slots__: ім'я, email та адреса —
+    рядки, телефони — кортеж рядків, день народження — порядковий номер дати
+    (date.toordinal). Атрибути name, phones, birthday, email та address
+    повертають звичні об'єкти полів, створені з цих значень; їхні зміни
+    (update_email, record.phones.append, ...) записуються через методи запису.
+
+    Текст запису (str) будується при першому виводі і зберігається до
+    наступної зміни запису; у pickle він не потрапляє.
+    """
+
+    __slots__ = (
+        "_name",
+        "_phones",
+        "_birthday",
+        "_email",
+        "_address",
+        "_book",
+        "_rendered",
+    )
 
     def __init__(self, name: str):
-        self.name = Name(name)
-        self.phones: list[Phone] = []
-        self.birthday: Birthday | None = None
-        self.email: Email | None = None
-        self.address: Address | None = None
+        self._name: str = Name(name).value
+        self._phones: tuple[str, ...] = ()
+        self._birthday: int | None = None
+        self._email: str | None = None
+        self._address: str | None = None
+        # Книга, до якої належить запис; встановлюється AddressBook і не серіалізується
+        self._book: AddressBook | None = None
+        self._rendered: str | None = None
+
+    @classmethod
+    def from_values(
+        cls,
+        name: str,
+        phones=(),
+        birthday: date | None = None,
+        email: str | None = None,
+        address: str | None = None,
+    ) -> "Record":
+        """Створює запис з уже перевірених значень (наприклад, під час імпорту)."""
+        record = cls.__new__(cls)
+        record._name = name
+        record._phones = tuple(phones)
+        record._birthday = None if birthday is None else birthday.toordinal()
+        record._email = email
+        record._address = address
+        record._book = None
+        record._rendered = None
+        return record
+
+    def copy(self) -> "Record":
+        """Копія запису, не прив'язана до книги."""
+        record = Record.__new__(Record)
+        record.__setstate__(self.__getstate__())
+        return record
+
+    @property
+    def name(self) -> Name:
+        return Name._wrap(self._name)
+
+    @property
+    def phones(self) -> PhoneList:
+        return PhoneList(self)
+
+    @phones.setter
+    def phones(self, phones) -> None:
+        numbers = [p.value if isinstance(p, Phone) else Phone(p).value for p in phones]
+        # книга дізнається лише про додані та прибрані номери
+        removed, added = list(self._phones), []
+        for number in numbers:
+            if number in removed:
+                removed.remove(number)
+            else:
+                added.append(number)
+        for number in removed:
+            self.remove_phone(number)
+        for number in added:
+            self.add_phone(number)
+        self._phones = tuple(numbers)
+        self._rendered = None
+
+    @property
+    def birthday(self) -> Birthday | None:
+        if self._birthday is None:
+            return None
+        return Birthday._wrap(date.fromordinal(self._birthday))
+
+    @birthday.setter
+    def birthday(self, birthday: Birthday | None) -> None:
+        self._birthday = None if birthday is None else birthday.value.toordinal()
+        self._rendered = None
+
+    @property
+    def email(self) -> Email | None:
+        return None if self._email is None else Email._wrap(self._email, self)
+
+    @email.setter
+    def email(self, email: Email | None) -> None:
+        self._email = None if email is None else email.value
+        self._rendered = None
+
+    @property
+    def address(self) -> Address | None:
+        return None if self._address is None else Address._wrap(self._address, self)
+
+    @address.setter
+    def address(self, address: Address | None) -> None:
+        self._address = None if address is None else address.value
+        self._rendered = None
 
     def add_phone(self, phone_number: str) -> None:
         """Додає номер телефону до запису."""
-        self.phones.append(Phone(phone_number))
+        self._phones += (Phone(phone_number).value,)
+        self._changed("phone", None, phone_number)
 
     def remove_phone(self, phone_number: str) -> None:
         """Видаляє номер телефону з запису."""
-        phone = self.find_phone(phone_number)
-        if phone:
-            self.phones.remove(phone)
+        if phone_number in self._phones:
+            i = self._phones.index(phone_number)
+            self._phones = self._phones[:i] + self._phones[i + 1 :]
+            self._changed("phone", phone_number, None)
 
     def edit_phone(self, old_number: str, new_number: str) -> bool:
         """Редагує номер телефону в записі."""
-        phone = self.find_phone(old_number)
-        if phone:
-            phone.update_number(new_number)
+        if old_number in self._phones:
+            Phone(new_number)  # валідація нового номера
+            i = self._phones.index(old_number)
+            self._phones = self._phones[:i] + (new_number,) + self._phones[i + 1 :]
+            self._changed("phone", old_number, new_number)
             return True
         return False
 
     def find_phone(self, phone_number: str) -> Phone | None:
         """Знаходить номер телефону в записі."""
-        for ph in self.phones:
-            if ph.phone_number == phone_number:
-                return ph
+        if phone_number in self._phones:
+            return Phone._wrap(phone_number, self)
         return None
 
     def add_birthday(self, birthday_str: str) -> None:
         """Додає день народження до контакту."""
-        if self.birthday is not None:
+        if self._birthday is not None:
             raise ValueError("Birthday already set.")
-        self.birthday = Birthday(birthday_str)
+        value = Birthday(birthday_str).value
+        self._birthday = value.toordinal()
+        self._changed("birthday", None, value)
 
     def add_email(self, email_str: str) -> None:
         """Додає email до контакту після перевірки."""
-        if self.email is not None:
+        if self._email is not None:
             raise ValueError("Email already set. Use edit-email to change it.")
-        self.email = Email(email_str)
+        self._email = Email(email_str).value
+        self._changed("email", None, email_str)
 
     def edit_email(self, new_email: str) -> None:
         """Редагує існуючий email."""
-        if self.email is None:
+        if self._email is None:
             raise ValueError("Email not set yet. Use add-email to add one.")
-        self.email.update_email(new_email)
+        old_email = self._email
+        self._email = Email(new_email).value
+        self._changed("email", old_email, new_email)
 
     def add_address(self, address_str: str) -> None:
         """Додає адресу до контакту."""
-        if self.address is not None:
+        if self._address is not None:
             raise ValueError("Address already set. Use change-address to change it.")
-        self.address = Address(address_str)
+        self._address = Address(address_str).value
+        self._changed("address", None, self._address)
 
     def edit_address(self, new_address: str) -> None:
         """Редагує існуючу адресу."""
-        if self.address is None:
+        if self._address is None:
             raise ValueError("Address not set yet. Use add-address to add one.")
-        self.address.update_address(new_address)
+        old_address = self._address
+        self._address = Address(new_address).value
+        self._changed("address", old_address, self._address)
+
+    def conflicts(self, other: "Record") -> list[tuple[str, str, str]]:
+        """Поля, заповнені в обох записах різними значеннями: (поле, тут, там)."""
+        found = []
+        for field in ("email", "birthday", "address"):
+            mine, theirs = self._text(field), other._text(field)
+            if mine is not None and theirs is not None and mine != theirs:
+                found.append((field, mine, theirs))
+        return found
+
+    def _text(self, field: str) -> str | None:
+        if field == "birthday":
+            birthday = self.birthday
+            return None if birthday is None else birthday.date_str
+        return getattr(self, "_" + field)
+
+    def merge(self, other: "Record") -> list[str]:
+        """Переносить з `other` телефони, яких у записі немає, а також email,
+        день народження й адресу, якщо в записі їх ще немає.
+
+        Якщо email, день народження чи адреса заповнені в обох записах по-різному,
+        нічого не змінює і кидає ValueError (див. conflicts). Повертає назви
+        перенесених полів.
+        """
+        conflicts = self.conflicts(other)
+        if conflicts:
+            fields = ", ".join(field for field, _, _ in conflicts)
+            raise ValueError(f"Contacts have different {fields}.")
+        taken = []
+        phones = [p for p in dict.fromkeys(other._phones) if p not in self._phones]
+        for phone in phones:
+            self.add_phone(phone)
+        if phones:
+            taken.append("phones")
+        if self._email is None and other._email is not None:
+            self.add_email(other._email)
+            taken.append("email")
+        birthday = other.birthday
+        if self._birthday is None and birthday is not None:
+            self.add_birthday(birthday.date_str)
+            taken.append("birthday")
+        if self._address is None and other._address is not None:
+            self.add_address(other._address)
+            taken.append("address")
+        return taken
+
+    def _changed(self, field: str, old, new) -> None:
+        """Скидає збережений текст запису і повідомляє книгу про зміну поля,
+        щоб вона оновила свої індекси."""
+        self._rendered = None
+        if self._book is not None:
+            self._book._on_field_change(self, field, old, new)
+
+    def apply_change(self, field: str, old, new) -> None:
+        """Повторює зміну поля, описану так само, як у _changed (для журналу)."""
+        if field == "phone":
+            if old is None:
+                self.add_phone(new)
+            elif new is None:
+                self.remove_phone(old)
+            else:
+                self.edit_phone(old, new)
+        elif field == "email":
+            if old is None:
+                self.add_email(new)
+            else:
+                self.edit_email(new)
+        elif field == "birthday":
+            self.add_birthday(new.strftime("%d.%m.%Y"))
+        elif field == "address":
+            if old is None:
+                self.add_address(new)
+            else:
+                self.edit_address(new)
+
+    def __getstate__(self) -> dict:
+        return {
+            "name": self._name,
+            "phones": self._phones,
+            "birthday": self._birthday,
+            "email": self._email,
+            "address": self._address,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        # Старі файли зберігали об'єкти полів (Name, Phone, Birthday, ...),
+        # а в найстаріших ще немає адреси
+        def raw(value):
+            return value.value if isinstance(value, Field) else value
+
+        self._name = raw(state["name"])
+        self._phones = tuple(raw(p) for p in state.get("phones", ()))
+        birthday = state.get("birthday")
+        if isinstance(birthday, Birthday):
+            birthday = birthday.value.toordinal()
+        self._birthday = birthday
+        self._email = raw(state.get("email"))
+        self._address = raw(state.get("address"))
+        self._book = None
+        self._rendered = None
 
     def __str__(self) -> str:
-        phones_str = "; ".join(p.phone_number for p in self.phones) or "No phones"
-        bday = self.birthday.date_str if self.birthday else "N/A"
-        email_str = self.email.value if self.email else "N/A"
-        address_str = (
-            getattr(self.address, "value", "N/A") if hasattr(self, "address") else "N/A"
+        if self._rendered is not None:
+            return self._rendered
+        phones_str = "; ".join(self._phones) or "No phones"
+        bday = (
+            date.fromordinal(self._birthday).strftime("%d.%m.%Y")
+            if self._birthday is not None
+            else "N/A"
         )
-        return (
-            f"Contact name: {self.name.value}, "
+        email_str = self._email if self._email is not None else "N/A"
+        address_str = self._address if self._address is not None else "N/A"
+        self._rendered = (
+            f"Contact name: {self._name}, "
             f"phones: {phones_str}, "
             f"birthday: {bday}, "
             f"email: {email_str}, "
             f"address: {address_str}"
         )
+        return self._rendered
+
+
+class AddressBook(Observable, UserDict):
+    """Клас для зберігання та управління колекцією записів.
+
+    Окрім основного словника ім'я -> запис підтримує вторинні індекси
+    (телефон, email, ім'я без урахування регістру, календарний день
+    народження), які оновлюються при кожній зміні записів і не потрапляють
+    у pickle.
+    """
+
+    # Атрибути, що перебудовуються після завантаження і не серіалізуються
+    _TRANSIENT = (
+        "_listeners",
+        "_changes",
+        "_saved_changes",
+        "_pending",
+        "_by_name",
+        "_by_phone",
+        "_by_email",
+        "_by_birthday",
+        "_birthday_days",
+        "_order",
+        "_seq",
+        "_by_name_sorted",
+        "_by_added",
+        "_fuzzy_keys",
+        "_fuzzy_postings",
+        "_columns",
+    )
+
+    # Порядки сортування для посторінкового виводу; перший — за замовчуванням
+    PAGE_ORDERS = ("added", "name")
+    # Умови "поле = значення", для яких є індекс (див. index_estimate і
+    # query.py); значення birthday — date, month — номер місяця
+    INDEXED_FIELDS = ("name", "phone", "email", "birthday", "month")
+    # Повний перегляд у query.py може відбирати записи по колонках (columns)
+    COLUMN_SCAN = True
 
+    def __init__(self, *args, **kwargs):
+        self._init_listeners()
+        self._init_indexes()
+        super().__init__(*args, **kwargs)
 
-class AddressBook(UserDict):
-    """Клас для зберігання та управління колекцією записів."""
+    def _init_indexes(self) -> None:
+        # значення -> ключ запису, а якщо записів кілька — множина ключів
+        # (окрема множина на кожне значення коштувала б сотні байтів на контакт)
+        self._by_name: dict[str, str | set[str]] = {}
+        self._by_phone: dict[str, str | set[str]] = {}
+        self._by_email: dict[str, str | set[str]] = {}
+        # (місяць, день) -> імена в порядку додавання; відсортований список
+        # непорожніх днів дозволяє знаходити вікно дат через bisect
+        self._by_birthday: dict[tuple[int, int], dict[str, None]] = {}
+        self._birthday_days: list[tuple[int, int]] = []
+        # Порядковий номер додавання — щоб результати пошуку йшли в порядку книги
+        self._order: dict[str, int] = {}
+        self._seq = 0
+        # Ключі, відсортовані за іменем і за порядком додавання, для сторінок;
+        # будуються при першому запиті сторінки, далі підтримуються при змінах
+        self._by_name_sorted: list[str] | None = None
+        self._by_added: list[str] | None = None
+        # Індекс нечіткого пошуку: значення полів -> ключі записів і
+        # триграма -> значення; будується при першому нечіткому пошуку
+        self._fuzzy_keys: dict[str, str | set[str]] | None = None
+        self._fuzzy_postings: dict[str, set[str]] = {}
+        # Колонкове представлення книги (див. columns) і лічильник змін, на
+        # момент якого воно побудоване
+        self._columns: tuple | None = None
+
+    def _rebuild_indexes(self) -> None:
+        self._init_indexes()
+        for key, record in self.data.items():
+            self._index_record(key, record)
+
+    @staticmethod
+    def _link(index: dict, value: str, key: str) -> None:
+        keys = index.get(value)
+        if keys is None:
+            index[value] = key
+        elif isinstance(keys, set):
+            keys.add(key)
+        elif keys != key:
+            index[value] = {keys, key}
+
+    @staticmethod
+    def _unlink(index: dict, value: str, key: str) -> None:
+        keys = index.get(value)
+        if keys is None:
+            return
+        if isinstance(keys, set):
+            keys.discard(key)
+            if len(keys) == 1:
+                index[value] = keys.pop()
+        elif keys == key:
+            del index[value]
+
+    @staticmethod
+    def _keys(index: dict, value: str) -> tuple | set:
+        keys = index.get(value)
+        if keys is None:
+            return ()
+        return keys if isinstance(keys, set) else (keys,)
+
+    def _link_birthday(self, value: date, key: str) -> None:
+        day = (value.month, value.day)
+        names = self._by_birthday.get(day)
+        if names is None:
+            names = self._by_birthday[day] = {}
+            insort(self._birthday_days, day)
+        names[key] = None
+
+    def _unlink_birthday(self, value: date, key: str) -> None:
+        day = (value.month, value.day)
+        names = self._by_birthday.get(day)
+        if names is not None:
+            names.pop(key, None)
+            if not names:
+                del self._by_birthday[day]
+                del self._birthday_days[bisect_left(self._birthday_days, day)]
+
+    def _index_record(self, key: str, record: Record) -> None:
+        record._book = self
+        if key not in self._order:
+            self._order[key] = self._seq
+            self._seq += 1
+            names, added = self._by_name_sorted, self._by_added
+            if names is not None and added is not None:
+                insort(names, key, key=name_sort_key)
+                added.append(key)
+        self._link(self._by_name, key.casefold(), key)
+        for phone in record._phones:
+            self._link(self._by_phone, phone, key)
+        if record._email is not None:
+            self._link(self._by_email, record._email.casefold(), key)
+        if record._birthday is not None:
+            self._link_birthday(date.fromordinal(record._birthday), key)
+        if self._fuzzy_keys is not None:
+            self._fuzzy_add(key, record)
+
+    def _unindex_record(self, key: str, record: Record) -> None:
+        self._unlink(self._by_name, key.casefold(), key)
+        for phone in record._phones:
+            self._unlink(self._by_phone, phone, key)
+        if record._email is not None:
+            self._unlink(self._by_email, record._email.casefold(), key)
+        if record._birthday is not None:
+            self._unlink_birthday(date.fromordinal(record._birthday), key)
+        if self._fuzzy_keys is not None:
+            self._fuzzy_remove(key, record)
+        if record._book is self:
+            record._book = None
+
+    @staticmethod
+    def _fuzzy_values(record: Record) -> set[str]:
+        """Значення полів запису, за якими працює нечіткий пошук."""
+        values = {record._name.casefold(), *record._phones}
+        if record._email is not None:
+            values.add(record._email.casefold())
+        if record._address is not None:
+            values.add(record._address.casefold())
+        return values
+
+    def _fuzzy_link(self, value: str, key: str) -> None:
+        keys = self._fuzzy_keys
+        if keys is None:
+            return
+        if value not in keys:
+            for gram in fuzzy_grams(value):
+                self._fuzzy_postings.setdefault(gram, set()).add(value)
+        self._link(keys, value, key)
+
+    def _fuzzy_unlink(self, value: str, key: str) -> None:
+        keys = self._fuzzy_keys
+        if keys is None:
+            return
+        self._unlink(keys, value, key)
+        if value in keys:
+            return
+        for gram in fuzzy_grams(value):
+            values = self._fuzzy_postings.get(gram)
+            if values is not None:
+                values.discard(value)
+                if not values:
+                    del self._fuzzy_postings[gram]
+
+    def _fuzzy_add(self, key: str, record: Record) -> None:
+        for value in self._fuzzy_values(record):
+            self._fuzzy_link(value, key)
+
+    def _fuzzy_remove(self, key: str, record: Record) -> None:
+        for value in self._fuzzy_values(record):
+            self._fuzzy_unlink(value, key)
+
+    def _fuzzy_field_change(self, record: Record, key: str, old) -> None:
+        """Оновлює індекс нечіткого пошуку після зміни телефону, email чи адреси."""
+        if self._fuzzy_keys is None:
+            return
+        values = self._fuzzy_values(record)
+        # старе значення може лишатися в іншому полі (той самий телефон двічі)
+        if old is not None and old.casefold() not in values:
+            self._fuzzy_unlink(old.casefold(), key)
+        for value in values:
+            self._fuzzy_link(value, key)
+
+    def _on_field_change(self, record: Record, field: str, old, new) -> None:
+        """Оновлює індекси після зміни поля запису (викликається з Record)."""
+        key = record._name
+        if self.data.get(key) is not record:
+            return
+        if field == "phone":
+            # Той самий номер може бути записаний двічі — прибираємо з індексу
+            # лише коли в записі не лишилося жодного такого номера
+            if old is not None and old not in record._phones:
+                self._unlink(self._by_phone, old, key)
+            if new is not None:
+                self._link(self._by_phone, new, key)
+        elif field == "email":
+            if old is not None:
+                self._unlink(self._by_email, old.casefold(), key)
+            if new is not None:
+                self._link(self._by_email, new.casefold(), key)
+        elif field == "birthday":
+            if old is not None:
+                self._unlink_birthday(old, key)
+            if new is not None:
+                self._link_birthday(new, key)
+        if field != "birthday":
+            self._fuzzy_field_change(record, key, old)
+        self._notify("field", key, field, old, new)
+
+    def __setitem__(self, key: str, record: Record) -> None:
+        old = self.data.get(key)
+        if old is not None:
+            self._unindex_record(key, old)
+        self.data[key] = record
+        self._index_record(key, record)
+        self._notify("put", key, record)
+
+    def __delitem__(self, key: str) -> None:
+        record = self.data.pop(key)
+        self._unindex_record(key, record)
+        names, added = self._by_name_sorted, self._by_added
+        if names is not None and added is not None:
+            del names[bisect_left(names, name_sort_key(key), key=name_sort_key)]
+            seq = self._order.__getitem__
+            del added[bisect_left(added, self._order[key], key=seq)]
+        del self._order[key]
+        self._notify("delete", key)
+
+    def __getstate__(self) -> dict:
+        return {k: v for k, v in self.__dict__.items() if k not in self._TRANSIENT}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._init_listeners()
+        self._rebuild_indexes()
+
+    def apply_change(self, change: tuple) -> None:
+        """Застосовує зміну у форматі, який отримують підписники (див. Observable)."""
+        kind, key, *rest = change
+        if kind == "put":
+            self[key] = rest[0]
+        elif kind == "delete":
+            self.delete(key)
+        elif kind == "field":
+            self.data[key].apply_change(*rest)
+        elif kind == "batch":
+            self._apply_batch(key)
+
+    def batch(self) -> "ContactBatch":
+        """Пакет змін контактів, що застосовується весь або не застосовується (див. Batch)."""
+        return ContactBatch(self)
+
+    def _commit_batch(self, staged: dict) -> None:
+        if self._by_name_sorted is not None and len(staged) > BATCH_RESORT:
+            self._by_name_sorted = self._by_added = None
+        super()._commit_batch(staged)
 
     def add_record(self, record: Record) -> None:
-        self.data[record.name.value] = record
+        self[record._name] = record
 
     def find(self, name: str) -> Record | None:
         """Знаходить запис за ім'ям."""
@@ -195,29 +1050,328 @@ class AddressBook(UserDict):
     def delete(self, name: str) -> None:
         """Видаляє запис за ім'ям."""
         if name in self.data:
-            del self.data[name]
+            del self[name]
+
+    def _records(self, keys) -> list[Record]:
+        """Повертає записи за ключами у порядку їх додавання до книги."""
+        return [self.data[k] for k in sorted(keys, key=self._order.__getitem__)]
+
+    def find_by_name(self, name: str) -> list[Record]:
+        """Знаходить записи за ім'ям без урахування регістру."""
+        return self._records(self._keys(self._by_name, name.casefold()))
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        """Знаходить записи, що містять вказаний номер телефону."""
+        return self._records(self._keys(self._by_phone, phone))
+
+    def find_by_email(self, email: str) -> list[Record]:
+        """Знаходить записи за email без урахування регістру."""
+        return self._records(self._keys(self._by_email, email.casefold()))
+
+    def lookup(self, query: str) -> list[Record]:
+        """Шукає записи, у яких ім'я, email або один з телефонів збігається із запитом."""
+        key = query.casefold()
+        keys = set(self._keys(self._by_name, key))
+        keys.update(self._keys(self._by_email, key))
+        keys.update(self._keys(self._by_phone, key))
+        return self._records(keys)
+
+    def _index_keys(self, field: str, value):
+        if field == "name":
+            return self._keys(self._by_name, value.casefold())
+        if field == "phone":
+            return self._keys(self._by_phone, value)
+        if field == "email":
+            return self._keys(self._by_email, value.casefold())
+        if field == "birthday":
+            days = [(value.month, value.day)]
+        else:
+            days = [(value, day) for day in range(1, 32)]
+        return [key for day in days for key in self._by_birthday.get(day, ())]
+
+    def index_estimate(self, field: str, value) -> int:
+        """Скільки записів-кандидатів дає індекс для умови `field` = `value`
+        (поле з INDEXED_FIELDS)."""
+        return len(self._index_keys(field, value))
+
+    def index_records(self, field: str, value):
+        """Записи-кандидати для умови `field` = `value` у порядку додавання.
+
+        Кандидати можуть не відповідати умові повністю (індекс днів народження
+        не враховує рік), тож їх треба перевірити.
+        """
+        for key in sorted(self._index_keys(field, value), key=self._order.__getitem__):
+            yield self.data[key]
+
+    def columns(self, build: bool = True) -> "ContactColumns | None":
+        """Колонкове представлення книги для пакетних фільтрів (columnar.py).
+
+        Будується при першому зверненні і перебудовується, лише якщо книга
+        з того часу змінилася. Без `build` — лише готові колонки, що
+        відповідають книзі, або None: книга, прочитана з колонкового файлу
+        чи щойно в нього записана, має їх без перебудови (див. keep_columns).
+        """
+        cached = self._columns
+        if cached is not None and cached[0] == self.changes:
+            return cached[1]
+        if not build:
+            return None
+        from .columnar import ContactColumns
+
+        columns = ContactColumns.from_records(self.data.values())
+        self._columns = (self.changes, columns)
+        return columns
+
+    def keep_columns(self, columns: "ContactColumns") -> None:
+        """Запам'ятовує колонки, що відповідають поточному стану книги."""
+        self._columns = (self.changes, columns)
+
+    def _ensure_sorted(self) -> tuple[list[str], list[str]]:
+        """Відсортовані списки ключів (за іменем і за додаванням); будуються
+        при першому зверненні до них."""
+        names, added = self._by_name_sorted, self._by_added
+        if names is None or added is None:
+            names = self._by_name_sorted = sorted(self.data, key=name_sort_key)
+            # _order заповнюється в порядку додавання
+            added = self._by_added = list(self._order)
+        return names, added
+
+    def names_with_prefix(self, prefix: str, limit: int) -> list[str]:
+        """До `limit` імен, що починаються з `prefix` (без урахування регістру)."""
+        names, _ = self._ensure_sorted()
+        return with_prefix(names, prefix.casefold(), limit, str.casefold)
+
+    def _page_keys(
+        self, order: str, cursor: str | None, limit: int
+    ) -> tuple[list[str], str | None]:
+        """Ключі сторінки та курсор наступної сторінки (None — сторінка остання)."""
+        names, added = self._ensure_sorted()
+        if order == "name":
+            name_after = None if cursor is None else name_sort_key(cursor)
+            keys, more = page_slice(names, name_after, limit, name_sort_key)
+            return keys, keys[-1] if more else None
+        after = None if cursor is None else cursor_number(cursor)
+        keys, more = page_slice(added, after, limit, self._order.__getitem__)
+        return keys, str(self._order[keys[-1]]) if more else None
+
+    def page(
+        self, order: str = "added", cursor: str | None = None, limit: int = PAGE_SIZE
+    ) -> tuple[list[Record], str | None]:
+        """Сторінка записів у порядку `order` ("added" або "name") після курсора.
+
+        Курсор — рядок, повернутий попередньою сторінкою; він лишається
+        дійсним, навіть якщо між запитами записи додавались чи видалялись.
+        Повертає записи сторінки і курсор наступної (None, якщо далі нічого).
+        """
+        if order not in self.PAGE_ORDERS:
+            raise ValueError(
+                f"Sort order must be one of: {', '.join(self.PAGE_ORDERS)}."
+            )
+        keys, next_cursor = self._page_keys(order, cursor, limit)
+        return [self.data[key] for key in keys], next_cursor
+
+    def _similar_values(
+        self, grams: set[str], ranked: list[str], min_shared: int
+    ) -> dict[str, float]:
+        """Значення, що мають щонайменше `min_shared` спільних з запитом триграм.
+
+        Префіксний фільтр: таке значення обов'язково містить одну з
+        `len(ranked) - min_shared + 1` найрідкісніших триграм запиту, тож
+        кандидати збираються лише з їхніх списків, а довгі списки частих
+        триграм тільки перетинаються з множиною кандидатів.
+        Повертає значення -> коефіцієнт Жаккара.
+        """
+        postings = self._fuzzy_postings
+        prefix = len(ranked) - min_shared + 1
+        shared: Counter[str] = Counter()
+        budget = FUZZY_CANDIDATES
+        for used, gram in enumerate(ranked[:prefix], start=1):
+            values = postings.get(gram, ())
+            shared.update(values)
+            budget -= len(values)
+            if budget <= 0:
+                break
+        candidates = set(shared)
+        for gram in ranked[used:]:
+            posting = postings.get(gram)
+            if posting:
+                # перетин множин перебирає меншу з них
+                shared.update(candidates & posting)
+        size = len(grams)
+        return {
+            value: count / (size + len(fuzzy_grams(value)) - count)
+            for value, count in shared.items()
+            if count >= min_shared
+        }
+
+    def _top_similar(
+        self, fuzzy_keys: dict, scores: dict[str, float], limit: int
+    ) -> list:
+        """Найкращі `limit` пар (ключ, схожість); рівні — в порядку імен."""
+        best: dict[str, float] = {}
+        cutoff = None
+        for value, score in sorted(scores.items(), key=itemgetter(1), reverse=True):
+            # значення йдуть від найсхожіших, тож перша оцінка ключа — найкраща
+            if cutoff is not None and score < cutoff:
+                break
+            for key in self._keys(fuzzy_keys, value):
+                best.setdefault(key, score)
+            if cutoff is None and len(best) >= limit:
+                cutoff = score
+        # обмежена купа: O(n log k) замість сортування всіх кандидатів
+        return heapq.nsmallest(
+            limit, best.items(), key=lambda item: (-item[1], name_sort_key(item[0]))
+        )
+
+    def find_similar(
+        self, query: str, limit: int = FUZZY_LIMIT
+    ) -> list[tuple[Record, float]]:
+        """Нечіткий пошук: до `limit` записів, найсхожіших на запит.
+
+        Схожість — коефіцієнт Жаккара триграм запиту та імені, телефону,
+        email чи адреси; для запису береться найкраще з полів. Враховуються
+        значення, що містять щонайменше `FUZZY_MIN_SHARE` триграм запиту.
+        Пошук іде з високим порогом спільних триграм, який знижується, лише
+        якщо серед знайденого ще можуть бути пропущені кращі записи: значення
+        зі схожістю t мають щонайменше t * len(grams) спільних триграм, тож
+        високий поріг відсікає майже всіх кандидатів. Кандидати збираються не
+        більше ніж з `FUZZY_CANDIDATES` входжень у списки триграм, тож для
+        запитів із самих поширених триграм результат наближений.
+        Індекс будується при першому виклику і далі оновлюється разом з книгою.
+        Повертає пари (запис, схожість від 0 до 1), найкращі першими.
+        """
+        fuzzy_keys = self._fuzzy_keys
+        if fuzzy_keys is None:
+            fuzzy_keys = self._fuzzy_keys = {}
+            self._fuzzy_postings = {}
+            for key, record in self.data.items():
+                self._fuzzy_add(key, record)
+        grams = fuzzy_grams(query.strip().casefold())
+        postings = self._fuzzy_postings
+        ranked = sorted(grams, key=lambda gram: len(postings.get(gram, ())))
+        size = len(grams)
+        floor = max(1, math.ceil(size * FUZZY_MIN_SHARE))
+        min_shared = max(floor, math.ceil(size * FUZZY_START_SHARE))
+        while True:
+            top = self._top_similar(
+                fuzzy_keys, self._similar_values(grams, ranked, min_shared), limit
+            )
+            # знайдено всі значення зі схожістю понад (min_shared - 1) / size
+            if min_shared <= floor or (
+                len(top) == limit and top[-1][1] > (min_shared - 1) / size
+            ):
+                break
+            if len(top) == limit:
+                # на наступному кроці знайдуться всі не гірші за поточний k-й
+                lower = math.ceil(top[-1][1] * size)
+            else:
+                lower = min_shared - max(1, round(size * FUZZY_SHARE_STEP))
+            min_shared = max(floor, min(min_shared - 1, lower))
+        return [(self.data[key], score) for key, score in top]
+
+    @staticmethod
+    def _birthday_in_year(month: int, day: int, year: int) -> date:
+        """Дата дня народження у вказаному році.
+
+        Народжені 29 лютого у невисокосні роки святкують 28 лютого.
+        """
+        if month == 2 and day == 29 and not isleap(year):
+            day = 28
+        return date(year, month, day)
+
+    def _iter_birthdays(self, start: tuple[int, int], before: bool):
+        """Пари ((місяць, день), імена) у календарному порядку.
+
+        Без `before` — від дня `start` включно до кінця року, з `before` —
+        з початку року до дня `start` (не включно).
+        """
+        calendar_days = self._birthday_days
+        pos = bisect_left(calendar_days, start)
+        for day in calendar_days[:pos] if before else calendar_days[pos:]:
+            yield day, self._by_birthday[day]
 
     def get_upcoming_birthdays(self, days) -> list[str]:
-        """Повертає список вітальних повідомлень на наступний тиждень."""
+        """Повертає список вітальних повідомлень на наступні `days` днів.
+
+        Дні народження перебираються в календарному порядку, починаючи з
+        сьогоднішнього дня, тож вартість залежить лише від кількості знайдених
+        контактів, а не від розміру книги.
+        """
         today = datetime.now().date()
         next_week = today + timedelta(days=days)
-        greetings = []
-        for rec in self.data.values():
-            if rec.birthday:
-                # оновити рік на поточний
-                bday_this_year = rec.birthday.value.replace(year=today.year)
-                # якщо вже пройшов у цьому році – брати наступний рік
-                if bday_this_year < today:
-                    bday_this_year = bday_this_year.replace(year=today.year + 1)
-                if today <= bday_this_year <= next_week:
-                    # якщо день народження припадає на вихідні –
-                    # переносимо на наступний понеділок
-                    congr_date = bday_this_year
-                    if congr_date.weekday() >= 5:  # 5 = субота, 6 = неділя
-                        congr_date = congr_date + timedelta(
-                            days=(7 - congr_date.weekday())
-                        )
-                    greetings.append(
-                        f"{congr_date.strftime('%Y-%m-%d')}: {rec.name.value}"
+        greetings: list[str] = []
+        start = (today.month, today.day)
+        # спочатку дні, що ще попереду в цьому році, потім – з початку наступного
+        for year, before in ((today.year, False), (today.year + 1, True)):
+            for (month, day), names in self._iter_birthdays(start, before):
+                bday = self._birthday_in_year(month, day, year)
+                if bday > next_week:
+                    return greetings
+                # якщо день народження припадає на вихідні –
+                # переносимо на наступний понеділок
+                congr_date = bday
+                if congr_date.weekday() >= 5:  # 5 = субота, 6 = неділя
+                    congr_date = congr_date + timedelta(
+                        days=(7 - congr_date.weekday())
                     )
+                congr_str = congr_date.strftime("%Y-%m-%d")
+                for name in names:
+                    greetings.append(f"{congr_str}: {name}")
         return greetings
+
+
+class ContactBatch(Batch):
+    """Пакет змін AddressBook: ті самі операції, що й команди контактів.
+
+    find і add_record працюють як у книги, тож функції, що приймають
+    книгу (наприклад, importer.merge_contact), можуть працювати з пакетом;
+    їхні помилки не збираються, а кидаються одразу.
+    """
+
+    ITEM = "Contact"
+
+    def _record(self, name: str, create: bool = False) -> Record:
+        try:
+            return self._item(name)
+        except KeyError:
+            if not create:
+                raise
+        record = self.staged[name] = Record(name)
+        return record
+
+    def find(self, name: str) -> Record | None:
+        try:
+            return self._item(name)
+        except KeyError:
+            return None
+
+    def add_record(self, record: Record) -> None:
+        self.staged[record._name] = record
+
+    def _add_contact(self, name: str, phones) -> None:
+        record = self._record(name, create=True)
+        for phone in phones:
+            record.add_phone(phone)
+
+    def add_contact(self, name: str, *phones: str) -> None:
+        """Додає контакт або нові телефони наявному."""
+        self._run(self._add_contact, name, phones)
+
+    def add_phone(self, name: str, phone: str) -> None:
+        self._run(lambda: self._record(name).add_phone(phone))
+
+    def add_birthday(self, name: str, birthday: str) -> None:
+        self._run(lambda: self._record(name).add_birthday(birthday))
+
+    def add_email(self, name: str, email: str) -> None:
+        self._run(lambda: self._record(name).add_email(email))
+
+    def add_address(self, name: str, address: str) -> None:
+        self._run(lambda: self._record(name).add_address(address))
+
+    def _delete(self, name: str) -> None:
+        self._record(name)
+        self.staged[name] = None
+
+    def delete(self, name: str) -> None:
+        self._run(self._delete, name)
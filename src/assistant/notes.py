@@ -1,30 +1,88 @@
+from bisect import bisect_left, insort
 from collections import UserDict
+import sys
+
+from .models import (
+    BATCH_RESORT,
+    PAGE_SIZE,
+    Batch,
+    Observable,
+    cursor_number,
+    page_slice,
+    with_prefix,
+)
+
+
+def normalize_tag(tag: str) -> str:
+    """Приводить тег до канонічного вигляду (без '#', у нижньому регістрі).
+
+    Рядок інтернується, тож однакові теги різних нотаток займають пам'ять один раз.
+    """
+    return sys.intern(tag.strip("#").lower())
 
 
 class Note:
     """
     Клас однієї нотатки.
-    Зберігає текст і список тегів (опціонально).
+    Зберігає текст і впорядковану множину тегів (опціонально).
     """
 
+    # Книга, до якої належить нотатка, та її ID; встановлюються NotesBook
+    # і не серіалізуються
+    _book: "NotesBook | None" = None
+    _note_id: int | None = None
+    # Текст для виводу; будується при першому str() і скидається зі змінами
+    _rendered = None
+
     def __init__(self, text: str, tags=None):
         self.text = text.strip()
-        self.tags = []
+        # dict як впорядкована множина: O(1) перевірка і порядок додавання
+        self.tags: dict[str, None] = {}
         if tags:
             for tag in tags:
                 self.add_tag(tag)
 
     def add_tag(self, tag: str):
         """Додає тег до нотатки."""
-        tag = tag.strip("#").lower()
+        tag = normalize_tag(tag)
         if tag not in self.tags:
-            self.tags.append(tag)
+            # новий словник, а не зміна старого: копія книги для фонового
+            # збереження може серіалізувати його саме зараз
+            self.tags = {**self.tags, tag: None}
+            self._changed("tag", None, tag)
 
     def remove_tag(self, tag: str):
         """Видаляє тег з нотатки."""
         tag = tag.strip("#").lower()
         if tag in self.tags:
-            self.tags.remove(tag)
+            self.tags = {t: None for t in self.tags if t != tag}
+            self._changed("tag", tag, None)
+
+    def copy(self) -> "Note":
+        """Копія нотатки, не прив'язана до книги."""
+        note = Note.__new__(Note)
+        note.__dict__.update(self.__getstate__())
+        note.tags = dict(self.tags)
+        return note
+
+    def _changed(self, field: str, old, new) -> None:
+        """Скидає збережений текст нотатки і повідомляє книгу про зміну поля,
+        щоб вона оновила свої індекси."""
+        self._rendered = None
+        if self._book is not None:
+            self._book._on_field_change(self, field, old, new)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop("_book", None)
+        state.pop("_note_id", None)
+        state.pop("_rendered", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        # у старих файлах теги зберігались списком
+        self.tags = dict.fromkeys(normalize_tag(t) for t in self.tags)
 
     def match(self, keyword: str) -> bool:
         """Перевіряє, чи відповідає нотатка пошуку по тегу або ключовому слову."""
@@ -38,28 +96,224 @@ class Note:
     def match_tag(self, tag: str) -> bool:
         """Перевіряє, чи має нотатка певний тег."""
         tag = tag.strip("#").lower()
-        return tag in [t.lower() for t in self.tags]
+        return tag in self.tags
 
     def __str__(self):
-        tags_str = ", ".join(f"#{t}" for t in self.tags) if self.tags else "—"
-        return f"{self.text} | Tags: {tags_str}"
+        if self._rendered is None:
+            tags_str = ", ".join(f"#{t}" for t in self.tags) if self.tags else "—"
+            self._rendered = f"{self.text} | Tags: {tags_str}"
+        return self._rendered
+
+
+TRIGRAM = 3
 
 
-class NotesBook(UserDict):
+def trigrams(text: str) -> set[str]:
+    """Повертає множину всіх підрядків довжини 3 з тексту."""
+    return {text[i : i + TRIGRAM] for i in range(len(text) - TRIGRAM + 1)}
+
+
+class NotesBook(Observable, UserDict):
     """
     Клас для зберігання та управління нотатками.
+
+    Підтримує триграмний індекс по тексту нотаток у нижньому регістрі:
+    пошук спершу звужує кандидатів за триграмами запиту, а потім перевіряє
+    входження підрядка лише для них. Також веде інвертований індекс
+    тег -> ID нотаток і відсортований список тегів. Індекси не серіалізуються
+    і перебудовуються після завантаження.
     """
 
+    # Атрибути, що перебудовуються після завантаження і не серіалізуються
+    _TRANSIENT = (
+        "_listeners",
+        "_changes",
+        "_saved_changes",
+        "_pending",
+        "_lowered",
+        "_postings",
+        "_by_tag",
+        "_tag_names",
+        "_order",
+        "_seq",
+        "_by_id",
+        "_by_added",
+        "_last_id",
+    )
+
+    # Порядки сортування для посторінкового виводу; перший — за замовчуванням
+    PAGE_ORDERS = ("added", "id")
+
+    def __init__(self, *args, **kwargs):
+        self._init_listeners()
+        self._init_indexes()
+        super().__init__(*args, **kwargs)
+
+    def _init_indexes(self) -> None:
+        # ID -> текст нотатки у нижньому регістрі
+        self._lowered: dict[int, str] = {}
+        # триграма -> ID нотаток, текст яких її містить
+        self._postings: dict[str, set[int]] = {}
+        # тег -> ID нотаток з цим тегом; відсортований список наявних тегів
+        self._by_tag: dict[str, set[int]] = {}
+        self._tag_names: list[str] = []
+        # Порядковий номер додавання — щоб результати йшли в порядку книги
+        self._order: dict[int, int] = {}
+        self._seq = 0
+        # ID, відсортовані за значенням і за порядком додавання, для сторінок;
+        # будуються при першому запиті сторінки, далі підтримуються при змінах
+        self._by_id: list[int] | None = None
+        self._by_added: list[int] | None = None
+        # Найбільший ID нотатки; None — невідомий, обчислюється при потребі
+        self._last_id: int | None = None
+
+    def _rebuild_indexes(self) -> None:
+        self._init_indexes()
+        for note_id, note in self.data.items():
+            self._index_note(note_id, note)
+
+    def _index_note(self, note_id: int, note: Note) -> None:
+        note._book = self
+        note._note_id = note_id
+        if note_id not in self._order:
+            self._order[note_id] = self._seq
+            self._seq += 1
+            ids, added = self._by_id, self._by_added
+            if ids is not None and added is not None:
+                insort(ids, note_id)
+                added.append(note_id)
+        if self._last_id is not None and note_id > self._last_id:
+            self._last_id = note_id
+        self._index_text(note_id, note.text)
+        for tag in note.tags:
+            self._link_tag(tag, note_id)
+
+    def _unindex_note(self, note_id: int, note: Note) -> None:
+        self._unindex_text(note_id)
+        for tag in note.tags:
+            self._unlink_tag(tag, note_id)
+        if note._book is self:
+            note._book = None
+            note._note_id = None
+
+    def _index_text(self, note_id: int, text: str) -> None:
+        lowered = text.lower()
+        self._lowered[note_id] = lowered
+        for gram in trigrams(lowered):
+            self._postings.setdefault(gram, set()).add(note_id)
+
+    def _unindex_text(self, note_id: int) -> None:
+        lowered = self._lowered.pop(note_id, "")
+        for gram in trigrams(lowered):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(note_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def _link_tag(self, tag: str, note_id: int) -> None:
+        ids = self._by_tag.get(tag)
+        if ids is None:
+            ids = self._by_tag[tag] = set()
+            insort(self._tag_names, tag)
+        ids.add(note_id)
+
+    def _unlink_tag(self, tag: str, note_id: int) -> None:
+        ids = self._by_tag.get(tag)
+        if ids is not None:
+            ids.discard(note_id)
+            if not ids:
+                del self._by_tag[tag]
+                del self._tag_names[bisect_left(self._tag_names, tag)]
+
+    def _on_field_change(self, note: Note, field: str, old, new) -> None:
+        """Оновлює індекси після зміни нотатки (викликається з Note)."""
+        note_id = note._note_id
+        if note_id is None or self.data.get(note_id) is not note:
+            return
+        if field == "tag":
+            if old is not None:
+                self._unlink_tag(old, note_id)
+            if new is not None:
+                self._link_tag(new, note_id)
+        self._notify("field", note_id, field, old, new)
+
+    def __setitem__(self, note_id: int, note: Note) -> None:
+        old = self.data.get(note_id)
+        if old is not None:
+            self._unindex_note(note_id, old)
+        self.data[note_id] = note
+        self._index_note(note_id, note)
+        self._notify("put", note_id, note)
+
+    def __delitem__(self, note_id: int) -> None:
+        note = self.data.pop(note_id)
+        self._unindex_note(note_id, note)
+        ids, added = self._by_id, self._by_added
+        if ids is not None and added is not None:
+            del ids[bisect_left(ids, note_id)]
+            seq = self._order.__getitem__
+            del added[bisect_left(added, self._order[note_id], key=seq)]
+        del self._order[note_id]
+        if note_id == self._last_id:
+            self._last_id = None
+        self._notify("delete", note_id)
+
+    def __getstate__(self) -> dict:
+        return {k: v for k, v in self.__dict__.items() if k not in self._TRANSIENT}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._init_listeners()
+        self._rebuild_indexes()
+
+    def apply_change(self, change: tuple) -> None:
+        """Застосовує зміну у форматі, який отримують підписники (див. Observable)."""
+        kind, note_id, *rest = change
+        if kind == "put":
+            self[note_id] = rest[0]
+        elif kind == "delete":
+            self.delete_note(note_id)
+        elif kind == "field":
+            field, old, new = rest
+            if field == "text":
+                self.edit_note(note_id, new)
+            elif old is None:
+                self.data[note_id].add_tag(new)
+            else:
+                self.data[note_id].remove_tag(old)
+        elif kind == "batch":
+            self._apply_batch(note_id)
+
+    def batch(self) -> "NoteBatch":
+        """Пакет змін нотаток, що застосовується весь або не застосовується (див. Batch)."""
+        return NoteBatch(self)
+
+    def _commit_batch(self, staged: dict) -> None:
+        if self._by_id is not None and len(staged) > BATCH_RESORT:
+            self._by_id = self._by_added = None
+        super()._commit_batch(staged)
+
+    def next_id(self) -> int:
+        """ID для нової нотатки: на одиницю більший за найбільший наявний.
+
+        Кількість нотаток для цього не годиться: після видалення вона
+        повторює ID, що вже зайнятий.
+        """
+        if self._last_id is None:
+            self._last_id = max(self.data, default=0)
+        return self._last_id + 1
+
     def add_note(self, text: str, tags=None):
         """Додає нову нотатку."""
-        note_id = len(self.data) + 1
-        self.data[note_id] = Note(text, tags)
+        note_id = self.next_id()
+        self[note_id] = Note(text, tags)
         return f"Note added (ID: {note_id})."
 
     def delete_note(self, note_id: int):
         """Видаляє нотатку за ID."""
         if note_id in self.data:
-            del self.data[note_id]
+            del self[note_id]
             return "Note deleted."
         return "Note not found."
 
@@ -70,19 +324,123 @@ class NotesBook(UserDict):
     def edit_note(self, note_id: int, new_text: str):
         """Редагує текст нотатки."""
         if note_id in self.data:
-            self.data[note_id].text = new_text
+            note = self.data[note_id]
+            old_text = note.text
+            self._unindex_text(note_id)
+            note.text = new_text
+            note._rendered = None
+            self._index_text(note_id, new_text)
+            self._notify("field", note_id, "text", old_text, new_text)
             return "Note updated."
         return "Note not found."
 
+    def _text_candidates(self, keyword: str):
+        """ID нотаток, що можуть містити keyword (вже у нижньому регістрі)."""
+        if len(keyword) < TRIGRAM:
+            # Занадто короткий запит — триграм немає, перевіряємо всі нотатки
+            return self._lowered.keys()
+        postings = []
+        for gram in trigrams(keyword):
+            ids = self._postings.get(gram)
+            if not ids:
+                return ()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                break
+        return candidates
+
     def find_notes(self, keyword: str):
         """Пошук нотаток за тегом або словом."""
-        results = [
-            f"{note_id}: {note}"
-            for note_id, note in self.data.items()
-            if note.match(keyword)
-        ]
+        keyword = keyword.lower()
+        lowered = self._lowered
+        matched = {
+            note_id
+            for note_id in self._text_candidates(keyword)
+            if keyword in lowered[note_id]
+        }
+        matched.update(self._by_tag.get(keyword.strip("#"), ()))
+        results = self._render(matched)
         return "\n".join(results) if results else "No matches found."
 
+    def _render(self, note_ids) -> list[str]:
+        """Рядки виводу для нотаток у порядку їх додавання до книги."""
+        return [
+            f"{note_id}: {self.data[note_id]}"
+            for note_id in sorted(note_ids, key=self._order.__getitem__)
+        ]
+
+    def iter_notes(self, tag: str | None = None):
+        """Пари (ID, нотатка) у порядку додавання; з `tag` — лише нотатки з цим тегом."""
+        if tag is None:
+            yield from self.data.items()
+            return
+        note_ids = self._by_tag.get(tag.strip("#").lower(), ())
+        for note_id in sorted(note_ids, key=self._order.__getitem__):
+            yield note_id, self.data[note_id]
+
+    def _ensure_sorted(self) -> tuple[list[int], list[int]]:
+        """Відсортовані списки ID (за зростанням і за додаванням); будуються
+        при першому зверненні до них."""
+        ids, added = self._by_id, self._by_added
+        if ids is None or added is None:
+            ids = self._by_id = sorted(self.data)
+            # _order заповнюється в порядку додавання
+            added = self._by_added = list(self._order)
+        return ids, added
+
+    def tags_with_prefix(self, prefix: str, limit: int) -> list[str]:
+        """До `limit` наявних тегів, що починаються з `prefix`, за абеткою."""
+        return with_prefix(self._tag_names, normalize_tag(prefix), limit)
+
+    def ids_with_prefix(self, prefix: str, limit: int) -> list[int]:
+        """До `limit` ID нотаток, десятковий запис яких починається з `prefix`.
+
+        ID з префіксом p лежать у діапазонах [p * 10^k, (p + 1) * 10^k),
+        тож кожен діапазон знаходиться бінарним пошуком у відсортованих ID.
+        """
+        ids, _ = self._ensure_sorted()
+        if not prefix:
+            return ids[:limit]
+        if not prefix.isdigit() or prefix[0] == "0" or not ids:
+            return []
+        found: list[int] = []
+        low, high = int(prefix), int(prefix) + 1
+        while low <= ids[-1] and len(found) < limit:
+            start = bisect_left(ids, low)
+            found.extend(ids[start : min(bisect_left(ids, high), start + limit)])
+            low, high = low * 10, high * 10
+        # діапазони не перетинаються і йдуть за зростанням
+        return found[:limit]
+
+    def page(
+        self, order: str = "added", cursor: str | None = None, limit: int = PAGE_SIZE
+    ) -> tuple[list[str], str | None]:
+        """Рядки виводу сторінки нотаток у порядку `order` ("added" або "id").
+
+        Курсор — рядок, повернутий попередньою сторінкою. Рендеряться лише
+        нотатки сторінки. Повертає рядки і курсор наступної сторінки
+        (None, якщо далі нічого).
+        """
+        if order not in self.PAGE_ORDERS:
+            raise ValueError(
+                f"Sort order must be one of: {', '.join(self.PAGE_ORDERS)}."
+            )
+        ids, added = self._ensure_sorted()
+        after = None if cursor is None else cursor_number(cursor)
+        if order == "id":
+            note_ids, more = page_slice(ids, after, limit, None)
+            last = note_ids[-1] if more else None
+        else:
+            seq = self._order.__getitem__
+            note_ids, more = page_slice(added, after, limit, seq)
+            last = seq(note_ids[-1]) if more else None
+        lines = [f"{note_id}: {self.data[note_id]}" for note_id in note_ids]
+        return lines, None if last is None else str(last)
+
     def show_all(self):
         """Показує всі нотатки."""
         if not self.data:
@@ -92,27 +450,62 @@ class NotesBook(UserDict):
     def get_notes_by_tag(self, tag: str):
         """Повертає всі нотатки, які містять вказаний тег."""
         tag = tag.strip("#").lower()
-        results = [
-            f"{note_id}: {note}"
-            for note_id, note in self.data.items()
-            if tag in note.tags
-        ]
+        results = self._render(self._by_tag.get(tag, ()))
         return "\n".join(results) if results else "No notes with this tag."
 
     def sort_by_tags(self):
         """Повертає всі нотатки, згруповані за тегами."""
-        tag_map = {}
-
-        for note_id, note in self.data.items():
-            for tag in note.tags:
-                tag_map.setdefault(tag, []).append(f"{note_id}: {note}")
-
-        if not tag_map:
+        if not self._tag_names:
             return "No tags found."
 
         result = []
-        for tag in sorted(tag_map.keys()):
+        for tag in self._tag_names:
             result.append(f"\n#{tag}:")
-            result.extend(tag_map[tag])
+            result.extend(self._render(self._by_tag[tag]))
 
         return "\n".join(result)
+
+
+class NoteBatch(Batch):
+    """Пакет змін NotesBook: ті самі операції, що й команди нотаток.
+
+    ID нових нотаток призначаються так само, як у NotesBook.add_note, і
+    більші за ID усіх нотаток, доданих раніше в пакеті (навіть видалених).
+    """
+
+    ITEM = "Note"
+
+    def __init__(self, book: NotesBook):
+        super().__init__(book)
+        self._next_id = book.next_id()
+
+    def _add_note(self, text: str, tags) -> int:
+        note_id = self._next_id
+        self.staged[note_id] = Note(text, tags)
+        self._next_id += 1
+        return note_id
+
+    def add_note(self, text: str, tags=None) -> int | None:
+        """Додає нотатку; повертає її майбутній ID."""
+        return self._run(self._add_note, text, tags)
+
+    def _edit_note(self, note_id: int, text: str) -> None:
+        note = self._item(note_id)
+        note.text = text
+        note._rendered = None
+
+    def edit_note(self, note_id: int, text: str) -> None:
+        self._run(self._edit_note, note_id, text)
+
+    def add_tag(self, note_id: int, tag: str) -> None:
+        self._run(lambda: self._item(note_id).add_tag(tag))
+
+    def remove_tag(self, note_id: int, tag: str) -> None:
+        self._run(lambda: self._item(note_id).remove_tag(tag))
+
+    def _delete_note(self, note_id: int) -> None:
+        self._item(note_id)
+        self.staged[note_id] = None
+
+    def delete_note(self, note_id: int) -> None:
+        self._run(self._delete_note, note_id)
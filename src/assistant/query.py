@@ -0,0 +1,313 @@
+"""Мова запитів find-contact і планувальник, що обирає найкращий індекс.
+
+Запит — умови, з'єднані словом "and", і необов'язкове "limit N" в кінці:
+
+    month = 3 and domain = example.com and address ~ Kyiv limit 10
+    no phone
+    name ^ ol and has birthday
+
+Умова — `поле оператор значення` або `has поле` / `no поле`. Поля: name,
+phone, email, domain (частина email після @), birthday (DD.MM.YYYY),
+month (номер або англійська назва місяця) і address. Оператори: `=`, `!=`,
+`~` (містить) і `^` (починається з); текст порівнюється без урахування
+регістру. Для birthday і month доступні лише `=` і `!=`.
+
+План: серед умов `=` за полями, для яких книга має індекс
+(AddressBook.INDEXED_FIELDS), обирається та, що дає найменше кандидатів
+(AddressBook.index_estimate); якщо такої немає або повний перегляд не
+дорожчий — переглядаються всі записи. Умови повного перегляду, які можна
+перевірити по колонках книги (has birthday, month =, domain =, phone ^
+цифри), відбирають рядки пакетними проходами (ContactColumns.select), якщо
+книга має готові колонки, що відповідають її стану (AddressBook.columns,
+COLUMN_SCAN) — наприклад, прочитані з колонкового файлу. Кандидати
+перевіряються умовами запиту по одному, і виконання зупиняється, щойно
+знайдено `limit` збігів (і ще один — щоб знати, що є інші).
+"""
+
+from datetime import date
+from itertools import islice
+import re
+
+from .models import PAGE_SIZE, Birthday
+
+FIELDS = ("name", "phone", "email", "domain", "birthday", "month", "address")
+# Поля, наявність яких перевіряють has і no
+OPTIONAL_FIELDS = ("phone", "email", "birthday", "address")
+# Поля-дати, для яких має сенс лише рівність
+DATE_FIELDS = ("birthday", "month")
+MONTHS = (
+    "january",
+    "february",
+    "march",
+    "april",
+    "may",
+    "june",
+    "july",
+    "august",
+    "september",
+    "october",
+    "november",
+    "december",
+)
+# Без "limit N" показується одна сторінка збігів
+DEFAULT_LIMIT = PAGE_SIZE
+USAGE = (
+    "Use conditions like 'month = 3 and domain = example.com and address ~ Kyiv' "
+    "or 'no phone', optionally followed by 'limit N'."
+)
+
+_AND = re.compile(r"\s+and(?:\s+|$)", re.IGNORECASE)
+_LIMIT = re.compile(r"(.*?)\s+limit\s+(\S+)", re.IGNORECASE | re.DOTALL)
+_CONDITION = re.compile(r"(\w+)\s*(!=|=|~|\^)\s*(.*)", re.DOTALL)
+_PRESENCE = re.compile(r"(has|no)\s+(\w+)", re.IGNORECASE)
+
+
+def _month(value: str) -> int:
+    value = value.casefold()
+    if value.isdigit() and 1 <= int(value) <= 12:
+        return int(value)
+    for number, name in enumerate(MONTHS, start=1):
+        if len(value) >= 3 and name.startswith(value):
+            return number
+    raise ValueError("Month must be a number 1-12 or a month name.")
+
+
+# Поле -> значення поля запису для порівняння (None — значення немає);
+# текст — без урахування регістру, birthday — порядковий номер дати
+_FIELD_VALUES = {
+    "name": lambda record: record._name.casefold(),
+    "email": lambda record: record._email and record._email.casefold(),
+    "domain": lambda record: (
+        record._email and record._email.rpartition("@")[2].casefold()
+    ),
+    "address": lambda record: record._address and record._address.casefold(),
+    "birthday": lambda record: record._birthday,
+    "month": lambda record: (
+        record._birthday and date.fromordinal(record._birthday).month
+    ),
+}
+
+
+def _column_filter(condition: "Condition") -> tuple[str, object] | None:
+    """Аргумент ContactColumns.select, що відбирає рядки за умовою (або None)."""
+    from .columnar import PHONE_DIGITS
+
+    field, op, key = condition.field, condition.op, condition.key
+    if field == "birthday" and op == "has":
+        return "has_birthday", True
+    if field == "month" and op == "=":
+        return "birth_month", key
+    if field == "domain" and op == "=":
+        return "email_domain", key
+    if (
+        field == "phone"
+        and op == "^"
+        and key.isascii()
+        and key.isdigit()
+        and len(key) <= PHONE_DIGITS
+    ):
+        return "phone_code", key
+    return None
+
+
+def _compile(field: str, op: str, key):
+    """Перевірка умови як функція запис -> bool, без розбору умови для
+    кожного запису."""
+    if field == "phone":
+        if op == "has":
+            return lambda record: bool(record._phones)
+        if op == "no":
+            return lambda record: not record._phones
+        if op == "=":
+            return lambda record: key in record._phones
+        if op == "!=":
+            return lambda record: key not in record._phones
+        if op == "~":
+            return lambda record: any(key in phone for phone in record._phones)
+        return lambda record: any(phone.startswith(key) for phone in record._phones)
+    value = _FIELD_VALUES[field]
+    if op == "has":
+        return lambda record: value(record) is not None
+    if op == "no":
+        return lambda record: value(record) is None
+    if op == "=":
+        return lambda record: value(record) == key
+    if op == "!=":
+        return lambda record: value(record) != key
+    if op == "~":
+        return lambda record: (text := value(record)) is not None and key in text
+    return lambda record: (text := value(record)) is not None and text.startswith(key)
+
+
+class Condition:
+    """Одна умова запиту: поле, оператор (або has/no) і значення."""
+
+    __slots__ = ("field", "op", "text", "key", "matches")
+
+    def __init__(self, field: str, op: str, text: str = ""):
+        field = field.lower()
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field '{field}'. Fields: {', '.join(FIELDS)}.")
+        if op in ("has", "no") and field not in OPTIONAL_FIELDS:
+            raise ValueError(f"'{op}' works with fields: {', '.join(OPTIONAL_FIELDS)}.")
+        if field in DATE_FIELDS and op in ("~", "^"):
+            raise ValueError(f"Field '{field}' supports only '=' and '!='.")
+        if op not in ("has", "no") and not text:
+            raise ValueError(f"Condition '{field} {op}' needs a value.")
+        self.field = field
+        self.op = op
+        self.text = text
+        # значення для порівняння і для індексу книги
+        if field == "birthday" and text:
+            self.key = Birthday(text).value
+        elif field == "month" and text:
+            self.key = _month(text)
+        elif field == "phone":
+            self.key = text
+        else:
+            self.key = text.casefold()
+        # matches(record) -> bool
+        self.matches = _compile(
+            field,
+            op,
+            self.key.toordinal() if field == "birthday" and text else self.key,
+        )
+
+    def __str__(self) -> str:
+        if self.op in ("has", "no"):
+            return f"{self.op} {self.field}"
+        return f"{self.field} {self.op} {self.text}"
+
+    @property
+    def indexed(self) -> bool:
+        return self.op == "="
+
+
+def looks_like_query(text: str) -> bool:
+    """True, якщо текст — запит, а не ім'я, телефон чи email для звичайного пошуку."""
+    first = _AND.split(text.strip(), maxsplit=1)[0]
+    if _CONDITION.fullmatch(first):
+        return True
+    presence = _PRESENCE.fullmatch(first)
+    return presence is not None and presence[2].lower() in FIELDS
+
+
+def parse_query(text: str) -> tuple[list[Condition], int]:
+    """Умови запиту і кількість збігів, після якої пошук зупиняється."""
+    text = text.strip()
+    limit = DEFAULT_LIMIT
+    match = _LIMIT.fullmatch(text)
+    if match:
+        text, limit_text = match[1], match[2]
+        if not limit_text.isdigit() or int(limit_text) < 1:
+            raise ValueError("Limit must be a positive number.")
+        limit = int(limit_text)
+    conditions = []
+    for part in _AND.split(text):
+        presence = _PRESENCE.fullmatch(part)
+        condition = _CONDITION.fullmatch(part)
+        if not part:
+            raise ValueError(f"Missing condition after 'and'. {USAGE}")
+        if presence:
+            conditions.append(Condition(presence[2], presence[1].lower()))
+        elif condition:
+            field, op, value = condition.groups()
+            conditions.append(Condition(field, op, value.strip()))
+        else:
+            raise ValueError(f"Can't parse condition '{part}'. {USAGE}")
+    return conditions, limit
+
+
+class Plan:
+    """Обраний спосіб виконати запит: індекс (або повний перегляд),
+    перевірки кандидатів і ліміт."""
+
+    __slots__ = (
+        "book",
+        "conditions",
+        "limit",
+        "access",
+        "estimate",
+        "alternatives",
+        "columns",
+        "column_filters",
+    )
+
+    def __init__(self, book, conditions: list[Condition], limit: int):
+        self.book = book
+        self.conditions = conditions
+        self.limit = limit
+        # повний перегляд — запасний варіант, індекс обирається, лише якщо
+        # дає не більше кандидатів
+        self.access: Condition | None = None
+        self.estimate = len(book)
+        self.alternatives: list[tuple[str, int]] = []
+        # Колонки книги і умова -> аргумент select для пакетного відбору при
+        # повному перегляді
+        self.columns = None
+        self.column_filters: dict[Condition, tuple[str, object]] = {}
+        for condition in conditions:
+            if condition.indexed and condition.field in book.INDEXED_FIELDS:
+                estimate = book.index_estimate(condition.field, condition.key)
+                if estimate <= self.estimate:
+                    self.alternatives.append(self._describe())
+                    self.access, self.estimate = condition, estimate
+                else:
+                    self.alternatives.append((f"index {condition}", estimate))
+        if self.access is None and book.COLUMN_SCAN:
+            # лише готові колонки: перебудова коштує більше за сам перегляд
+            self.columns = book.columns(build=False)
+        if self.columns is not None:
+            for condition in conditions:
+                column_filter = _column_filter(condition)
+                if column_filter is not None:
+                    self.column_filters[condition] = column_filter
+
+    def _describe(self) -> tuple[str, int]:
+        if self.access is None:
+            if self.column_filters:
+                checked = ", ".join(map(str, self.column_filters))
+                return f"column scan ({checked})", self.estimate
+            return "full scan", self.estimate
+        return f"index {self.access}", self.estimate
+
+    def run(self) -> tuple[list, bool]:
+        """Перші `limit` записів, що відповідають усім умовам, у порядку
+        додавання, і ознака, чи є ще збіги."""
+        if self.access is not None:
+            candidates = self.book.index_records(self.access.field, self.access.key)
+        elif self.columns is not None and self.column_filters:
+            # відбір по колонках лише звужує кандидатів: умови, як і для
+            # індексу, перевіряються далі для кожного запису
+            rows = self.columns.select(**dict(self.column_filters.values()))
+            names, data = self.columns.names, self.book.data
+            candidates = (data[names[row]] for row in rows)
+        else:
+            candidates = self.book.data.values()
+        # ланцюжок ледачих фільтрів: кожен запис перевіряється, лише поки
+        # не знайдено limit + 1 збігів
+        for condition in self.conditions:
+            candidates = filter(condition.matches, candidates)
+        found = list(islice(candidates, self.limit + 1))
+        return found[: self.limit], len(found) > self.limit
+
+    def explain(self) -> str:
+        access, estimate = self._describe()
+        filters = [str(c) for c in self.conditions if c is not self.access]
+        lines = [
+            f"Access: {access}, ~{estimate} of {len(self.book)} contacts to check",
+            f"Filter: {', '.join(filters) or 'none'}",
+            f"Limit: stops after {self.limit} matches",
+        ]
+        if self.alternatives:
+            rejected = "; ".join(
+                f"{label} ~{cost}" for label, cost in self.alternatives
+            )
+            lines.append(f"Rejected: {rejected}")
+        return "\n".join(lines)
+
+
+def plan_query(book, text: str) -> Plan:
+    """Розбирає запит і будує план його виконання над книгою."""
+    conditions, limit = parse_query(text)
+    return Plan(book, conditions, limit)
@@ -0,0 +1,195 @@
+"""Мережевий режим: один процес обслуговує спільні книги для багатьох клієнтів.
+
+Сервер на asyncio слухає TCP або Unix-сокет і приймає ті самі команди, що й
+інтерактивний режим, по одній у рядку. Клієнт може надсилати команди
+конвеєром, не чекаючи відповідей, — відповіді приходять у тому ж порядку.
+
+Кожна відповідь — рядок заголовка "<результат> <кількість рядків>" (результат
+як у статистиці: success, KeyError, ValueError, IndexError або
+InvalidCommand) і далі стільки рядків тексту відповіді.
+
+Обробники синхронні й виконуються в циклі подій по одному, тож зміни книг
+серіалізовані. Збереження об'єднується: перша зміна планує
+storage.checkpoint() через `flush_delay` секунд, і всі зміни за цей час
+записуються одним збереженням. Сховища з background_save зберігаються в
+окремому потоці з копії книг, тому команди тоді виконуються під storage.lock.
+
+Команди з файлами сервера (import, export) мережевим клієнтам недоступні.
+"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+import os
+import signal
+import threading
+
+from .commands import REGISTRY
+from .handlers import parse_input
+from .stats import Stats, last_outcome
+
+DEFAULT_PORT = 7878
+FLUSH_DELAY = 1.0
+# Читають і пишуть файли на машині сервера
+LOCAL_COMMANDS = frozenset({"import", "export"})
+
+
+def encode_response(outcome: str, message: str) -> bytes:
+    """Заголовок з результатом і кількістю рядків, далі сам текст."""
+    lines = message.splitlines() or [""]
+    text = "\n".join(lines)
+    return f"{outcome} {len(lines)}\n{text}\n".encode()
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple[str, str]:
+    """Читає одну відповідь сервера: (результат, текст)."""
+    header = await reader.readline()
+    if not header:
+        raise ConnectionError("server closed the connection")
+    outcome, count = header.decode().split()
+    lines = [(await reader.readline()).decode().rstrip("\n") for _ in range(int(count))]
+    return outcome, "\n".join(lines)
+
+
+class AssistantServer:
+    """Спільні AddressBook/NotesBook, сховище та об'єднане збереження."""
+
+    def __init__(self, storage, flush_delay: float = FLUSH_DELAY):
+        self.storage = storage
+        self.flush_delay = flush_delay
+        self.book, self.notes = storage.load()
+        self.stats = Stats()
+        self.context = {"book": self.book, "notes": self.notes, "stats": self.stats}
+        self.clients = 0
+        self.flushes = 0
+        self.error: BaseException | None = None
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # один потік — збереження не перекриваються
+        self._flush_thread: int | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="flush", initializer=self._bind_flush
+        )
+        self._lock = storage.lock if storage.background_save else nullcontext()
+        self.book.subscribe(self._on_change)
+        self.notes.subscribe(self._on_change)
+
+    def _bind_flush(self) -> None:
+        self._flush_thread = threading.get_ident()
+
+    def _on_change(self, change: tuple) -> None:
+        # у потоці збереження книги змінює лише об'єднання із записаним
+        # іншим процесом — ці зміни вже на диску, а циклу подій там немає
+        if threading.get_ident() == self._flush_thread:
+            return
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.flush_delay, self.flush)
+
+    def flush(self) -> None:
+        """Зберігає всі зміни, накопичені з моменту попереднього збереження."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+            if not self.storage.background_save:
+                # журнал і SQLite лише скидають на диск уже записане
+                self.storage.checkpoint(self.book, self.notes)
+                self.flushes += 1
+                return
+            # копія знімається під storage.lock, запис — у потоці збереження
+            future = self._executor.submit(
+                self.storage.checkpoint, self.book, self.notes
+            )
+            future.add_done_callback(self._flushed)
+
+    def _flushed(self, future: Future) -> None:
+        error = future.exception()
+        if error is None:
+            self.flushes += 1
+        # незбережені зміни лишаються позначеними і підуть з наступним
+        # збереженням або при закритті
+        self.error = error
+
+    def execute(self, line: str) -> tuple[str, str] | None:
+        """Виконує одну команду; None — клієнт завершує сесію."""
+        name, args = parse_input(line)
+        command = REGISTRY.get(name)
+        if command is None:
+            return "InvalidCommand", "Invalid command."
+        if command.exits:
+            return None
+        if name in LOCAL_COMMANDS:
+            return "InvalidCommand", f"'{name}' is not available on the server."
+        with self._lock:
+            message = self.stats.run(name, command, args, self.context)
+        return last_outcome.get(), message
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.clients += 1
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                response = self.execute(line.decode(errors="replace"))
+                if response is None:
+                    writer.write(encode_response("success", "Good bye!"))
+                    break
+                writer.write(encode_response(*response))
+                # чекаємо лише коли клієнт не встигає читати відповіді
+                await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    def close(self) -> None:
+        self.book.unsubscribe(self._on_change)
+        self.notes.unsubscribe(self._on_change)
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._executor.shutdown(wait=True)
+        self.storage.close(self.book, self.notes)
+
+
+async def serve(
+    storage,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    unix_path: str | None = None,
+    flush_delay: float = FLUSH_DELAY,
+    ready=None,
+) -> None:
+    """Запускає сервер і працює, доки його не скасують (Ctrl+C).
+
+    `ready`, якщо задано, викликається з адресою сокета після старту.
+    """
+    app = AssistantServer(storage, flush_delay)
+    if unix_path is not None:
+        if os.path.exists(unix_path):
+            os.remove(unix_path)
+        server = await asyncio.start_unix_server(app.handle_client, unix_path)
+    else:
+        server = await asyncio.start_server(app.handle_client, host, port)
+    # SIGTERM (наприклад, від systemd) завершує сервер так само, як Ctrl+C
+    task = asyncio.current_task()
+    if task is not None:
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: лише Ctrl+C
+    address = unix_path or ":".join(map(str, server.sockets[0].getsockname()[:2]))
+    if ready is not None:
+        ready(address)
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        app.close()
+        if unix_path is not None and os.path.exists(unix_path):
+            os.remove(unix_path)
@@ -0,0 +1,495 @@
+"""Зберігання книг у локальній базі SQLite (стандартний модуль sqlite3).
+
+Контакти не завантажуються в пам'ять повністю: SqliteAddressBook читає
+записи з бази на вимогу і тримає в пам'яті лише обмежений LRU-кеш.
+Пошук за ім'ям, телефоном, email і днем народження виконується через
+індекси бази. Кожна зміна запису одразу записується в базу.
+
+Нотатки зберігаються в тій самій базі, але завантажуються в звичайний
+NotesBook повністю (їх набагато менше), а зміни записуються в базу через
+підписку на NotesBook.
+"""
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from itertools import groupby
+import sqlite3
+
+from .models import (
+    Address,
+    AddressBook,
+    Birthday,
+    Email,
+    Observable,
+    Record,
+    cursor_number,
+    name_sort_key,
+)
+from .notes import Note, NotesBook
+
+DEFAULT_SQLITE_DB = "assistant.db"
+DEFAULT_CACHE_SIZE = 1024
+# Роздільник тегів у group_concat (ASCII Unit Separator не трапляється в тегах)
+TAG_SEPARATOR = "\x1f"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    name_key TEXT NOT NULL,
+    email TEXT,
+    email_key TEXT,
+    birthday TEXT,
+    birthday_md INTEGER,
+    address TEXT
+);
+CREATE INDEX IF NOT EXISTS contacts_name_key ON contacts (name_key);
+CREATE INDEX IF NOT EXISTS contacts_name_order ON contacts (name_key, name);
+CREATE INDEX IF NOT EXISTS contacts_email_key ON contacts (email_key);
+CREATE INDEX IF NOT EXISTS contacts_birthday_md ON contacts (birthday_md, seq);
+CREATE TABLE IF NOT EXISTS phones (
+    contact_seq INTEGER NOT NULL REFERENCES contacts (seq) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    phone TEXT NOT NULL,
+    PRIMARY KEY (contact_seq, position)
+);
+CREATE INDEX IF NOT EXISTS phones_phone ON phones (phone);
+CREATE TABLE IF NOT EXISTS notes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    note_id INTEGER NOT NULL UNIQUE,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS note_tags (
+    note_seq INTEGER NOT NULL REFERENCES notes (seq) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (note_seq, position)
+);
+CREATE INDEX IF NOT EXISTS note_tags_tag ON note_tags (tag);
+"""
+
+# Запис контакту разом з телефонами (у порядку додавання) одним рядком
+SELECT_RECORD = """
+SELECT c.name, c.email, c.birthday, c.address,
+       (SELECT group_concat(phone, ',') FROM
+           (SELECT phone FROM phones WHERE contact_seq = c.seq ORDER BY position))
+FROM contacts AS c
+"""
+
+UPSERT_CONTACT = """
+INSERT INTO contacts (name, name_key, email, email_key, birthday, birthday_md, address)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    name_key = excluded.name_key,
+    email = excluded.email,
+    email_key = excluded.email_key,
+    birthday = excluded.birthday,
+    birthday_md = excluded.birthday_md,
+    address = excluded.address
+"""
+
+
+def connect(path: str = DEFAULT_SQLITE_DB) -> sqlite3.Connection:
+    """Відкриває (і за потреби створює) базу з потрібною схемою."""
+    # з'єднання може відкриватися у потоці фонового завантаження, а
+    # використовуватися в основному (не одночасно)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON")
+    # WAL + NORMAL: коміт не чекає fsync, але переживає аварійний вихід процесу
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _contact_row(record: Record) -> tuple:
+    name = record.name.value
+    email = record.email.value if record.email else None
+    birthday = record.birthday
+    bday = birthday.value if birthday else None
+    address = getattr(record, "address", None)
+    return (
+        name,
+        name.casefold(),
+        email,
+        email.casefold() if email else None,
+        birthday.date_str if birthday else None,
+        bday.month * 100 + bday.day if bday else None,
+        address.value if address else None,
+    )
+
+
+def _decode_record(row: tuple) -> Record:
+    name, email, birthday, address, phones = row
+    record = Record(name)
+    if phones:
+        for phone in phones.split(","):
+            record.add_phone(phone)
+    if birthday:
+        record.birthday = Birthday(birthday)
+    if email:
+        record.email = Email(email)
+    if address:
+        record.address = Address(address)
+    return record
+
+
+def write_record(conn: sqlite3.Connection, record: Record) -> None:
+    """Вставляє або повністю переписує контакт разом з телефонами (без коміту)."""
+    conn.execute(UPSERT_CONTACT, _contact_row(record))
+    (seq,) = conn.execute(
+        "SELECT seq FROM contacts WHERE name = ?", (record.name.value,)
+    ).fetchone()
+    conn.execute("DELETE FROM phones WHERE contact_seq = ?", (seq,))
+    conn.executemany(
+        "INSERT INTO phones (contact_seq, position, phone) VALUES (?, ?, ?)",
+        [(seq, pos, phone.phone_number) for pos, phone in enumerate(record.phones)],
+    )
+
+
+def write_note(conn: sqlite3.Connection, note_id: int, note: Note) -> None:
+    """Вставляє або переписує нотатку разом з тегами (без коміту)."""
+    conn.execute(
+        "INSERT INTO notes (note_id, text) VALUES (?, ?) "
+        "ON CONFLICT (note_id) DO UPDATE SET text = excluded.text",
+        (note_id, note.text),
+    )
+    (seq,) = conn.execute(
+        "SELECT seq FROM notes WHERE note_id = ?", (note_id,)
+    ).fetchone()
+    conn.execute("DELETE FROM note_tags WHERE note_seq = ?", (seq,))
+    conn.executemany(
+        "INSERT INTO note_tags (note_seq, position, tag) VALUES (?, ?, ?)",
+        [(seq, pos, tag) for pos, tag in enumerate(note.tags)],
+    )
+
+
+class SqliteRecords(MutableMapping):
+    """Словник ім'я -> Record поверх таблиць бази з LRU-кешем записів.
+
+    Записи, прочитані з бази, прив'язуються до книги-власника, тож їх зміни
+    через методи Record одразу записуються назад у базу.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, owner, cache_size: int):
+        self._conn = conn
+        self._owner = owner
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, Record] = OrderedDict()
+        # усередині transaction() зміни не фіксуються по одній
+        self._in_transaction = False
+
+    def _commit(self) -> None:
+        if not self._in_transaction:
+            self._conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """Фіксує всі зміни блоку одним комітом; при помилці відкочує їх."""
+        self._in_transaction = True
+        try:
+            yield
+        except BaseException:
+            self._conn.rollback()
+            # у кеші можуть лишитися записи, яких у базі вже немає
+            self._cache.clear()
+            raise
+        else:
+            self._conn.commit()
+        finally:
+            self._in_transaction = False
+
+    def _remember(self, key: str, record: Record) -> None:
+        self._cache[key] = record
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _load(self, key: str, row: tuple) -> Record:
+        record = self._cache.get(key)
+        if record is None:
+            record = _decode_record(row)
+            record._book = self._owner
+            self._remember(key, record)
+        return record
+
+    def __getitem__(self, key: str) -> Record:
+        record = self._cache.get(key)
+        if record is not None:
+            self._cache.move_to_end(key)
+            return record
+        row = self._conn.execute(SELECT_RECORD + "WHERE c.name = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self._load(key, row)
+
+    def __setitem__(self, key: str, record: Record) -> None:
+        old = self._cache.get(key)
+        if old is not None and old is not record:
+            old._book = None
+        self.store(record)
+        record._book = self._owner
+        self._remember(key, record)
+
+    def __delitem__(self, key: str) -> None:
+        cur = self._conn.execute("DELETE FROM contacts WHERE name = ?", (key,))
+        self._commit()
+        old = self._cache.pop(key, None)
+        if old is not None:
+            old._book = None
+        if not cur.rowcount:
+            raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        if key in self._cache:
+            return True
+        sql = "SELECT 1 FROM contacts WHERE name = ?"
+        return self._conn.execute(sql, (key,)).fetchone() is not None
+
+    def __iter__(self):
+        for (name,) in self._conn.execute("SELECT name FROM contacts ORDER BY seq"):
+            yield name
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT count(*) FROM contacts").fetchone()[0]
+
+    def items(self):
+        """Потоково читає всі записи одним запитом (без заповнення кешу)."""
+        for row in self._conn.execute(SELECT_RECORD + "ORDER BY c.seq"):
+            record = self._cache.get(row[0])
+            if record is None:
+                record = _decode_record(row)
+                record._book = self._owner
+            yield row[0], record
+
+    def values(self):
+        for _, record in self.items():
+            yield record
+
+    def store(self, record: Record) -> None:
+        """Записує поточний стан запису в базу."""
+        write_record(self._conn, record)
+        self._commit()
+
+    def select(self, sql: str, params: tuple = ()) -> list[Record]:
+        """Записи за запитом, що повертає імена контактів."""
+        return [self[name] for (name,) in self._conn.execute(sql, params)]
+
+
+class SqliteAddressBook(AddressBook):
+    """AddressBook, що читає записи з бази SQLite на вимогу.
+
+    Замість індексів у пам'яті використовує індекси бази, тому час запуску
+    та пам'ять не залежать від розміру книги.
+    """
+
+    # Колонки всієї книги в пам'яті звели б нанівець читання записів на вимогу
+    COLUMN_SCAN = False
+
+    def __init__(self, conn: sqlite3.Connection, cache_size: int = DEFAULT_CACHE_SIZE):
+        self._init_listeners()
+        self.data = SqliteRecords(conn, self, cache_size)
+        self._conn = conn
+        # індекс нечіткого пошуку тримається в пам'яті, як і в AddressBook
+        self._fuzzy_keys = None
+
+    def _on_field_change(self, record: Record, field: str, old, new) -> None:
+        key = record.name.value
+        if key not in self.data:
+            return
+        self.data.store(record)
+        if field != "birthday":
+            self._fuzzy_field_change(record, key, old)
+        self._notify("field", key, field, old, new)
+
+    def __setitem__(self, key: str, record: Record) -> None:
+        if self._fuzzy_keys is not None and key in self.data:
+            self._fuzzy_remove(key, self.data[key])
+        self.data[key] = record
+        if self._fuzzy_keys is not None:
+            self._fuzzy_add(key, record)
+        self._notify("put", key, record)
+
+    def __delitem__(self, key: str) -> None:
+        if self._fuzzy_keys is not None and key in self.data:
+            self._fuzzy_remove(key, self.data[key])
+        del self.data[key]
+        self._notify("delete", key)
+
+    def _commit_batch(self, staged: dict) -> None:
+        # відсортованих списків у пам'яті немає, а записи пакета пишуться
+        # в базу однією транзакцією замість коміту на кожен
+        with self.data.transaction():
+            Observable._commit_batch(self, staged)
+
+    def __getstate__(self):
+        raise TypeError(
+            "SqliteAddressBook is backed by a database and can't be pickled"
+        )
+
+    def find_by_name(self, name: str) -> list[Record]:
+        sql = "SELECT name FROM contacts WHERE name_key = ? ORDER BY seq"
+        return self.data.select(sql, (name.casefold(),))
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        sql = (
+            "SELECT DISTINCT c.name, c.seq FROM contacts AS c "
+            "JOIN phones AS p ON p.contact_seq = c.seq "
+            "WHERE p.phone = ? ORDER BY c.seq"
+        )
+        rows = self._conn.execute(sql, (phone,)).fetchall()
+        return [self.data[name] for name, _ in rows]
+
+    def find_by_email(self, email: str) -> list[Record]:
+        sql = "SELECT name FROM contacts WHERE email_key = ? ORDER BY seq"
+        return self.data.select(sql, (email.casefold(),))
+
+    def lookup(self, query: str) -> list[Record]:
+        key = query.casefold()
+        sql = (
+            "SELECT name FROM contacts WHERE seq IN ("
+            " SELECT seq FROM contacts WHERE name_key = ?1"
+            " UNION SELECT seq FROM contacts WHERE email_key = ?1"
+            " UNION SELECT contact_seq FROM phones WHERE phone = ?1"
+            ") ORDER BY seq"
+        )
+        return self.data.select(sql, (key,))
+
+    def _page_keys(
+        self, order: str, cursor: str | None, limit: int
+    ) -> tuple[list[str], str | None]:
+        # Курсори — ключі сортування з бази: (name_key, name) або seq;
+        # без курсора — значення, менше за будь-який ключ
+        after: tuple
+        if order == "name":
+            after = ("", "") if cursor is None else name_sort_key(cursor)
+            sql = (
+                "SELECT name, name FROM contacts WHERE (name_key, name) > (?, ?) "
+                "ORDER BY name_key, name LIMIT ?"
+            )
+        else:
+            after = (0 if cursor is None else cursor_number(cursor),)
+            sql = "SELECT name, seq FROM contacts WHERE seq > ? ORDER BY seq LIMIT ?"
+        # зайвий рядок показує, чи є наступна сторінка
+        rows = self._conn.execute(sql, (*after, limit + 1)).fetchall()
+        keys = [name for name, _ in rows[:limit]]
+        return keys, str(rows[limit - 1][1]) if len(rows) > limit else None
+
+    @staticmethod
+    def _index_query(field: str, value) -> tuple[str, tuple]:
+        if field == "name":
+            return "FROM contacts WHERE name_key = ?", (value.casefold(),)
+        if field == "email":
+            return "FROM contacts WHERE email_key = ?", (value.casefold(),)
+        if field == "phone":
+            sql = "FROM contacts WHERE seq IN (SELECT contact_seq FROM phones WHERE phone = ?)"
+            return sql, (value,)
+        if field == "birthday":
+            return "FROM contacts WHERE birthday_md = ?", (
+                value.month * 100 + value.day,
+            )
+        return "FROM contacts WHERE birthday_md BETWEEN ? AND ?", (
+            value * 100,
+            value * 100 + 99,
+        )
+
+    def index_estimate(self, field: str, value) -> int:
+        sql, params = self._index_query(field, value)
+        return self._conn.execute("SELECT count(*) " + sql, params).fetchone()[0]
+
+    def index_records(self, field: str, value):
+        sql, params = self._index_query(field, value)
+        for (name,) in self._conn.execute(f"SELECT name {sql} ORDER BY seq", params):
+            yield self.data[name]
+
+    def names_with_prefix(self, prefix: str, limit: int) -> list[str]:
+        key = prefix.casefold()
+        rows = self._conn.execute(
+            "SELECT name FROM contacts WHERE name_key >= ? AND name_key < ? "
+            "ORDER BY name_key, name LIMIT ?",
+            (key, key + "\U0010ffff", limit),
+        )
+        return [name for (name,) in rows]
+
+    def _iter_birthdays(self, start: tuple[int, int], before: bool):
+        op = "<" if before else ">="
+        rows = self._conn.execute(
+            "SELECT birthday_md, name FROM contacts "
+            f"WHERE birthday_md {op} ? ORDER BY birthday_md, seq",
+            (start[0] * 100 + start[1],),
+        )
+        for md, group in groupby(rows, key=lambda row: row[0]):
+            yield divmod(md, 100), [name for _, name in group]
+
+
+class SqliteStore:
+    """Файл бази з контактами і нотатками.
+
+    Приклад:
+        store = SqliteStore("assistant.db")
+        book, notes = store.load()
+        ...
+        store.close()
+    """
+
+    def __init__(self, path: str = DEFAULT_SQLITE_DB, cache_size=DEFAULT_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self.conn = connect(path)
+        self._notes: NotesBook | None = None
+
+    def is_empty(self) -> bool:
+        return not self.conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM contacts) OR EXISTS (SELECT 1 FROM notes)"
+        ).fetchone()[0]
+
+    def import_books(self, book: AddressBook, notes: NotesBook) -> None:
+        """Одним транзакційним записом переносить книги в базу (для міграції)."""
+        with self.conn:
+            for record in book.data.values():
+                write_record(self.conn, record)
+            for note_id, note in notes.data.items():
+                write_note(self.conn, note_id, note)
+
+    def load(self) -> tuple[SqliteAddressBook, NotesBook]:
+        return self.load_book(), self.load_notes()
+
+    def load_book(self) -> SqliteAddressBook:
+        return SqliteAddressBook(self.conn, self.cache_size)
+
+    def load_notes(self) -> NotesBook:
+        notes = NotesBook()
+        rows = self.conn.execute(
+            "SELECT n.note_id, n.text, "
+            f"(SELECT group_concat(tag, '{TAG_SEPARATOR}') FROM "
+            "   (SELECT tag FROM note_tags WHERE note_seq = n.seq ORDER BY position)) "
+            "FROM notes AS n ORDER BY n.seq"
+        )
+        for note_id, text, tags in rows:
+            note = Note("", tags.split(TAG_SEPARATOR) if tags else None)
+            # текст після edit-note не обрізається, тож відновлюємо як є
+            note.text = text
+            notes[note_id] = note
+        self._notes = notes
+        notes.subscribe(self._on_notes_change)
+        return notes
+
+    def _on_notes_change(self, change: tuple) -> None:
+        if self._notes is None:
+            return
+        notes = self._notes.data
+        changes = change[1] if change[0] == "batch" else (change,)
+        # пакет нотаток записується однією транзакцією
+        with self.conn:
+            for note_id in dict.fromkeys(inner[1] for inner in changes):
+                note = notes.get(note_id)
+                if note is None:
+                    self.conn.execute("DELETE FROM notes WHERE note_id = ?", (note_id,))
+                else:
+                    write_note(self.conn, note_id, note)
+
+    def close(self) -> None:
+        if self._notes is not None:
+            self._notes.unsubscribe(self._on_notes_change)
+        self.conn.close()
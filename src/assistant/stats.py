@@ -0,0 +1,136 @@
+"""Статистика виконання команд: кількість викликів, результати та затримки.
+
+Затримки зберігаються у логарифмічних гістограмах: кожен степінь двійки
+наносекунд поділено на `SUB_BUCKETS` підінтервалів, тож запис — це кілька
+цілочисельних операцій, пам'ять не залежить від кількості викликів, а
+похибка перцентилів не перевищує ~12%.
+"""
+
+from contextvars import ContextVar
+import json
+import time
+
+SUB_BUCKETS = 4
+SUB_BITS = SUB_BUCKETS.bit_length()
+OUTCOMES = ("success", "KeyError", "ValueError", "IndexError")
+PERCENTILES = (50, 95, 99)
+
+# Результат останнього виклику обробника; input_error записує сюди
+# перехоплений виняток, бо сам обробник повертає лише текст повідомлення
+last_outcome: ContextVar[str] = ContextVar("last_outcome", default="success")
+
+
+def bucket_of(ns: int) -> int:
+    """Номер інтервалу гістограми для затримки `ns` наносекунд."""
+    if ns < SUB_BUCKETS:
+        return ns
+    shift = ns.bit_length() - SUB_BITS
+    return shift * SUB_BUCKETS + (ns >> shift)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """Найменша і найбільша затримки (нс), що потрапляють в інтервал."""
+    if index < SUB_BUCKETS:
+        return index, index
+    shift, mantissa = divmod(index, SUB_BUCKETS)
+    shift -= 1
+    mantissa += SUB_BUCKETS
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class CommandStats:
+    """Лічильники та гістограма затримок однієї команди."""
+
+    __slots__ = ("calls", "outcomes", "histogram", "total_ns", "max_ns")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.outcomes: dict[str, int] = {}
+        self.histogram: dict[int, int] = {}
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, outcome: str, ns: int) -> None:
+        self.calls += 1
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        index = bucket_of(ns)
+        self.histogram[index] = self.histogram.get(index, 0) + 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q: float) -> float:
+        """Наближене значення q-го перцентиля затримки в мілісекундах."""
+        rank = q / 100 * self.calls
+        seen = 0
+        for index in sorted(self.histogram):
+            seen += self.histogram[index]
+            if seen >= rank:
+                low, high = bucket_bounds(index)
+                # середина інтервалу, але не більше за найбільшу затримку
+                return min((low + high) / 2, self.max_ns) / 1e6
+        return self.max_ns / 1e6
+
+    def as_dict(self) -> dict:
+        data = {
+            "calls": self.calls,
+            "outcomes": dict(self.outcomes),
+            "mean_ms": self.total_ns / self.calls / 1e6 if self.calls else 0.0,
+            "max_ms": self.max_ns / 1e6,
+        }
+        for q in PERCENTILES:
+            data[f"p{q}_ms"] = self.percentile(q)
+        data["histogram"] = {
+            str(bucket_bounds(index)[1]): count
+            for index, count in sorted(self.histogram.items())
+        }
+        return data
+
+
+class Stats:
+    """Статистика всіх команд сесії."""
+
+    def __init__(self) -> None:
+        self.commands: dict[str, CommandStats] = {}
+
+    def run(self, name: str, call, *args):
+        """Виконує `call(*args)`, вимірюючи час і фіксуючи результат."""
+        last_outcome.set("success")
+        start = time.perf_counter_ns()
+        try:
+            result = call(*args)
+        except Exception as e:
+            self._record(name, type(e).__name__, time.perf_counter_ns() - start)
+            raise
+        self._record(name, last_outcome.get(), time.perf_counter_ns() - start)
+        return result
+
+    def _record(self, name: str, outcome: str, ns: int) -> None:
+        stats = self.commands.get(name)
+        if stats is None:
+            stats = self.commands[name] = CommandStats()
+        stats.record(outcome, ns)
+
+    def report(self) -> str:
+        """Таблиця з кількістю викликів, результатами та перцентилями затримок."""
+        if not self.commands:
+            return "No commands executed yet."
+        header = f"{'Command':<20}{'Calls':>7}" + "".join(
+            f"{outcome:>12}" for outcome in OUTCOMES
+        )
+        header += "".join(f"{f'p{q}, ms':>10}" for q in PERCENTILES)
+        lines = [header]
+        for name in sorted(self.commands):
+            stats = self.commands[name]
+            line = f"{name:<20}{stats.calls:>7}" + "".join(
+                f"{stats.outcomes.get(outcome, 0):>12}" for outcome in OUTCOMES
+            )
+            line += "".join(f"{stats.percentile(q):>10.3f}" for q in PERCENTILES)
+            lines.append(line)
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """Записує статистику у файл JSON."""
+        data = {name: stats.as_dict() for name, stats in sorted(self.commands.items())}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
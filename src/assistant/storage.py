@@ -1,39 +1,80 @@
+"""Збереження книг у файлах: pickle, колонковий формат, журнал змін, SQLite
+або mmap-знімок.
+
+Кілька процесів assistant-bot можуть працювати з тими самими pickle-файлами
+(див. SharedFile): записи атомарні, а зміни, збережені іншим процесом,
+об'єднуються з власними на рівні записів, а не затираються.
+"""
+
+from contextlib import contextmanager
+import os
 import pickle
+import threading
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+fcntl: ModuleType | None
+try:
+    import fcntl
+except ImportError:  # Windows: лише атомарний запис і перевірка покоління
+    fcntl = None
+
+from .journal import JournaledStore, dump_temp, list_segments, replay, write_snapshot
 from .models import AddressBook
 from .notes import NotesBook
 
+if TYPE_CHECKING:
+    from .columnar import ContactColumns
+
+    # sqlite3 імпортується лише при виборі сховища sqlite
+    from .mmap_store import MmapAddressBook
+    from .sqlite_store import SqliteStore
+
 DEFAULT_DB = "addressbook.pkl"
 DEFAULT_DB_NOTES = "notesbook.pkl"
+DEFAULT_DB_COLUMNAR = "addressbook.col"
+LOCK_SUFFIX = ".lock"
+# Скільки разів пробувати зберегти без тривалого блокування, якщо інший
+# процес встиг зберегти раніше
+OPTIMISTIC_ATTEMPTS = 2
 
 
 def save_data(book: AddressBook, filename: str = DEFAULT_DB) -> None:
-    """Серіалізація адресної книги у файл за допомогою pickle."""
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
+    """Атомарно серіалізує адресну книгу у файл за допомогою pickle."""
+    write_snapshot(book, filename)
 
 
 def load_data(filename: str = DEFAULT_DB) -> AddressBook:
     """Десеріалізація адресної книги з файлу, або створення нової, якщо файл відсутній."""
     try:
         with open(filename, "rb") as f:
-            return pickle.load(f)
+            book = pickle.load(f)
     except FileNotFoundError:
-        return AddressBook()
+        book = AddressBook()
+    return _replay_journal(book, filename)
 
 
 def save_notes(notes: NotesBook, filename: str = DEFAULT_DB_NOTES) -> None:
-    """Серіалізація нотаток у файл за допомогою pickle."""
-    with open(filename, "wb") as f:
-        pickle.dump(notes, f)
+    """Атомарно серіалізує нотатки у файл за допомогою pickle."""
+    write_snapshot(notes, filename)
 
 
 def load_notes(filename: str = DEFAULT_DB_NOTES) -> NotesBook:
     """Десеріалізація нотаток з файлу, або створення нової, якщо файл відсутній."""
     try:
         with open(filename, "rb") as f:
-            return pickle.load(f)
+            notes = pickle.load(f)
     except FileNotFoundError:
-        return NotesBook()
+        notes = NotesBook()
+    return _replay_journal(notes, filename)
+
+
+def _replay_journal(book, filename: str):
+    """Догортає зміни, які режим журналу записав, але ще не переніс у знімок."""
+    segments = list_segments(filename)
+    if segments:
+        replay(book, segments)
+    return book
 
 
 def save_all(
@@ -54,3 +95,505 @@ def load_all(
     address_book = load_data(book_filename)
     notes_book = load_notes(notes_filename)
     return address_book, notes_book
+
+
+class SharedFile:
+    """Pickle-файл книги, який можуть одночасно змінювати кілька процесів.
+
+    Поруч з файлом лежить `<файл>.lock` — на ньому береться рекомендаційне
+    блокування (fcntl.flock), а всередині зберігається номер покоління, що
+    зростає з кожним записом. Книга запам'ятовує покоління, з якого її
+    прочитано, і ключі записів, які змінила сесія.
+
+    Збереження: pickle пишеться у тимчасовий файл без блокування, а під
+    ексклюзивним блокуванням лише перевіряється покоління і виконується
+    os.replace — блокування тримається мікросекунди. Якщо покоління змінилося
+    (файл зберіг інший процес), книга спершу підтягує з диска всі записи, яких
+    ця сесія не торкалася, і збереження повторюється; якщо знову невдало —
+    об'єднання і запис виконуються під блокуванням. Для записів, змінених
+    обома сесіями, перемагає версія того, хто зберігає пізніше.
+
+    Якщо `renumber` — ключі є номерами, які нові записи отримують як
+    найбільший номер + 1 (нотатки). Дві сесії, що додали записи одночасно,
+    обирають однакові номери, тож при об'єднанні нові записи цієї сесії з
+    номерами, вже зайнятими на диску, переносяться на вільні номери.
+
+    save() можна викликати з фонового потоку (див. autosave.py): книга
+    серіалізується з копії (див. Observable.snapshot), знятої під `lock`, а
+    змінюється (при об'єднанні) лише під ним же — інший потік тримає `lock` на
+    час виконання команди.
+
+    Формат файлу задають `dump(book, f)` і `parse(f)` (за замовчуванням pickle).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        factory,
+        lock=None,
+        dump=pickle.dump,
+        parse=pickle.load,
+        renumber: bool = False,
+    ):
+        self.path = path
+        self.factory = factory
+        self.dump = dump
+        self.parse = parse
+        self.renumber = renumber
+        self.lock_path = path + LOCK_SUFFIX
+        self.lock = lock if lock is not None else threading.RLock()
+        self.generation = 0
+        self.touched: set = set()
+        # найбільший номер у версії з диска, з якою сесія востаннє
+        # узгоджувалась: більші номери — нові записи сесії
+        self.last_saved_key = 0
+        self.book: AddressBook | NotesBook | None = None
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        with open(self.lock_path, "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield f
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_generation(lock) -> int:
+        lock.seek(0)
+        text = lock.read().strip()
+        return int(text) if text.isdigit() else 0
+
+    def _open(self, lock):
+        """Відкритий файл книги (None, якщо його ще немає) та його покоління."""
+        generation = self._read_generation(lock)
+        try:
+            return open(self.path, "rb"), generation
+        except FileNotFoundError:
+            return None, generation
+
+    def _load(self, f):
+        if f is None:
+            return self.factory()
+        with f:
+            return self.parse(f)
+
+    def _read(self):
+        """Книга з диска та її покоління, прочитані узгоджено."""
+        with self._file_lock(exclusive=False) as lock:
+            f, generation = self._open(lock)
+        # відкритий файл лишається тим самим, навіть якщо його замінять після
+        # зняття блокування, тож читаємо вже без нього
+        return self._load(f), generation
+
+    def _on_change(self, change: tuple) -> None:
+        if change[0] == "batch":
+            self.touched.update(inner[1] for inner in change[1])
+        else:
+            self.touched.add(change[1])
+
+    def load(self):
+        """Читає книгу і починає запам'ятовувати змінені нею записи."""
+        book, self.generation = self._read()
+        book = _replay_journal(book, self.path)
+        book.subscribe(self._on_change)
+        self.book = book
+        self._mark_base(book)
+        return book
+
+    def _mark_base(self, book) -> None:
+        if self.renumber:
+            self.last_saved_key = max(book.data, default=0)
+
+    def _renumber_new(self, book, disk) -> None:
+        """Переносить нові записи сесії з номерів, які вже зайняв інший процес."""
+        clashes = sorted(
+            key
+            for key in self.touched
+            if key > self.last_saved_key and key in disk.data
+        )
+        free = max(max(disk.data, default=0), max(book.data, default=0)) + 1
+        for key in clashes:
+            item = book.data.get(key)
+            # None — сесія сама видалила свій новий запис
+            if item is not None:
+                del book[key]
+                book[free] = item
+                free += 1
+            # номер лишається за записом з диска
+            self.touched.discard(key)
+
+    def _merge(self, disk, generation: int) -> None:
+        """Переносить у книгу зміни інших процесів у записах, яких сесія не торкалася."""
+        book = self.book
+        if book is None:
+            return
+        with self.lock:
+            if self.renumber:
+                # книга ще підписана: перенесені записи потрапляють у touched
+                self._renumber_new(book, disk)
+            book.unsubscribe(self._on_change)
+            try:
+                for key, item in disk.data.items():
+                    if key in self.touched:
+                        continue
+                    mine = book.data.get(key)
+                    if mine is None or mine.__getstate__() != item.__getstate__():
+                        book[key] = item
+                for key in [k for k in book.data if k not in disk.data]:
+                    if key not in self.touched:
+                        del book[key]
+            finally:
+                book.subscribe(self._on_change)
+            self.generation = generation
+            self._mark_base(disk)
+
+    def _take_snapshot(self):
+        """Копія книги і ключі, змінені з попереднього збереження (або None)."""
+        with self.lock:
+            book = self.book
+            if book is None or not self.touched:
+                return None
+            touched, self.touched = self.touched, set()
+            return book.snapshot(touched), touched, book.changes
+
+    def _write(self, snapshot, touched: set) -> str:
+        try:
+            return dump_temp(snapshot, self.path, self.dump)
+        except BaseException:
+            self._restore(touched)
+            raise
+
+    def _restore(self, touched: set) -> None:
+        """Повертає ключі незбереженої копії до змінених."""
+        with self.lock:
+            self.touched |= touched
+
+    def _replace(self, tmp_path: str, lock, snapshot, changes: int) -> None:
+        """Ставить записаний файл на місце і збільшує покоління (під блокуванням)."""
+        os.replace(tmp_path, self.path)
+        self.generation += 1
+        lock.seek(0)
+        lock.truncate()
+        lock.write(str(self.generation))
+        lock.flush()
+        if self.book is not None:
+            self.book.mark_saved(changes)
+        self._mark_base(snapshot)
+
+    def save(self) -> bool:
+        """Записує книгу, якщо сесія її змінювала; повертає True, якщо записано."""
+        for _ in range(OPTIMISTIC_ATTEMPTS):
+            taken = self._take_snapshot()
+            if taken is None:
+                return False
+            snapshot, touched, changes = taken
+            tmp_path = self._write(snapshot, touched)
+            with self._file_lock(exclusive=True) as lock:
+                if self._read_generation(lock) == self.generation:
+                    self._replace(tmp_path, lock, snapshot, changes)
+                    return True
+            os.remove(tmp_path)
+            self._restore(touched)
+            self._merge(*self._read())
+        # Інші процеси зберігають надто часто — об'єднуємо і пишемо, не
+        # відпускаючи блокування файлу, щоб гарантовано завершити збереження
+        with self._file_lock(exclusive=True) as lock:
+            f, generation = self._open(lock)
+            if generation != self.generation:
+                self._merge(self._load(f), generation)
+            elif f is not None:
+                f.close()
+            taken = self._take_snapshot()
+            if taken is None:
+                return False
+            snapshot, touched, changes = taken
+            self._replace(self._write(snapshot, touched), lock, snapshot, changes)
+        return True
+
+    def close(self) -> None:
+        self.save()
+        if self.book is not None:
+            self.book.unsubscribe(self._on_change)
+
+
+class PickleStorage:
+    """Зберігання у pickle-файлах: обидві книги записуються при виході.
+
+    Файли можна спільно використовувати з кількох процесів (див. SharedFile);
+    сесія без змін нічого не записує. Зберігати можна і з фонового потоку
+    (див. autosave.py) — команди тоді виконуються під `lock`.
+    """
+
+    background_save = True
+
+    def __init__(
+        self, book_filename: str = DEFAULT_DB, notes_filename: str = DEFAULT_DB_NOTES
+    ):
+        self.lock = threading.RLock()
+        self.book_file = SharedFile(book_filename, AddressBook, self.lock)
+        self.notes_file = SharedFile(
+            notes_filename, NotesBook, self.lock, renumber=True
+        )
+
+    def load(self) -> tuple[AddressBook, NotesBook]:
+        return self.load_book(), self.load_notes()
+
+    def load_book(self) -> AddressBook:
+        return self.book_file.load()
+
+    def load_notes(self) -> NotesBook:
+        return self.notes_file.load()
+
+    def save_pending(self) -> None:
+        """Зберігає завантажені книги, що мають незбережені зміни."""
+        self.book_file.save()
+        self.notes_file.save()
+
+    def checkpoint(self, book: AddressBook, notes: NotesBook) -> None:
+        """Проміжне збереження без виходу (для пакетного режиму)."""
+        self.save_pending()
+
+    def close(self, book: AddressBook, notes: NotesBook) -> None:
+        self.book_file.close()
+        self.notes_file.close()
+
+
+class ColumnarFile(SharedFile):
+    """SharedFile колонкового файлу, що пам'ятає останні записані колонки.
+
+    `written` — кількість змін книги на момент знімка і колонки, які з нього
+    записано у файл. Якщо книга відтоді не змінювалась, колонки відповідають
+    їй і придатні для пакетних фільтрів (див. AddressBook.columns).
+    """
+
+    def __init__(self, path: str, lock=None):
+        from .columnar import load_columnar
+
+        super().__init__(path, AddressBook, lock, self._dump, load_columnar)
+        self.written: tuple[int, "ContactColumns"] | None = None
+        # колонки, записані потоком: _replace іде в тому ж потоці після _write
+        self._local = threading.local()
+
+    def _dump(self, book: AddressBook, f) -> None:
+        from .columnar import ContactColumns
+
+        columns = ContactColumns.from_records(book.data.values())
+        columns.write(f)
+        self._local.columns = columns
+
+    def _replace(self, tmp_path: str, lock, snapshot, changes: int) -> None:
+        super()._replace(tmp_path, lock, snapshot, changes)
+        self.written = (changes, self._local.columns)
+
+
+class ColumnarStorage(PickleStorage):
+    """Як PickleStorage, але контакти — у колонковому файлі (див. columnar.py).
+
+    Файл контактів записується і читається в кілька разів швидше за pickle.
+    При першому запуску контакти переносяться з pickle-файлу.
+    """
+
+    def __init__(
+        self,
+        columnar_filename: str = DEFAULT_DB_COLUMNAR,
+        book_filename: str = DEFAULT_DB,
+        notes_filename: str = DEFAULT_DB_NOTES,
+    ):
+        super().__init__(book_filename, notes_filename)
+        self.book_filename = book_filename
+        self.columnar_file = ColumnarFile(columnar_filename, self.lock)
+        self.book_file = self.columnar_file
+
+    def load_book(self) -> AddressBook:
+        path = self.book_file.path
+        if not os.path.exists(path) and os.path.exists(self.book_filename):
+            book = load_data(self.book_filename)
+            os.replace(dump_temp(book, path, self.book_file.dump), path)
+        return super().load_book()
+
+    def save_pending(self) -> None:
+        super().save_pending()
+        # щойно записані колонки лишаються в книзі, поки вона не зміниться:
+        # пошук не перебудовує їх для повного перегляду (див. query.py)
+        with self.lock:
+            book, written = self.columnar_file.book, self.columnar_file.written
+            if (
+                isinstance(book, AddressBook)
+                and written is not None
+                and written[0] == book.changes
+            ):
+                book.keep_columns(written[1])
+
+
+class JournalStorage:
+    """Зберігання у вигляді знімка та журналу змін (див. journal.py).
+
+    Кожна зміна одразу дописується в журнал, тому дані не залежать від
+    коректного виходу, а закриття лише скидає хвіст журналу на диск.
+    """
+
+    # кожна зміна й так одразу потрапляє в журнал
+    background_save = False
+
+    def __init__(
+        self, book_filename: str = DEFAULT_DB, notes_filename: str = DEFAULT_DB_NOTES
+    ):
+        self.book_store = JournaledStore(book_filename, AddressBook)
+        self.notes_store = JournaledStore(notes_filename, NotesBook)
+
+    def load(self) -> tuple[AddressBook, NotesBook]:
+        return self.load_book(), self.load_notes()
+
+    def load_book(self) -> AddressBook:
+        return self.book_store.load()
+
+    def load_notes(self) -> NotesBook:
+        return self.notes_store.load()
+
+    def checkpoint(self, book: AddressBook, notes: NotesBook) -> None:
+        # зміни вже в журналі — лишається скинути його на диск
+        for store in (self.book_store, self.notes_store):
+            if store.journal is not None:
+                store.journal.sync()
+
+    def close(self, book: AddressBook, notes: NotesBook) -> None:
+        self.book_store.close()
+        self.notes_store.close()
+
+
+def migrate_to_sqlite(
+    store: "SqliteStore",
+    book_filename: str = DEFAULT_DB,
+    notes_filename: str = DEFAULT_DB_NOTES,
+) -> bool:
+    """Одноразово переносить дані з pickle-файлів у порожню базу SQLite.
+
+    Повертає True, якщо міграція відбулася.
+    """
+    if not store.is_empty():
+        return False
+    if not (os.path.exists(book_filename) or os.path.exists(notes_filename)):
+        return False
+    store.import_books(load_data(book_filename), load_notes(notes_filename))
+    return True
+
+
+class SqliteStorage:
+    """Зберігання в базі SQLite (див. sqlite_store.py).
+
+    Контакти читаються з бази на вимогу, кожна зміна одразу записується.
+    При першому запуску дані з pickle-файлів переносяться в базу.
+    """
+
+    # кожна зміна й так одразу записується в базу
+    background_save = False
+
+    def __init__(
+        self,
+        db_filename: str | None = None,
+        book_filename: str = DEFAULT_DB,
+        notes_filename: str = DEFAULT_DB_NOTES,
+    ):
+        self.db_filename = db_filename
+        self.book_filename = book_filename
+        self.notes_filename = notes_filename
+        self.store: "SqliteStore | None" = None
+        self._opening = threading.Lock()
+
+    def _open(self) -> "SqliteStore":
+        # книга і нотатки можуть завантажуватися з різних потоків
+        with self._opening:
+            if self.store is None:
+                from .sqlite_store import DEFAULT_SQLITE_DB, SqliteStore
+
+                self.store = SqliteStore(self.db_filename or DEFAULT_SQLITE_DB)
+                migrate_to_sqlite(self.store, self.book_filename, self.notes_filename)
+            return self.store
+
+    def load(self) -> tuple[AddressBook, NotesBook]:
+        return self.load_book(), self.load_notes()
+
+    def load_book(self) -> AddressBook:
+        return self._open().load_book()
+
+    def load_notes(self) -> NotesBook:
+        return self._open().load_notes()
+
+    def checkpoint(self, book: AddressBook, notes: NotesBook) -> None:
+        # кожна зміна вже закомічена в базу
+        if self.store is not None:
+            self.store.conn.commit()
+
+    def close(self, book: AddressBook, notes: NotesBook) -> None:
+        if self.store is not None:
+            self.store.close()
+
+
+class MmapStorage:
+    """Контакти лише для читання з mmap-знімка (див. mmap_store.py).
+
+    Знімок `addressbook.snap` будується з `addressbook.pkl`, якщо його ще
+    немає або pickle-файл новіший, тож контакти, як і раніше, змінюються в
+    режимі pickle. Записи розпаковуються на вимогу, а сторінки файлу
+    спільні для всіх процесів, що його відкрили. Нотатки — звичайний
+    pickle-файл (див. SharedFile).
+    """
+
+    background_save = True
+
+    def __init__(
+        self,
+        snapshot_filename: str | None = None,
+        book_filename: str = DEFAULT_DB,
+        notes_filename: str = DEFAULT_DB_NOTES,
+    ):
+        self.snapshot_filename = snapshot_filename
+        self.book_filename = book_filename
+        self.lock = threading.RLock()
+        self.notes_file = SharedFile(
+            notes_filename, NotesBook, self.lock, renumber=True
+        )
+        self.book: "MmapAddressBook | None" = None
+
+    def load(self) -> tuple[AddressBook, NotesBook]:
+        return self.load_book(), self.load_notes()
+
+    def load_book(self) -> AddressBook:
+        from .mmap_store import DEFAULT_MMAP_DB, MmapAddressBook, write_mmap_snapshot
+
+        path = self.snapshot_filename or DEFAULT_MMAP_DB
+        try:
+            stale = os.path.getmtime(path) < os.path.getmtime(self.book_filename)
+        except FileNotFoundError:
+            stale = not os.path.exists(path)
+        if stale:
+            write_mmap_snapshot(load_data(self.book_filename), path)
+        self.book = MmapAddressBook(path)
+        return self.book
+
+    def load_notes(self) -> NotesBook:
+        return self.notes_file.load()
+
+    def save_pending(self) -> None:
+        """Зберігає нотатки, якщо вони мають незбережені зміни."""
+        self.notes_file.save()
+
+    def checkpoint(self, book: AddressBook, notes: NotesBook) -> None:
+        self.save_pending()
+
+    def close(self, book: AddressBook, notes: NotesBook) -> None:
+        self.notes_file.close()
+        if self.book is not None:
+            self.book.close()
+
+
+STORAGE_ENGINES = {
+    "pickle": PickleStorage,
+    "columnar": ColumnarStorage,
+    "journal": JournalStorage,
+    "sqlite": SqliteStorage,
+    "mmap": MmapStorage,
+}
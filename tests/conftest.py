@@ -0,0 +1,48 @@
+"""Спільні фікстури: книги контактів з даних модуля тесту.
+
+Контакт описується словником з ключем name і, за потреби, phones (список),
+birthday (DD.MM.YYYY), email та address.
+"""
+
+import pytest
+
+from assistant.models import AddressBook, Record
+from assistant.sqlite_store import SqliteStore
+
+
+def add_contacts(book: AddressBook, contacts) -> AddressBook:
+    """Додає контакти до книги; поля заповнюються вже доданого запису."""
+    for contact in contacts:
+        record = Record(contact["name"])
+        book.add_record(record)
+        for phone in contact.get("phones", ()):
+            record.add_phone(phone)
+        if contact.get("birthday"):
+            record.add_birthday(contact["birthday"])
+        if contact.get("email"):
+            record.add_email(contact["email"])
+        if contact.get("address"):
+            record.add_address(contact["address"])
+    return book
+
+
+@pytest.fixture
+def make_book():
+    """Фабрика книг у пам'яті: make_book(*контакти)."""
+
+    def make(*contacts) -> AddressBook:
+        return add_contacts(AddressBook(), contacts)
+
+    return make
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def book(request, tmp_path):
+    """Книга з контактами CONTACTS модуля тесту — у пам'яті та в SQLite."""
+    if request.param == "memory":
+        book = AddressBook()
+    else:
+        store = SqliteStore(str(tmp_path / "assistant.db"))
+        book, _ = store.load()
+        request.addfinalizer(store.close)
+    return add_contacts(book, request.module.CONTACTS)
@@ -0,0 +1,134 @@
+"""Пакети змін книг: все або нічого, одна зміна для підписників, ID нотаток."""
+
+import pytest
+
+from assistant.notes import Note, NotesBook
+
+
+CONTACTS = [
+    {"name": "John", "phones": ["0500000000"]},
+    {"name": "Jane", "phones": ["0500000001"]},
+]
+
+
+def snapshot(book) -> dict:
+    return {key: str(item) for key, item in book.data.items()}
+
+
+def test_failed_batch_changes_nothing(make_book):
+    book = make_book(*CONTACTS)
+    changes = []
+    book.subscribe(changes.append)
+    before = snapshot(book)
+    with pytest.raises(ValueError) as error:
+        with book.batch() as batch:
+            batch.add_contact("New", "0501112233")
+            batch.add_phone("John", "bad")
+            batch.add_birthday("Nobody", "01.01.2000")
+            batch.delete("Jane")
+    assert "#2:" in str(error.value) and "#3: Contact Nobody" in str(error.value)
+    assert snapshot(book) == before
+    assert changes == []
+    assert book.find_by_phone("0501112233") == []
+
+
+def test_exception_in_block_discards_batch(make_book):
+    book = make_book(CONTACTS[0])
+    with pytest.raises(RuntimeError):
+        with book.batch() as batch:
+            batch.delete("John")
+            raise RuntimeError
+    assert "John" in book
+
+
+def test_batch_is_one_change_and_updates_indexes(make_book):
+    book = make_book(*CONTACTS)
+    changes = []
+    book.subscribe(changes.append)
+    with book.batch() as batch:
+        batch.add_contact("New", "0501112233")
+        batch.add_email("John", "john@example.com")
+        batch.delete("Jane")
+    assert [change[0] for change in changes] == ["batch"]
+    assert book.find_by_phone("0501112233")[0].name.value == "New"
+    assert book.find_by_email("JOHN@example.com")[0].name.value == "John"
+    assert "Jane" not in book
+    # запис із пакета тепер живий: його зміни знову оновлюють індекси
+    book.find("John").add_phone("0507777777")
+    assert book.find_by_phone("0507777777")[0].name.value == "John"
+
+
+def test_batch_replays_from_change(make_book):
+    book = make_book(*CONTACTS)
+    replica = make_book(*CONTACTS)
+    book.subscribe(replica.apply_change)
+    with book.batch() as batch:
+        batch.add_birthday("John", "01.02.1990")
+        batch.delete("Jane")
+        batch.add_contact("New", "0501112233")
+    assert snapshot(replica) == snapshot(book)
+
+
+def test_note_ids_are_not_reused_after_delete():
+    notes = NotesBook()
+    for text in ("one", "two", "three"):
+        notes.add_note(text)
+    with notes.batch() as batch:
+        batch.delete_note(1)
+        new_id = batch.add_note("four")
+    assert new_id == 4
+    assert {i: n.text for i, n in notes.data.items()} == {
+        2: "two",
+        3: "three",
+        4: "four",
+    }
+
+
+def test_add_note_uses_largest_id():
+    notes = NotesBook()
+    for text in ("one", "two", "three"):
+        notes.add_note(text)
+    notes.delete_note(1)
+    notes.add_note("four")
+    assert sorted(notes.data) == [2, 3, 4]
+    notes.delete_note(4)
+    notes.add_note("five")
+    assert notes.data[4].text == "five"
+
+
+def test_note_batch_rejects_missing_note():
+    notes = NotesBook()
+    notes.add_note("one")
+    with pytest.raises(ValueError, match="Note 9 not found"):
+        with notes.batch() as batch:
+            batch.delete_note(1)
+            batch.add_tag(9, "#x")
+    assert 1 in notes.data
+
+
+def test_pages_keep_notes_added_after_largest_is_deleted():
+    notes = NotesBook()
+    for text in ("one", "two", "three"):
+        notes.add_note(text)
+    notes.page()
+    with notes.batch() as batch:
+        batch.delete_note(3)
+        batch.add_note("new")
+    assert sorted(notes.data) == [1, 2, 4]
+    for order in NotesBook.PAGE_ORDERS:
+        lines, _ = notes.page(order)
+        assert len(lines) == 3 and "new" in lines[-1]
+
+
+def test_note_stored_by_id_can_be_deleted_from_pages():
+    notes = NotesBook()
+    for text in ("one", "two", "three"):
+        notes.add_note(text)
+    notes.page()
+    notes.delete_note(3)
+    notes[7] = Note("seven")
+    assert "seven" in notes.page("id")[0][-1]
+    notes.delete_note(7)
+    notes.delete_note(1)
+    assert notes.page("id")[0] == notes.page()[0]
+    assert len(notes.page()[0]) == 1 and "two" in notes.page()[0][0]
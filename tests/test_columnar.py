@@ -0,0 +1,69 @@
+"""Колонковий формат: запис і читання контактів без втрат."""
+
+import io
+
+from assistant import columnar
+from assistant.columnar import dump_columnar, load_columnar
+from assistant.models import AddressBook, Record
+from assistant.storage import ColumnarStorage
+
+
+def round_trip(book: AddressBook) -> AddressBook:
+    f = io.BytesIO()
+    dump_columnar(book, f)
+    f.seek(0)
+    return load_columnar(f)
+
+
+def test_phones_with_non_ascii_digits_survive_round_trip():
+    book = AddressBook()
+    record = Record("John")
+    record.add_phone("0501234567")
+    record.add_phone("٠٥٠١٢٣٤٥٦٧")
+    book.add_record(record)
+    other = Record("Jane")
+    other.add_phone("050123456²")
+    book.add_record(other)
+    plain = Record("Anna")
+    plain.add_phone("0671234567")
+    book.add_record(plain)
+    loaded = round_trip(book)
+    for name in ("John", "Jane", "Anna"):
+        assert loaded.find(name)._phones == book.find(name)._phones
+    assert loaded.find_by_phone("٠٥٠١٢٣٤٥٦٧")[0].name.value == "John"
+    assert loaded.find_by_phone("0501234567")[0].name.value == "John"
+    assert loaded.find_by_phone("050123456²")[0].name.value == "Jane"
+
+
+def test_reads_version_1_files(monkeypatch):
+    book = AddressBook()
+    record = Record("John")
+    record.add_phone("0501234567")
+    book.add_record(record)
+    # версія 1 писала ті самі колонки, крім phone_texts
+    with monkeypatch.context() as patch:
+        patch.setattr(columnar, "VERSION", 1)
+        patch.setattr(
+            columnar,
+            "COLUMNS",
+            {k: v for k, v in columnar.COLUMNS.items() if k != "phone_texts"},
+        )
+        f = io.BytesIO()
+        dump_columnar(book, f)
+    f.seek(0)
+    assert load_columnar(f).find("John")._phones == ("0501234567",)
+
+
+def test_storage_keeps_written_columns_until_book_changes(tmp_path):
+    paths = [str(tmp_path / name) for name in ("book.col", "book.pkl", "notes.pkl")]
+    storage = ColumnarStorage(*paths)
+    book = storage.load_book()
+    book.add_record(Record("John"))
+    assert book.columns(build=False) is None
+    storage.save_pending()
+    columns = book.columns(build=False)
+    assert columns is not None and list(columns.names) == ["John"]
+    book.find("John").add_phone("0501234567")
+    assert book.columns(build=False) is None
+    # книга, прочитана з файлу, має колонки одразу
+    assert ColumnarStorage(*paths).load_book().columns(build=False) is not None
@@ -0,0 +1,29 @@
+"""Потоковий експорт: фільтри перевіряються під час проходу по записах."""
+
+import csv
+
+from assistant.exporter import export_contacts
+
+CONTACTS = [
+    {"name": "John", "email": "john@example.com", "birthday": "01.02.1990"},
+    {"name": "Jane", "email": "jane@EXAMPLE.com"},
+    {"name": "Anna", "email": "anna@other.com", "birthday": "03.04.1985"},
+    {"name": "Bob", "birthday": "05.06.1970"},
+]
+
+
+def exported_names(path) -> list[str]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return [row["name"] for row in csv.DictReader(f)]
+
+
+def test_export_by_email_domain(book, tmp_path):
+    path = tmp_path / "contacts.csv"
+    assert export_contacts(book, str(path), email_domain="Example.com") == 2
+    assert exported_names(path) == ["John", "Jane"]
+
+
+def test_export_with_birthday(book, tmp_path):
+    path = tmp_path / "contacts.csv"
+    assert export_contacts(book, str(path), with_birthday=True) == 3
+    assert exported_names(path) == ["John", "Anna", "Bob"]
@@ -0,0 +1,87 @@
+"""Масовий імпорт: відхилені рядки не змінюють книгу і потрапляють у звіт."""
+
+import csv
+import json
+
+from assistant.importer import import_file
+from assistant.models import AddressBook
+from assistant.notes import NotesBook
+
+
+JOHN = {
+    "name": "John",
+    "phones": ["0501234567"],
+    "birthday": "01.01.1990",
+    "email": "john@example.com",
+}
+
+
+def write_csv(path, rows) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "phones", "birthday", "email", "address"])
+        writer.writerows(rows)
+
+
+def read_report(path) -> list[list[str]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))[1:]
+
+
+def test_conflicting_row_is_rejected_without_changes(make_book, tmp_path):
+    book = make_book(JOHN)
+    path = tmp_path / "contacts.csv"
+    write_csv(
+        path,
+        [
+            ["John", "0509999999", "02.02.1991", "", ""],
+            ["Jane", "0507654321", "03.03.1993", "jane@example.com", ""],
+        ],
+    )
+    result = import_file(str(path), book=book, workers=1)
+    assert (result.rows, result.imported, result.rejected) == (2, 1, 1)
+    assert book.find("John")._phones == ("0501234567",)
+    assert book.find_by_phone("0509999999") == []
+    assert book.find("Jane").email.value == "jane@example.com"
+    [(line, error, row)] = read_report(result.report_path)
+    assert line == "2" and "birthday" in error
+    assert json.loads(row)["birthday"] == "02.02.1991"
+
+
+def test_matching_row_adds_new_phones_and_fields(make_book, tmp_path):
+    book = make_book(JOHN)
+    path = tmp_path / "contacts.csv"
+    write_csv(path, [["John", "0509999999", "01.01.1990", "", "Kyiv, Sadova St, 1"]])
+    result = import_file(str(path), book=book, workers=1)
+    assert result.imported == 1 and result.rejected == 0
+    record = book.find("John")
+    assert record._phones == ("0501234567", "0509999999")
+    assert record.address.value == "Kyiv, Sadova St, 1"
+    assert book.find_by_phone("0509999999")[0] is record
+
+
+def test_invalid_rows_are_reported(tmp_path):
+    book = AddressBook()
+    path = tmp_path / "contacts.csv"
+    write_csv(path, [["Bad", "123", "", "", ""], ["Good", "0501112233", "", "", ""]])
+    result = import_file(str(path), book=book, workers=1)
+    assert result.imported == 1 and result.rejected == 1
+    assert list(book.data) == ["Good"]
+    [(line, _, row)] = read_report(result.report_path)
+    assert line == "2" and json.loads(row)["name"] == "Bad"
+
+
+def test_notes_get_new_ids(tmp_path):
+    notes = NotesBook()
+    for text in ("one", "two", "three"):
+        notes.add_note(text)
+    notes.delete_note(1)
+    path = tmp_path / "notes.jsonl"
+    path.write_text('{"text": "four", "tags": ["work"]}\n', encoding="utf-8")
+    result = import_file(str(path), notes=notes, kind="notes", workers=1)
+    assert result.imported == 1
+    assert {i: n.text for i, n in notes.data.items()} == {
+        2: "two",
+        3: "three",
+        4: "four",
+    }
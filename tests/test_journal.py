@@ -0,0 +1,74 @@
+"""Журнал змін: відновлення після збою і ущільнення між сесіями."""
+
+import os
+
+from assistant.journal import MAX_SEALED_SEGMENTS, JournaledStore, list_segments
+from assistant.models import AddressBook, Record
+
+
+def add_contacts(store: JournaledStore, names) -> None:
+    book = store.book
+    for name in names:
+        record = Record(name)
+        book.add_record(record)
+        record.add_phone("0501234567")
+
+
+def session(path: str, names=(), compact_every: int = 10_000) -> AddressBook:
+    store = JournaledStore(path, AddressBook, compact_every=compact_every)
+    book = store.load()
+    add_contacts(store, names)
+    store.close()
+    return book
+
+
+def test_replay_stops_at_corrupted_frame(tmp_path):
+    path = str(tmp_path / "book.pkl")
+    session(path, ["John", "Jane"])
+    (_, segment), *_ = list_segments(path)
+    # пошкоджений останній байт: CRC останнього кадру не збігається
+    with open(segment, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    book = session(path)
+    assert "John" in book.data and "Jane" in book.data
+    # втрачено лише останню зміну — телефон Jane
+    assert book.data["John"].phones and not book.data["Jane"].phones
+
+
+def test_truncated_tail_does_not_block_new_changes(tmp_path):
+    path = str(tmp_path / "book.pkl")
+    session(path, ["John"])
+    (_, segment), *_ = list_segments(path)
+    with open(segment, "r+b") as f:
+        f.truncate(os.path.getsize(segment) - 3)
+    session(path, ["Jane"])
+    book = session(path)
+    assert set(book.data) == {"John", "Jane"}
+
+
+def test_compacts_by_entries_across_sessions(tmp_path):
+    path = str(tmp_path / "book.pkl")
+    # кожна сесія — 4 зміни, окремо жодна не доходить до compact_every
+    for i in range(3):
+        store = JournaledStore(path, AddressBook, compact_every=10)
+        store.load()
+        add_contacts(store, [f"Name{i}a", f"Name{i}b"])
+        store.close()
+    assert os.path.exists(path)
+    assert len(list_segments(path)) <= 2
+    book = session(path)
+    assert len(book.data) == 6
+
+
+def test_compacts_on_load_when_segments_pile_up(tmp_path):
+    path = str(tmp_path / "book.pkl")
+    for i in range(MAX_SEALED_SEGMENTS):
+        session(path, [f"Name{i}"])
+    assert len(list_segments(path)) == MAX_SEALED_SEGMENTS
+    book = session(path)
+    assert len(list_segments(path)) <= 1
+    assert len(book.data) == MAX_SEALED_SEGMENTS
+    assert len(session(path).data) == MAX_SEALED_SEGMENTS
@@ -0,0 +1,30 @@
+"""merge-contacts: дані дубліката не губляться мовчки."""
+
+from assistant.handlers import merge_contacts
+
+CONTACTS = [
+    {"name": "John", "phones": ["0501234567"], "email": "john@example.com"},
+    {"name": "john", "phones": ["0671234567"], "birthday": "01.02.1990"},
+]
+
+
+def test_merge_takes_missing_values(make_book):
+    book = make_book(*CONTACTS)
+    message = merge_contacts(["John", "john"], book)
+    assert "merged" in message
+    record = book.find("John")
+    assert [p.value for p in record.phones] == ["0501234567", "0671234567"]
+    assert record.birthday.date_str == "01.02.1990"
+    assert book.find("john") is None
+
+
+def test_merge_refused_on_conflicting_values(make_book):
+    book = make_book(*CONTACTS)
+    book.find("john").add_email("other@example.com")
+    message = merge_contacts(["John", "john"], book)
+    assert "Can't merge" in message
+    assert "'john@example.com' in John, 'other@example.com' in john" in message
+    # жоден контакт не змінився
+    assert [p.value for p in book.find("John").phones] == ["0501234567"]
+    assert book.find("John").birthday is None
+    assert book.find("john") is not None
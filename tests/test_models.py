@@ -0,0 +1,67 @@
+"""Поля запису: усі зміни проходять через методи Record, що оновлюють книгу."""
+
+import pytest
+
+from assistant.models import Phone
+
+
+JOHN = {"name": "John", "phones": ["0501234567"], "email": "john@example.com"}
+
+
+def test_field_values_are_read_only(make_book):
+    record = make_book(JOHN).find("John")
+    with pytest.raises(AttributeError):
+        record.phones[0].value = "0679999999"
+    with pytest.raises(AttributeError):
+        record.email.value = "other@example.com"
+    assert [p.value for p in record.phones] == ["0501234567"]
+    assert record.email.value == "john@example.com"
+
+
+def test_field_mutators_write_through_to_book(make_book):
+    book = make_book(JOHN)
+    record = book.find("John")
+    record.add_address("Kyiv, street 1")
+    phone = record.find_phone("0501234567")
+    phone.update_number("0679999999")
+    record.email.update_email("new@example.com")
+    record.address.update_address("Lviv, street 2")
+    assert phone.value == "0679999999"
+    assert [p.value for p in record.phones] == ["0679999999"]
+    assert book.find_by_phone("0679999999") == [record]
+    assert book.find_by_phone("0501234567") == []
+    assert book.find_by_email("new@example.com") == [record]
+    assert record.address.value == "Lviv, street 2"
+    with pytest.raises(ValueError):
+        record.email.update_email("not an email")
+    assert record.email.value == "new@example.com"
+
+
+def test_phones_list_writes_through_to_book(make_book):
+    book = make_book(JOHN)
+    record = book.find("John")
+    phones = record.phones
+    assert isinstance(phones, list)
+    phones.append("0671111111")
+    phones += [Phone("0503333333")]
+    assert [p.value for p in phones] == ["0501234567", "0671111111", "0503333333"]
+    assert book.find_by_phone("0671111111") == [record]
+    phones.remove(record.find_phone("0501234567"))
+    del phones[-1]
+    assert [p.value for p in record.phones] == ["0671111111"]
+    assert book.find_by_phone("0501234567") == []
+    with pytest.raises(ValueError):
+        record.phones.append("123")
+    record.phones = ["0502222222"]
+    assert book.find_by_phone("0502222222") == [record]
+    assert book.find_by_phone("0671111111") == []
+
+
+def test_record_methods_update_indexes(make_book):
+    book = make_book(JOHN)
+    record = book.find("John")
+    record.edit_phone("0501234567", "0679999999")
+    record.edit_email("new@example.com")
+    assert book.find_by_phone("0679999999") == [record]
+    assert book.find_by_phone("0501234567") == []
+    assert book.find_by_email("new@example.com") == [record]
@@ -0,0 +1,94 @@
+"""Мова запитів find-contact і вибір індексу планувальником."""
+
+import pytest
+
+from assistant.query import DEFAULT_LIMIT, looks_like_query, parse_query, plan_query
+
+
+CONTACTS = [
+    {
+        "name": f"Name{i:02d}",
+        "phones": [f"050{i:07d}"] if i % 2 else [],
+        "email": f"user{i}@{'example.com' if i % 3 else 'other.org'}",
+        "birthday": f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.1990",
+        "address": f"Kyiv, street {i}" if i % 5 == 0 else None,
+    }
+    for i in range(60)
+]
+
+
+def names(records) -> list[str]:
+    return [record.name.value for record in records]
+
+
+def test_looks_like_query():
+    assert looks_like_query("month = 3 and no phone")
+    assert looks_like_query("has email")
+    assert not looks_like_query("John")
+    assert not looks_like_query("0501234567")
+
+
+def test_parse_errors():
+    with pytest.raises(ValueError, match="Unknown field"):
+        parse_query("colour = red")
+    with pytest.raises(ValueError, match="Limit must be a positive number"):
+        parse_query("has email limit 0")
+    with pytest.raises(ValueError, match="Missing condition after 'and'"):
+        parse_query("has email and")
+    with pytest.raises(ValueError, match="supports only"):
+        parse_query("month ~ 3")
+
+
+def test_plan_picks_most_selective_index(book):
+    plan = plan_query(book, "email = user7@example.com and month = 8")
+    assert plan.access is not None and plan.access.field == "email"
+    assert plan.estimate == 1
+    found, more = plan.run()
+    assert names(found) == ["Name07"] and not more
+    assert "Rejected: full scan" in plan.explain()
+
+
+def test_full_scan_matches_all_conditions_in_order(book):
+    plan = plan_query(book, "no phone and domain = other.org and address ~ kyiv")
+    assert plan.access is None
+    found, more = plan.run()
+    expected = [f"Name{i:02d}" for i in range(60) if i % 30 == 0]
+    assert names(found) == expected and not more
+
+
+def test_limit_stops_early(book):
+    found, more = plan_query(book, "has email limit 5").run()
+    assert names(found) == [f"Name{i:02d}" for i in range(5)] and more
+    found, more = plan_query(book, "has email").run()
+    assert len(found) == DEFAULT_LIMIT and more
+
+
+def test_birthday_index_checks_year(book):
+    found, _ = plan_query(book, "birthday = 08.08.1990").run()
+    assert names(found) == ["Name07"]
+    found, _ = plan_query(book, "birthday = 08.08.1991").run()
+    assert found == []
+
+
+def test_full_scan_selects_by_columns(book):
+    query = "phone ^ 050000001 and domain = EXAMPLE.com and has birthday"
+    expected = ["Name11", "Name13", "Name17", "Name19"]
+    # без готових колонок — звичайний перегляд записів
+    assert plan_query(book, query).explain().startswith("Access: full scan,")
+    if book.COLUMN_SCAN:
+        book.columns()
+    plan = plan_query(book, query)
+    assert plan.access is None
+    access = "column scan (" if book.COLUMN_SCAN else "full scan,"
+    assert plan.explain().startswith(f"Access: {access}")
+    assert names(plan.run()[0]) == expected
+    # застарілі після зміни книги колонки не використовуються
+    book.find("Name10").add_phone("0500000010")
+    book.find("Name13").remove_phone("0500000013")
+    expected = ["Name10", "Name11", "Name17", "Name19"]
+    plan = plan_query(book, query)
+    assert plan.explain().startswith("Access: full scan,")
+    assert names(plan.run()[0]) == expected
+    if book.COLUMN_SCAN:
+        book.columns()
+        assert names(plan_query(book, query).run()[0]) == expected
@@ -0,0 +1,75 @@
+"""Мережевий режим: команди з файлами недоступні, збереження — у фоні."""
+
+import asyncio
+import threading
+
+from assistant.models import Record
+from assistant.server import AssistantServer
+from assistant.storage import PickleStorage
+
+
+def make_server(tmp_path, flush_delay: float = 0.01) -> AssistantServer:
+    storage = PickleStorage(str(tmp_path / "book.pkl"), str(tmp_path / "notes.pkl"))
+    return AssistantServer(storage, flush_delay)
+
+
+def test_file_commands_rejected(tmp_path):
+    app = make_server(tmp_path)
+    secret = tmp_path / "secret.csv"
+    for line in (f"import contacts {secret}", f"export contacts {secret}"):
+        outcome, message = app.execute(line)
+        assert outcome == "InvalidCommand"
+        assert "not available" in message
+    assert not secret.exists()
+    app.close()
+
+
+def test_flush_saves_in_background_thread(tmp_path):
+    app = make_server(tmp_path)
+    threads = []
+    checkpoint = app.storage.checkpoint
+
+    def recording_checkpoint(book, notes):
+        threads.append(threading.current_thread())
+        checkpoint(book, notes)
+
+    app.storage.checkpoint = recording_checkpoint
+
+    async def run():
+        assert app.execute("add-contact John 0501234567")[0] == "success"
+        await asyncio.sleep(0.2)
+
+    asyncio.run(run())
+    app.close()
+    assert app.flushes == 1 and app.error is None
+    assert threads and threads[0] is not threading.main_thread()
+    book, _ = PickleStorage(
+        str(tmp_path / "book.pkl"), str(tmp_path / "notes.pkl")
+    ).load()
+    assert "John" in book.data
+
+
+def test_flush_merges_changes_saved_by_other_process(tmp_path):
+    app = make_server(tmp_path)
+    other = PickleStorage(str(tmp_path / "book.pkl"), str(tmp_path / "notes.pkl"))
+    book, notes = other.load()
+    book.add_record(Record("Jane"))
+    notes.add_note("from other")
+    other.close(book, notes)
+
+    async def run():
+        assert app.execute("add-contact John 0501234567")[0] == "success"
+        assert app.execute("add-note text")[0] == "success"
+        await asyncio.sleep(0.2)
+
+    asyncio.run(run())
+    assert app.flushes == 1 and app.error is None
+    # записи іншого процесу підтягнуто у спільну книгу сервера
+    assert {"John", "Jane"} <= set(app.book.data)
+    assert len(app.notes.data) == 2
+    app.close()
+    book, notes = PickleStorage(
+        str(tmp_path / "book.pkl"), str(tmp_path / "notes.pkl")
+    ).load()
+    assert {"John", "Jane"} <= set(book.data)
+    assert sorted(note.text for note in notes.data.values()) == ["from other", "text"]
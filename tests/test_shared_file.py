@@ -0,0 +1,99 @@
+"""Спільний pickle-файл: об'єднання змін кількох сесій."""
+
+from assistant.models import AddressBook, Record
+from assistant.notes import NotesBook
+from assistant.storage import SharedFile
+
+
+def open_notes(path: str) -> SharedFile:
+    shared = SharedFile(path, NotesBook, renumber=True)
+    shared.load()
+    return shared
+
+
+def open_book(path: str) -> SharedFile:
+    shared = SharedFile(path, AddressBook)
+    shared.load()
+    return shared
+
+
+def test_merge_keeps_changes_of_both_sessions(tmp_path):
+    path = str(tmp_path / "book.pkl")
+    first, second = open_book(path), open_book(path)
+    first.book.add_record(Record("John"))
+    second.book.add_record(Record("Jane"))
+    assert first.save() and second.save()
+    assert set(second.book.data) == {"John", "Jane"}
+    assert set(open_book(path).book.data) == {"John", "Jane"}
+
+
+def test_merge_removes_records_deleted_by_other_session(tmp_path):
+    path = str(tmp_path / "book.pkl")
+    setup = open_book(path)
+    setup.book.add_record(Record("John"))
+    setup.book.add_record(Record("Jane"))
+    setup.save()
+    first, second = open_book(path), open_book(path)
+    first.book.delete("John")
+    second.book.add_record(Record("Anna"))
+    first.save()
+    second.save()
+    assert set(open_book(path).book.data) == {"Jane", "Anna"}
+
+
+def test_notes_added_concurrently_get_different_ids(tmp_path):
+    path = str(tmp_path / "notes.pkl")
+    setup = open_notes(path)
+    setup.book.add_note("old")
+    setup.save()
+    first, second = open_notes(path), open_notes(path)
+    first.book.add_note("from first")
+    second.book.add_note("from second")
+    second.book.add_note("second again")
+    assert first.save() and second.save()
+    texts = sorted(note.text for note in open_notes(path).book.data.values())
+    assert texts == ["from first", "from second", "old", "second again"]
+    # перенесені нотатки доступні через індекси під новими номерами
+    assert "second again" in second.book.find_notes("again")
+    assert all(note._note_id == key for key, note in second.book.data.items())
+
+
+def test_renumbered_note_keeps_later_edits(tmp_path):
+    path = str(tmp_path / "notes.pkl")
+    first, second = open_notes(path), open_notes(path)
+    first.book.add_note("first")
+    second.book.add_note("second")
+    first.save()
+    second.save()
+    second.book.edit_note(max(second.book.data), "second edited")
+    second.save()
+    texts = sorted(note.text for note in open_notes(path).book.data.values())
+    assert texts == ["first", "second edited"]
+
+
+def test_own_deleted_new_note_does_not_delete_other(tmp_path):
+    path = str(tmp_path / "notes.pkl")
+    first, second = open_notes(path), open_notes(path)
+    first.book.add_note("kept")
+    note_id = second.book.next_id()
+    second.book.add_note("temporary")
+    second.book.delete_note(note_id)
+    second.book.add_note("other")
+    first.save()
+    second.save()
+    texts = sorted(note.text for note in open_notes(path).book.data.values())
+    assert texts == ["kept", "other"]
+
+
+def test_snapshot_is_not_changed_by_later_commands(tmp_path):
+    shared = open_notes(str(tmp_path / "notes.pkl"))
+    notes = shared.book
+    notes.add_note("text", ["a"])
+    note_id = max(notes.data)
+    snapshot, touched, _ = shared._take_snapshot()
+    assert touched == {note_id}
+    tags = snapshot.data[note_id].tags
+    notes.data[note_id].add_tag("b")
+    notes.edit_note(note_id, "edited")
+    assert snapshot.data[note_id].text == "text"
+    assert list(snapshot.data[note_id].tags) == list(tags) == ["a"]